@@ -38,7 +38,7 @@ from .pipes import (
     ValidationPipe,
 )
 from .logger import logger, console
-from .cache import CachePolicy
+from .cache import CachePolicy, ETagValidator
 from .constant import NESTIPY_SCOPE_ATTR, SCOPE_SINGLETON, SCOPE_TRANSIENT, SCOPE_REQUEST
 from .openapi_error import OpenApiErrorResponse, OpenApiErrorDetail
 from .middleware import cors, NestipyMiddleware, session, SessionOption, helmet
@@ -118,4 +118,5 @@ __all__ = [
     "OpenApiErrorResponse",
     "OpenApiErrorDetail",
     "CachePolicy",
+    "ETagValidator",
 ]
@@ -1,7 +1,21 @@
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, Iterable
+from typing import Any, Awaitable, Iterable, Optional, Type, Union
+
+
+class ETagValidator(ABC):
+    """
+    Cheap validator of a route (a version number, an updated_at, ...) checked against
+    If-None-Match before the handler runs. Resolved through the container like guards.
+    """
+
+    @abstractmethod
+    def version(
+        self, context: Any
+    ) -> Union[str, int, None, Awaitable[Union[str, int, None]]]:
+        pass
 
 
 @dataclass(frozen=True)
@@ -18,6 +32,8 @@ class CachePolicy:
     vary: Optional[Iterable[str]] = None
     etag: Optional[str] = None
     last_modified: Optional[str] = None
+    auto_etag: bool = False
+    etag_validator: Optional[Type[ETagValidator]] = None
 
     def build_cache_control(self) -> Optional[str]:
         directives: list[str] = []
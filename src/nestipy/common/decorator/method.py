@@ -1,7 +1,7 @@
 from typing import Callable, Iterable, Literal, Optional, Union
 
 from nestipy.metadata import Reflect, RouteKey
-from nestipy.common.cache import CachePolicy
+from nestipy.common.cache import CachePolicy, ETagValidator
 
 HTTPMethod = Literal[
     "GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS", "ALL", "ANY"
@@ -126,6 +126,8 @@ class Cache:
         vary: Optional[Iterable[str]] = None,
         etag: Optional[str] = None,
         last_modified: Optional[str] = None,
+        auto_etag: bool = False,
+        etag_validator: Optional[type[ETagValidator]] = None,
     ):
         self.policy = policy or CachePolicy(
             max_age=max_age,
@@ -140,6 +142,8 @@ class Cache:
             vary=vary,
             etag=etag,
             last_modified=last_modified,
+            auto_etag=auto_etag,
+            etag_validator=etag_validator,
         )
 
     def __call__(self, target: Callable):
@@ -2,9 +2,19 @@ import importlib.metadata
 import os
 import platform
 from dataclasses import dataclass, field
-from typing import List
+from functools import lru_cache
+from typing import List, TYPE_CHECKING
 from typing import Union
 
+if TYPE_CHECKING:
+    from .traceback_capture import TracebackCapture
+
+
+@lru_cache(maxsize=1)
+def _framework_versions() -> tuple[str, str]:
+    # reading the package metadata hits the file system, do it once
+    return platform.python_version(), importlib.metadata.version("nestipy")
+
 
 @dataclass
 class FrameworkTrack:
@@ -55,9 +65,7 @@ class ExceptionDetail:
     )
     traceback: List[Traceback] = field(default_factory=lambda: [])
     framework: FrameworkTrack = field(
-        default_factory=lambda: FrameworkTrack(
-            platform.python_version(), importlib.metadata.version("nestipy")
-        )
+        default_factory=lambda: FrameworkTrack(*_framework_versions())
     )
 
 
@@ -72,26 +80,46 @@ class HttpException(Exception):
         status_code: int,
         message: Union[str, None] = None,
         details: Union[dict, str, None] = None,
-        track_back: Union[ExceptionDetail, None] = None,
+        track_back: Union[ExceptionDetail, "TracebackCapture", None] = None,
     ):
         """
         Initialize HttpException.
         :param status_code: HTTP status code.
         :param message: Error message.
         :param details: Additional error details.
-        :param track_back: Detailed traceback info.
+        :param track_back: Detailed traceback info, or a capture built into it on
+        first access.
         """
         self.status_code = status_code
         self.message = message
         self.details = details
-        self.track_back = track_back or ExceptionDetail(
-            "Internal server error",
-            "HttpException",
-            message,
-            os.getcwd(),
-        )
+        self.track_back = track_back
         super().__init__(self.message)
 
+    @property
+    def track_back(self) -> ExceptionDetail:
+        """
+        Detailed traceback info, built when first read.
+        """
+        track_back = getattr(self, "_track_back", None)
+        if track_back is None:
+            track_back = ExceptionDetail(
+                "Internal server error",
+                "HttpException",
+                self.message,
+                os.getcwd(),
+            )
+        elif not isinstance(track_back, ExceptionDetail):
+            track_back = track_back.materialize()
+        self._track_back = track_back
+        return track_back
+
+    @track_back.setter
+    def track_back(
+        self, value: Union[ExceptionDetail, "TracebackCapture", None]
+    ) -> None:
+        self._track_back = value
+
     def __str__(self):
         """
         Return a string representation of the exception.
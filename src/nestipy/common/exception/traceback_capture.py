@@ -0,0 +1,170 @@
+import os
+import random
+import sys
+from functools import lru_cache
+from typing import Optional, Union
+
+from .http import ExceptionDetail, RequestTrack, Traceback
+
+# lines shown around the failing line of each frame
+CONTEXT_LINES = 9
+
+
+@lru_cache(maxsize=256)
+def _read_lines(filename: str, mtime_ns: int) -> tuple[str, ...]:
+    with open(filename, "r") as file:
+        return tuple(file.readlines())
+
+
+def source_lines(filename: str) -> tuple[str, ...]:
+    """
+    Lines of a source file, kept in an LRU cache until the file changes.
+    :param filename: Path of the file.
+    :return: The lines, with their line endings.
+    """
+    return _read_lines(filename, os.stat(filename).st_mtime_ns)
+
+
+def code_context(filename: str, lineno: int, n: int) -> tuple[str, int]:
+    """
+    Code around a line of a source file.
+    :param filename: Path of the file.
+    :param lineno: The line, starting at 1.
+    :param n: Number of lines to show before and after it.
+    :return: The code and the number of its first line.
+    """
+    try:
+        lines = source_lines(filename)
+    except Exception as e:
+        return f"Could not read file {filename}: {str(e)}", 1
+    size = (n * 2) + 1
+    if len(lines) < size:
+        return "".join(lines), 1
+    start = max(0, lineno - n - 1)
+    end = min(len(lines), lineno + n + 1)
+    return "".join(lines[start:end]), start + 1
+
+
+class TracebackCapture:
+    """
+    Traceback of the exception being handled, captured without any file I/O.
+    Only the file name, line and function of each frame are kept; the
+    ExceptionDetail with the code of each frame is built by materialize(), when
+    an error page or a debug payload needs it.
+    """
+
+    __slots__ = ("exception", "type", "message", "method", "path", "frames", "root")
+
+    def __init__(
+        self,
+        exception: Optional[str],
+        type_: str,
+        message: Union[str, dict, list, None],
+        method: str,
+        path: str,
+        frames: list[tuple[str, int, str]],
+        root: Optional[str] = None,
+    ) -> None:
+        self.exception = exception
+        self.type = type_
+        self.message = message
+        self.method = method
+        self.path = path
+        self.frames = frames
+        self.root = root
+
+    @classmethod
+    def capture(
+        cls, req, exception: Optional[str], root: Optional[str] = None
+    ) -> "TracebackCapture":
+        """
+        Capture the exception currently handled (sys.exc_info()).
+        :param req: The request being handled, if any.
+        :param exception: The exception message.
+        :param root: Project root, frames outside it are marked as packages.
+        Defaults to the working directory when materialized.
+        :return: The capture.
+        """
+        exc_type, exc_value, tb = sys.exc_info()
+        frames = []
+        while tb is not None:
+            code = tb.tb_frame.f_code
+            frames.append((code.co_filename, tb.tb_lineno, code.co_name))
+            tb = tb.tb_next
+        frames.reverse()
+        return cls(
+            exception,
+            exc_type.__name__ if exc_type else "Unknown",
+            getattr(exc_value, "details", None) or str(exc_value),
+            req.method if req else "GET",
+            req.path if req else "localhost",
+            frames,
+            root,
+        )
+
+    def materialize(self) -> ExceptionDetail:
+        """
+        Build the ExceptionDetail, reading the code of each frame.
+        :return: The exception detail.
+        """
+        root = self.root or os.getcwd()
+        traceback_details = []
+        for filename, lineno, name in self.frames:
+            code, start = code_context(filename, lineno, CONTEXT_LINES)
+            traceback_details.append(
+                Traceback(
+                    filename=f"{filename.replace(root, '').strip('/')}",
+                    lineno=lineno,
+                    name=name,
+                    code=code,
+                    start_line_number=start,
+                    is_package=not filename.startswith(root),
+                )
+            )
+        return ExceptionDetail(
+            exception=self.exception,
+            type=self.type,
+            root=root,
+            traceback=traceback_details,
+            request=RequestTrack(method=self.method, host=self.path),
+            message=self.message,
+        )
+
+
+class TracebackSampler:
+    """
+    Decide which errors get their full traceback logged, so an error storm
+    does not flood the logs. The rate defaults to NESTIPY_ERROR_TRACEBACK_SAMPLE
+    (0 logs none, 1 logs all).
+    """
+
+    _rate: Optional[float] = None
+
+    @classmethod
+    def set_rate(cls, rate: Optional[float]) -> None:
+        cls._rate = None if rate is None else min(max(float(rate), 0.0), 1.0)
+
+    @classmethod
+    def get_rate(cls) -> float:
+        if cls._rate is None:
+            try:
+                rate = float(os.getenv("NESTIPY_ERROR_TRACEBACK_SAMPLE", "") or 0)
+            except ValueError:
+                rate = 0.0
+            cls.set_rate(rate)
+        return cls._rate or 0.0
+
+    @classmethod
+    def should_log(cls) -> bool:
+        rate = cls.get_rate()
+        if rate <= 0:
+            return False
+        return rate >= 1 or random.random() < rate
+
+
+__all__ = [
+    "TracebackCapture",
+    "TracebackSampler",
+    "code_context",
+    "source_lines",
+]
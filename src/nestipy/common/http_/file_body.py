@@ -0,0 +1,218 @@
+import asyncio
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Mapping, Optional
+
+if TYPE_CHECKING:
+    from .response import Response
+
+PATHSEND = "http.response.pathsend"
+ZEROCOPYSEND = "http.response.zerocopysend"
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+
+class FileBody:
+    """
+    A file sent as response body, or the byte range of it selected by a Range
+    request. The body is never loaded in memory: ASGI servers supporting the
+    pathsend or zerocopysend extensions send the file themselves, other servers
+    receive chunks read in a worker thread.
+    """
+
+    __slots__ = ("path", "size", "mtime", "chunk_size", "start", "end")
+
+    def __init__(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        stat = os.stat(path)
+        self.path = os.path.abspath(path)
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.chunk_size = chunk_size
+        self.start = 0
+        # exclusive
+        self.end = self.size
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+    @property
+    def partial(self) -> bool:
+        return self.start != 0 or self.end != self.size
+
+    def etag(self) -> str:
+        return f'"{int(self.mtime * 1_000_000):x}-{self.size:x}"'
+
+    def last_modified(self) -> str:
+        return formatdate(self.mtime, usegmt=True)
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """
+        Yield the selected bytes of the file. Reads run in a worker thread: reading
+        a file that is not in the page cache would block the event loop.
+        """
+        if self.length <= 0:
+            return
+        file = await asyncio.to_thread(open, self.path, "rb")
+        try:
+            file.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await asyncio.to_thread(
+                    file.read, min(self.chunk_size, remaining)
+                )
+                if not chunk:
+                    # the file was truncated meanwhile
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            file.close()
+
+
+async def send_file_body(file: FileBody, scope: dict, send: Callable) -> None:
+    """
+    Write the body of a file response, once http.response.start was sent.
+    :param file: The file to send.
+    :param scope: ASGI scope of the request, telling the supported extensions.
+    :param send: ASGI send callable.
+    """
+    extensions = scope.get("extensions") or {}
+    if ZEROCOPYSEND in extensions:
+        with open(file.path, "rb") as f:
+            await send(
+                {
+                    "type": ZEROCOPYSEND,
+                    "file": f,
+                    "offset": file.start,
+                    "count": file.length,
+                }
+            )
+        return
+    if PATHSEND in extensions and not file.partial:
+        await send({"type": PATHSEND, "path": file.path})
+        return
+    async for chunk in file.chunks():
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _parse_range(value: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single byte range.
+    :return: (start, exclusive end), (0, 0) when unsatisfiable, None when the
+        header is invalid or asks for several ranges (then the full file is sent).
+    """
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                return 0, 0
+            return max(size - suffix, 0), size
+        start = int(first)
+        end = int(last) + 1 if last else size
+    except ValueError:
+        return None
+    if start >= size:
+        return 0, 0
+    if end <= start:
+        return None
+    return start, min(end, size)
+
+
+def _etag_matches(header: str, etag: str, weak: bool) -> bool:
+    if header.strip() == "*":
+        return True
+    if weak:
+        etag = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+    return any(tag.strip() == etag for tag in header.split(","))
+
+
+def _header(res: "Response", name: str) -> Optional[str]:
+    for key, value in res.headers():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _not_modified(res: "Response", headers: Mapping[str, str]) -> bool:
+    etag = _header(res, "etag")
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and _etag_matches(if_none_match, etag, weak=True)
+    last_modified = _header(res, "last-modified")
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+                if_modified_since
+            )
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _if_range_matches(res: "Response", if_range: str) -> bool:
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        etag = _header(res, "etag")
+        # If-Range requires a strong comparison
+        return (
+            etag is not None
+            and not etag.startswith("W/")
+            and _etag_matches(if_range, etag, weak=False)
+        )
+    return if_range == _header(res, "last-modified")
+
+
+def prepare_file_response(
+    res: "Response", method: str, headers: Mapping[str, str]
+) -> "Response":
+    """
+    Apply the request conditions to a file response: answer 304 when the client
+    copy is fresh, and select the byte range asked by a Range header (honouring
+    If-Range) with a 206, or a 416 when the range can not be satisfied.
+    :param res: Response whose body is a file.
+    :param method: HTTP method of the request.
+    :param headers: Request headers, with lower-case names.
+    :return: The response.
+    """
+    file = res.file_body()
+    if file is None or res.status_code() != 200 or method not in ("GET", "HEAD"):
+        return res
+    if _not_modified(res, headers):
+        res.status(304).clear_body()
+        return res
+    range_header = headers.get("range")
+    if not range_header or method != "GET":
+        return res
+    if_range = headers.get("if-range")
+    if if_range is not None and not _if_range_matches(res, if_range):
+        return res
+    selected = _parse_range(range_header, file.size)
+    if selected is None:
+        return res
+    if selected == (0, 0):
+        res.status(416).header("Content-Range", f"bytes */{file.size}").clear_body()
+        return res
+    file.start, file.end = selected
+    res.status(206).header(
+        "Content-Range", f"bytes {file.start}-{file.end - 1}/{file.size}"
+    )
+    return res
+
+
+__all__ = [
+    "FileBody",
+    "send_file_body",
+    "prepare_file_response",
+    "PATHSEND",
+    "ZEROCOPYSEND",
+    "DEFAULT_CHUNK_SIZE",
+]
@@ -34,6 +34,29 @@ class Request:
     Provides access to request components like headers, body, query parameters, and more.
     """
 
+    __slots__ = (
+        "scope",
+        "receive",
+        "send",
+        "_query_params",
+        "_headers",
+        "_path",
+        "_method",
+        "_client",
+        "_host",
+        "_body",
+        "_json",
+        "_files",
+        "_user",
+        "_form",
+        "_session",
+        "_cookies",
+        "_stream_consumed",
+        "_is_disconnected",
+        # attributes attached by middleware or guards (debug, ...)
+        "__dict__",
+    )
+
     def __init__(self, scope: dict, receive: Callable, send: Callable) -> None:
         """
         Initialize the Request object.
@@ -2,30 +2,42 @@ import mimetypes
 import os
 from typing import Union, TYPE_CHECKING, AsyncIterator, Callable, Self, Optional
 
-import aiofiles
 import orjson as json
 from nestipy.common.exception.http import HttpException
 from nestipy.common.exception.message import HttpStatusMessages
 from nestipy.common.exception.status import HttpStatus
+from .file_body import DEFAULT_CHUNK_SIZE, FileBody
 
 if TYPE_CHECKING:
     from nestipy.common.template import TemplateEngine
 
 
 class Response:
-    _status_code: int = 200
-    _headers: set[tuple[str, str]] = set()
-    _cookies: set[tuple[str, str]] = set()
+    __slots__ = (
+        "_status_code",
+        "_headers",
+        "_cookies",
+        "_content",
+        "stream_content",
+        "template_engine",
+        "_file",
+    )
+
+    _status_code: int
+    _headers: set[tuple[str, str]]
+    _cookies: set[tuple[str, str]]
     _content: Union[bytes, None]
 
     def __init__(self, template_engine: Union["TemplateEngine", None] = None) -> None:
         self._headers = set()
+        self._cookies = set()
         self._status_code = 200
         self._content = None
         self.stream_content: Optional[
             Callable[[], AsyncIterator[Union[bytes, str]]]
         ] = None
         self.template_engine = template_engine
+        self._file: Optional[FileBody] = None
 
     async def _start(self) -> None:
         # await self._send({
@@ -67,7 +79,7 @@ class Response:
             response(Response): An instance of response
         """
         self._headers = set(
-            [(k, v) for k, v in self._headers if k.lower() != name.lower]
+            [(k, v) for k, v in self._headers if k.lower() != name.lower()]
         )
         self._headers.add((name, value))
         return self
@@ -83,7 +95,7 @@ class Response:
             response(Response): An instance of response
         """
         self._cookies = set(
-            [(k, v) for k, v in self._cookies if k.lower() != name.lower]
+            [(k, v) for k, v in self._cookies if k.lower() != name.lower()]
         )
         self._cookies.add((name, value))
         return self
@@ -162,21 +174,63 @@ class Response:
         Returns:
                 response(Response): An instance of response
         """
+        file_name = os.path.basename(file_path)
+        return await self.send_file(
+            file_path,
+            disposition=f"{'attachment; ' if attachment else ''}filename={file_name}",
+        )
+
+    async def send_file(
+        self,
+        file_path: str,
+        content_type: Optional[str] = None,
+        disposition: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> "Response":
+        """
+        Send a file without loading it in memory. Range and conditional requests are
+        answered from the ETag and Last-Modified headers set here.
+        Args:
+            file_path(str): The path of the file to send
+            content_type(str): Content type, guessed from the file name by default
+            disposition(str): Optional Content-Disposition header value
+            chunk_size(int): Size of the chunks when the server can not send the file
+        Returns:
+            response(Response): An instance of response
+        """
         if not os.path.isfile(file_path):
             self.status(404)
             await self._write(b"File not found")
             return self
-        file_name = os.path.basename(file_path)
-        mimetype, _ = mimetypes.guess_type(file_name)
-        self.header("Content-Type", mimetype or "application/octet-stream")
-        self.header(
-            "Content-Disposition",
-            f"{'attachment; ' if attachment else ''}filename={file_name}",
-        )
-        async with aiofiles.open(file_path, "rb") as file:
-            content = await file.read()
-            # self.header("Content-Length", str(len(content)))
-            await self._write(content)
+        file = FileBody(file_path, chunk_size)
+        if content_type is None:
+            content_type, _ = mimetypes.guess_type(file_path)
+        self.header("Content-Type", content_type or "application/octet-stream")
+        if disposition is not None:
+            self.header("Content-Disposition", disposition)
+        self.header("Accept-Ranges", "bytes")
+        self.header("ETag", file.etag())
+        self.header("Last-Modified", file.last_modified())
+        self._file = file
+        # adapters unaware of file bodies stream the chunks
+        self.stream_content = file.chunks
+        return self
+
+    def file_body(self) -> Optional[FileBody]:
+        """
+        Get the file sent as body, if any.
+        :return: The FileBody or None.
+        """
+        return self._file
+
+    def clear_body(self) -> "Response":
+        """
+        Drop the body, for responses like 304 that must not have one.
+        :return: The Response instance.
+        """
+        self._file = None
+        self.stream_content = None
+        self._content = b""
         return self
 
     async def stream(self, callback: Callable[[], AsyncIterator[Union[bytes, str]]]):
@@ -190,7 +244,9 @@ class Response:
         self.stream_content = callback
         return self
 
-    async def stream_file(self, file_path: str, chunk_size: int = 4096) -> "Response":
+    async def stream_file(
+        self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> "Response":
         """
         Stream file
         Args:
@@ -200,20 +256,7 @@ class Response:
             response(Response): Response instance
 
         """
-        if not os.path.isfile(file_path):
-            self.status(404)
-            await self._write(b"File not found")
-            return self
-
-        async def _get_stream() -> AsyncIterator[bytes]:
-            async with aiofiles.open(file_path, "rb") as file:
-                chunk: bytes = await file.read(chunk_size)
-                # no benefit because we don't send response directly
-                while chunk:
-                    yield chunk
-                    chunk = await file.read(chunk_size)
-
-        return await self.stream(_get_stream)
+        return await self.send_file(file_path, chunk_size=chunk_size)
 
     async def render(self, template: str, context=None):
         """
@@ -1,4 +1,5 @@
 from .http_adapter import HttpAdapter
+from .asgi_adapter import AsgiAdapter
 
 try:
     from .blacksheep_adapter import BlackSheepAdapter
@@ -8,7 +9,7 @@ except ImportError:
 from .fastapi_adapter import FastApiAdapter
 
 # Dynamically build the __all__ list
-__all__ = ["HttpAdapter"]
+__all__ = ["HttpAdapter", "AsgiAdapter"]
 if BlackSheepAdapter:
     __all__.append("BlackSheepAdapter")
 if FastApiAdapter:
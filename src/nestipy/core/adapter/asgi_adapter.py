@@ -0,0 +1,250 @@
+import typing
+from typing import Optional
+
+from starlette.middleware.cors import CORSMiddleware
+from starlette.staticfiles import StaticFiles
+
+from nestipy.common.http_ import Response, Websocket
+from nestipy.common.http_.file_body import send_file_body
+from nestipy.core.router.radix_router import RadixRouter
+from nestipy.core.security.cors import CorsOptions, resolve_cors_options
+from nestipy.core.types import ASGIApp
+from nestipy.types_ import CallableHandler, MountHandler, WebsocketHandler
+from .http_adapter import HttpAdapter
+
+_NO_BODY_STATUS = (204, 304)
+
+
+class _Route(typing.NamedTuple):
+    callback: typing.Callable
+    metadata: Optional[dict]
+
+
+class AsgiAdapter(HttpAdapter):
+    """
+    HTTP adapter talking ASGI directly, without a host framework.
+    Routes are matched by a RadixRouter with typed path parameters, the Nestipy
+    Request is built from the ASGI scope and the Response is written with
+    http.response.start / http.response.body messages.
+    """
+
+    def __init__(self):
+        self._router: RadixRouter[_Route] = RadixRouter()
+        self._ws_router: RadixRouter[_Route] = RadixRouter()
+        self._mounts: list[tuple[str, ASGIApp]] = []
+        self._app: ASGIApp = self._handle
+        self._cors_enabled = False
+
+    def get_instance(self) -> ASGIApp:
+        return self._app
+
+    def create_wichard(self, prefix: str = "/", name: str = "full_path") -> str:
+        prefix = prefix.strip("/")
+        return ("/" + prefix).rstrip("/") + "/{" + f"{name}:path" + "}"
+
+    def use(
+        self, callback: CallableHandler, metadata: typing.Optional[dict] = None
+    ) -> None:
+        # middlewares are run by the router proxy
+        pass
+
+    def static(
+        self, route: str, directory: str, name: str = None, option: dict = None
+    ) -> None:
+        self.mount(route, StaticFiles(directory=directory, **(option or {})))
+
+    def mount(self, route: str, callback: MountHandler) -> None:
+        self._mounts.append(("/" + route.strip("/"), typing.cast(ASGIApp, callback)))
+        # longest prefix first
+        self._mounts.sort(key=lambda m: len(m[0]), reverse=True)
+
+    def _add(
+        self, method: str, route: str, callback: CallableHandler, metadata=None
+    ) -> None:
+        self._router.add(method, route, _Route(callback, metadata))
+
+    def get(self, route: str, callback: CallableHandler, metadata=None) -> None:
+        self._add("GET", route, callback, metadata)
+
+    def post(self, route: str, callback: CallableHandler, metadata=None) -> None:
+        self._add("POST", route, callback, metadata)
+
+    def put(self, route: str, callback: CallableHandler, metadata=None) -> None:
+        self._add("PUT", route, callback, metadata)
+
+    def delete(self, route: str, callback: CallableHandler, metadata=None) -> None:
+        self._add("DELETE", route, callback, metadata)
+
+    def patch(self, route: str, callback: CallableHandler, metadata=None) -> None:
+        self._add("PATCH", route, callback, metadata)
+
+    def options(self, route: str, callback: CallableHandler, metadata=None) -> None:
+        self._add("OPTIONS", route, callback, metadata)
+
+    def head(self, route: str, callback: CallableHandler, metadata=None) -> None:
+        self._add("HEAD", route, callback, metadata)
+
+    def all(self, route: str, callback: CallableHandler, metadata=None) -> None:
+        self._add(RadixRouter.ANY, route, callback, metadata)
+
+    def ws(
+        self,
+        route: str,
+        callback: WebsocketHandler,
+        metadata: typing.Optional[dict] = None,
+    ) -> None:
+        self._ws_router.add(RadixRouter.ANY, route, _Route(callback, metadata))
+
+    def engine(self, args, *kwargs) -> None:
+        pass
+
+    def enable_cors(self, options: CorsOptions | None = None) -> None:
+        if self._cors_enabled:
+            return
+        if options is None:
+            options = CorsOptions.from_env()
+        else:
+            options = resolve_cors_options(options)
+        if options is None:
+            return
+        self._cors_enabled = True
+        allow_origins = options.allow_origins
+        if options.allow_all or "*" in allow_origins:
+            allow_origins = ["*"]
+        allow_credentials = bool(options.allow_credentials and "*" not in allow_origins)
+        self._app = CORSMiddleware(
+            self._app,
+            allow_origins=allow_origins,
+            allow_credentials=allow_credentials,
+            allow_methods=options.allow_methods,
+            allow_headers=options.allow_headers,
+            expose_headers=options.expose_headers,
+            max_age=options.max_age,
+            allow_origin_regex=options.allow_origin_regex,
+        )
+
+    async def _handle(self, scope: dict, receive, send) -> None:
+        scope_type = scope["type"]
+        if scope_type == "lifespan":
+            await self._handle_lifespan(receive, send)
+            return
+        path = self._route_path(scope)
+        router = self._router if scope_type == "http" else self._ws_router
+        match = router.match(scope.get("method", "GET"), path)
+        if match is None or match.catch_all:
+            # routes win over mounts, mounts win over catch-all routes
+            mount = self._find_mount(path)
+            if mount is not None:
+                prefix, app = mount
+                child_scope = dict(scope)
+                child_scope["root_path"] = scope.get("root_path", "") + prefix
+                await app(child_scope, receive, send)
+                return
+        if match is None:
+            if scope_type == "http":
+                await self._send_plain(send, 404, b"Not Found")
+            else:
+                await send({"type": "websocket.close", "code": 1000})
+            return
+        scope["path_params"] = match.params
+        route = match.handler
+        if scope_type != "http":
+            await route.callback(Websocket(scope, receive, send))
+            return
+        result: Response = await self.process_callback(
+            route.callback, route.metadata, scope, receive, send
+        )
+        await self._send_response(result, send, scope["method"] == "HEAD", scope)
+
+    @staticmethod
+    def _route_path(scope: dict) -> str:
+        path: str = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            return path[len(root_path) :] or "/"
+        return path
+
+    def _find_mount(self, path: str) -> Optional[tuple[str, ASGIApp]]:
+        for prefix, app in self._mounts:
+            if prefix == "/" or path == prefix or path.startswith(prefix + "/"):
+                return prefix if prefix != "/" else "", app
+        return None
+
+    async def _handle_lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.on_startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                try:
+                    await self.on_shutdown()
+                finally:
+                    await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _send_plain(send, status: int, body: bytes) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _send_response(
+        result: Response, send, head: bool = False, scope: Optional[dict] = None
+    ) -> None:
+        status = result.status_code() or 200
+        headers: list[tuple[bytes, bytes]] = []
+        has_content_type = False
+        for name, value in result.headers():
+            name = name.lower()
+            if name == "content-length":
+                continue
+            if name == "content-type":
+                has_content_type = True
+            headers.append((name.encode("latin-1"), str(value).encode("latin-1")))
+        if not has_content_type:
+            headers.append((b"content-type", result.content_type().encode("latin-1")))
+        no_body = head or status in _NO_BODY_STATUS or status < 200
+        file = result.file_body()
+        if file is not None:
+            headers.append((b"content-length", str(file.length).encode()))
+            await send(
+                {"type": "http.response.start", "status": status, "headers": headers}
+            )
+            if no_body:
+                await send({"type": "http.response.body", "body": b""})
+            else:
+                await send_file_body(file, scope or {}, send)
+            return
+        if result.is_stream() and not no_body:
+            await send(
+                {"type": "http.response.start", "status": status, "headers": headers}
+            )
+            async for chunk in result.stream_content():
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        body = result.content() or b""
+        if status not in _NO_BODY_STATUS and status >= 200:
+            headers.append((b"content-length", str(len(body)).encode()))
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": b"" if no_body else body})
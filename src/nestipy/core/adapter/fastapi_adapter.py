@@ -159,9 +159,13 @@ class FastApiAdapter(HttpAdapter):
         async def fastapi_handler() -> FResponse:
             result: Response = await self.process_callback(callback, _metadata)
             if result.is_stream():
+                headers = {k: v for k, v in result.headers()}
+                file = result.file_body()
+                if file is not None:
+                    headers["Content-Length"] = str(file.length)
                 return FStreamingResponse(
                     content=result.stream_content(),
-                    headers={k: v for k, v in result.headers()},
+                    headers=headers,
                     status_code=result.status_code() or 200,
                 )
             return FResponse(
@@ -11,6 +11,7 @@ from contextlib import asynccontextmanager
 from nestipy.common import Response
 from nestipy.common.exception.http import HttpException
 from nestipy.common.http_ import Request, Response, Websocket
+from nestipy.common.http_.file_body import prepare_file_response
 from nestipy.common.constant import DEVTOOLS_STATIC_PATH_KEY
 from nestipy.common.template import TemplateKey
 from nestipy.common.template.interface import TemplateEngine
@@ -337,9 +338,16 @@ class HttpAdapter(ABC):
         return Websocket(self.scope, self.receive, self.send)
 
     async def process_callback(
-        self, callback: CallableHandler, metadata: dict[str, JsonValue] | None = None
+        self,
+        callback: CallableHandler,
+        metadata: dict[str, JsonValue] | None = None,
+        scope: typing.Optional[dict] = None,
+        receive: typing.Optional[Callable] = None,
+        send: typing.Optional[Callable] = None,
     ) -> Response:
-        req = Request(self.scope, self.receive, self.send)
+        if scope is None:
+            scope, receive, send = self.scope, self.receive, self.send
+        req = Request(scope, receive, send)
         res = Response(template_engine=self.get_state(TemplateKey.MetaEngine))
         if req.request_id is None:
             header_id = req.headers.get("x-request-id") or req.headers.get(
@@ -410,7 +418,11 @@ class HttpAdapter(ABC):
                 return await res.status(204).send("No content")
 
         if not metadata:
-            return await RouterProxy.create_request_handler(
+            result = await RouterProxy.create_request_handler(
                 self, custom_callback=callback
             )(req, res, next_fn)
-        return await callback(req, res, next_fn)
+        else:
+            result = await callback(req, res, next_fn)
+        if isinstance(result, Response) and result.file_body() is not None:
+            result = prepare_file_response(result, req.method, req.headers)
+        return result
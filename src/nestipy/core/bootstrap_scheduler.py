@@ -0,0 +1,249 @@
+import asyncio
+import inspect
+import sys
+import time
+from typing import Any, Awaitable, Callable, ForwardRef, Optional, Type
+
+from nestipy.dynamic_module import DynamicModule
+from nestipy.ioc import ModuleProviderDict
+from nestipy.ioc.helper import ContainerHelper
+from nestipy.metadata import CtxDepKey, ModuleMetadata, ProviderToken, Reflect
+
+
+class BootstrapNode:
+    """Provider or controller instantiated by the bootstrap scheduler."""
+
+    __slots__ = ("key", "kind", "service", "deps", "ms", "finish_ms", "instance")
+
+    def __init__(self, key: Any, kind: str, service: Any) -> None:
+        self.key = key
+        self.kind = kind
+        self.service = service
+        self.deps = service_deps(service)
+        self.ms = 0.0
+        # end of the longest chain of dependencies leading to this node
+        self.finish_ms = 0.0
+        self.instance: Any = None
+
+    @property
+    def name(self) -> str:
+        key = self.key
+        if isinstance(key, ProviderToken):
+            return f"Token({key.key})"
+        if isinstance(key, str):
+            return key
+        return getattr(key, "__name__", str(key))
+
+
+def walk_modules(modules: list) -> tuple[list[Type], dict[Type, list[Type]]]:
+    """
+    Collect the module graph in the order the serial loader visits it.
+    :param modules: Root modules (classes or DynamicModule).
+    :return: The modules in depth-first order, and the imports of each module.
+    """
+    order: list[Type] = []
+    imports: dict[Type, list[Type]] = {}
+
+    def visit(refs: list) -> None:
+        for ref in refs:
+            module = ref.module if isinstance(ref, DynamicModule) else ref
+            if module in imports:
+                continue
+            children = [
+                m.module if isinstance(m, DynamicModule) else m
+                for m in Reflect.get_metadata(module, ModuleMetadata.Imports, [])
+            ]
+            imports[module] = children
+            order.append(module)
+            visit(children)
+
+    visit(modules)
+    return order, imports
+
+
+def module_levels(order: list[Type], imports: dict[Type, list[Type]]) -> list[list[Type]]:
+    """
+    Group modules so that every module comes after the modules it imports.
+    Modules of a same group do not import each other.
+    :param order: Modules as returned by walk_modules.
+    :param imports: Imports of each module.
+    :return: Groups of modules, imported modules first.
+    """
+    depth: dict[Type, int] = {}
+
+    def visit(module: Type, path: set) -> int:
+        if module in depth:
+            return depth[module]
+        path.add(module)
+        # an import cycle is cut where it closes
+        children = [c for c in imports.get(module, []) if c not in path]
+        value = 1 + max((visit(c, path) for c in children), default=-1)
+        path.discard(module)
+        depth[module] = value
+        return value
+
+    for module in order:
+        visit(module, set())
+    levels: list[list[Type]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for module in order:
+        levels[depth[module]].append(module)
+    return levels
+
+
+def _service_key(annotation: Any, dep_key: Any, owner: Any) -> Any:
+    key = dep_key.metadata.token or annotation
+    if isinstance(key, ForwardRef):
+        module = sys.modules.get(getattr(owner, "__module__", ""), None)
+        try:
+            key = eval(key.__forward_arg__, vars(module) if module else {})
+        except Exception:
+            return None
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _callable_deps(func: Optional[Callable], owner: Any) -> set:
+    deps: set = set()
+    if func is None:
+        return deps
+    try:
+        params = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return deps
+    for name, param in params.items():
+        if name == "self" or param.annotation is inspect.Parameter.empty:
+            continue
+        annotation, dep_key = ContainerHelper.get_type_from_annotation(param.annotation)
+        if dep_key.metadata.key is CtxDepKey.Service:
+            deps.add(_service_key(annotation, dep_key, owner))
+    return deps
+
+
+def service_deps(service: Any) -> set:
+    """
+    Keys injected into a service, read from its constructor and its annotated
+    properties the same way the container resolves them.
+    :param service: A class or a ModuleProviderDict.
+    :return: The injected keys.
+    """
+    if isinstance(service, ModuleProviderDict):
+        if service.value is not None:
+            return set()
+        if service.existing is not None:
+            existing = service.existing
+            return {existing.key if isinstance(existing, ProviderToken) else existing}
+        if service.use_class is not None:
+            return {service.use_class}
+        return _callable_deps(service.factory, service.factory)
+    if not inspect.isclass(service):
+        return set()
+    deps = _callable_deps(getattr(service, "__init__", None), service)
+    for annotation in getattr(service, "__annotations__", {}).values():
+        annotation, dep_key = ContainerHelper.get_type_from_annotation(annotation)
+        if dep_key.metadata.key is CtxDepKey.Service:
+            deps.add(_service_key(annotation, dep_key, service))
+    deps.discard(None)
+    return deps
+
+
+class BootstrapScheduler:
+    """
+    Instantiate the providers and controllers of a module graph level by level.
+    A node only waits for the nodes it injects, so providers opening
+    connections in async factories or on_startup hooks run concurrently.
+    Nodes in a dependency cycle are left to the container, one at a time, which
+    reports the cycle as the serial loader does.
+    """
+
+    def __init__(self, create: Callable[[BootstrapNode], Awaitable[Any]]) -> None:
+        self._create = create
+        self.nodes: dict[Any, BootstrapNode] = {}
+        self.levels: list[list[BootstrapNode]] = []
+        self.cyclic: list[BootstrapNode] = []
+
+    def add(self, key: Any, kind: str, service: Any) -> None:
+        if key in self.nodes:
+            return
+        self.nodes[key] = BootstrapNode(key, kind, service)
+
+    def plan(self) -> list[list[BootstrapNode]]:
+        """
+        Sort the nodes into levels, each node after the nodes it injects.
+        Nodes left in a cycle are kept apart in self.cyclic.
+        :return: The levels.
+        """
+        pending = {
+            key: {d for d in node.deps if d in self.nodes and d != key}
+            for key, node in self.nodes.items()
+        }
+        levels: list[list[BootstrapNode]] = []
+        while pending:
+            ready = [key for key, deps in pending.items() if not deps]
+            if not ready:
+                self.cyclic = [self.nodes[key] for key in pending]
+                break
+            levels.append([self.nodes[key] for key in ready])
+            for key in ready:
+                del pending[key]
+            for deps in pending.values():
+                deps.difference_update(ready)
+        self.levels = levels
+        return levels
+
+    async def run(self) -> None:
+        if not self.levels:
+            self.plan()
+        for level in self.levels:
+            await asyncio.gather(*(self._run_node(node) for node in level))
+        for node in self.cyclic:
+            await self._run_node(node)
+
+    async def _run_node(self, node: BootstrapNode) -> None:
+        start = time.perf_counter()
+        node.instance = await self._create(node)
+        node.ms = (time.perf_counter() - start) * 1000
+        node.finish_ms = node.ms + max(
+            (
+                self.nodes[d].finish_ms
+                for d in node.deps
+                if d in self.nodes and d != node.key
+            ),
+            default=0.0,
+        )
+
+    def critical_path(self) -> list[BootstrapNode]:
+        """
+        The chain of dependent nodes with the largest total creation time, which
+        bounds the bootstrap time however concurrent the rest is.
+        :return: The nodes of the chain, dependencies first.
+        """
+        if not self.nodes:
+            return []
+        node: Optional[BootstrapNode] = max(
+            self.nodes.values(), key=lambda n: n.finish_ms
+        )
+        path: list[BootstrapNode] = []
+        seen: set = set()
+        while node is not None and node.key not in seen:
+            path.append(node)
+            seen.add(node.key)
+            parents = [
+                self.nodes[d]
+                for d in node.deps
+                if d in self.nodes and d not in seen
+            ]
+            node = max(parents, key=lambda n: n.finish_ms, default=None)
+        path.reverse()
+        return path
+
+
+__all__ = [
+    "BootstrapNode",
+    "BootstrapScheduler",
+    "module_levels",
+    "service_deps",
+    "walk_modules",
+]
@@ -0,0 +1,10 @@
+from .response_cache import CachedResponse, ResponseCache
+from .store import CacheStore, MemoryCacheStore, RedisCacheStore
+
+__all__ = [
+    "CacheStore",
+    "MemoryCacheStore",
+    "RedisCacheStore",
+    "CachedResponse",
+    "ResponseCache",
+]
@@ -0,0 +1,283 @@
+import asyncio
+import dataclasses
+import hashlib
+import time
+from typing import Awaitable, Callable, Optional, Union
+from urllib.parse import parse_qsl, urlencode
+
+import orjson
+
+from nestipy.common.cache import CachePolicy
+from nestipy.common.exception.http import HttpException
+from nestipy.common.http_ import Request, Response
+from nestipy.common.logger import logger
+from .store import CacheStore
+
+Producer = Callable[[Response], Awaitable[Response]]
+
+_CACHEABLE_METHODS = ("GET", "HEAD")
+_CACHEABLE_STATUS = (200, 203, 204, 300, 301, 404, 410)
+_SKIPPED_HEADERS = ("age", "set-cookie")
+
+
+@dataclasses.dataclass(slots=True)
+class CachedResponse:
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+    created_at: float
+
+    def dumps(self) -> bytes:
+        head = orjson.dumps(
+            {"s": self.status_code, "h": self.headers, "t": self.created_at}
+        )
+        return head + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedResponse":
+        head, _, body = data.partition(b"\n")
+        meta = orjson.loads(head)
+        return cls(
+            status_code=meta["s"],
+            headers=[(k, v) for k, v in meta["h"]],
+            body=body,
+            created_at=meta["t"],
+        )
+
+
+class ResponseCache:
+    """
+    Server-side cache of route responses driven by the route CachePolicy.
+    A fresh entry is served without running the controller, a stale one is served
+    while a single background task revalidates it (stale_while_revalidate) or when the
+    controller fails with a server error (stale_if_error). Concurrent misses on the
+    same key share one controller call.
+    """
+
+    _instance: Union["ResponseCache", None] = None
+    _store: Optional[CacheStore] = None
+    _inflight: dict[str, asyncio.Future] = {}
+    _revalidating: dict[str, asyncio.Task] = {}
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(ResponseCache, cls).__new__(cls, *args, **kwargs)
+        return cls._instance
+
+    @classmethod
+    def get_instance(cls, *args, **kwargs):
+        return ResponseCache(*args, **kwargs)
+
+    @classmethod
+    def clear(cls):
+        cls._instance = None
+        cls._store = None
+        cls._inflight = {}
+        cls._revalidating = {}
+
+    def set_store(self, store: Optional[CacheStore]) -> None:
+        """
+        Enable the cache with a store, or disable it with None.
+        """
+        type(self)._store = store
+
+    @property
+    def store(self) -> Optional[CacheStore]:
+        return self._store
+
+    @property
+    def enabled(self) -> bool:
+        return self._store is not None
+
+    @staticmethod
+    def is_cacheable(policy: Optional[CachePolicy]) -> bool:
+        """
+        Whether a route policy allows its responses to be shared server-side.
+        """
+        if policy is None or policy.max_age is None:
+            return False
+        return not (policy.no_store or policy.no_cache or policy.private)
+
+    @staticmethod
+    def build_key(req: Request, policy: CachePolicy) -> str:
+        """
+        Key of a request: method, path, normalized query string and the values of the
+        request headers listed in the policy Vary.
+        """
+        query = req.scope.get("query_string", b"")
+        if isinstance(query, bytes):
+            query = query.decode("latin-1")
+        parts = [
+            req.method.upper(),
+            req.path,
+            urlencode(sorted(parse_qsl(query, keep_blank_values=True))),
+        ]
+        if policy.vary:
+            headers = {k.lower(): v for k, v in req.headers.items()}
+            for name in sorted(str(v).strip().lower() for v in policy.vary if v):
+                if name:
+                    parts.append(f"{name}={headers.get(name, '')}")
+        raw = "\n".join(parts).encode()
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    async def serve(
+        self,
+        req: Request,
+        res: Response,
+        policy: CachePolicy,
+        produce: Producer,
+    ) -> Response:
+        """
+        Answer a request from the cache or from the producer.
+        :param req: The current request.
+        :param res: The response to fill.
+        :param policy: The route cache policy.
+        :param produce: Runs the controller and returns the final response for a
+            given Response object. Background revalidations pass a new Response,
+            which the handler must write to instead of the request one.
+        :return: The response.
+        """
+        store = self._store
+        if store is None or req.method.upper() not in _CACHEABLE_METHODS:
+            return await produce(res)
+        key = self.build_key(req, policy)
+        max_age = max(0, int(policy.max_age or 0))
+        swr = max(0, int(policy.stale_while_revalidate or 0))
+        sie = max(0, int(policy.stale_if_error or 0))
+        entry = await self._load(store, key)
+        if entry is not None:
+            age = time.time() - entry.created_at
+            if age < max_age:
+                return await self._restore(res, entry, age)
+            if age < max_age + swr:
+                self._revalidate(key, store, res, policy, produce)
+                return await self._restore(res, entry, age)
+            if age >= max_age + sie:
+                entry = None
+        try:
+            response = await self._single_flight(key, store, res, policy, produce)
+        except Exception as e:
+            if entry is None or not self._is_server_error(e):
+                raise
+            return await self._restore(res, entry, time.time() - entry.created_at)
+        if entry is not None and response.status_code() >= 500:
+            return await self._restore(res, entry, time.time() - entry.created_at)
+        return response
+
+    @staticmethod
+    def _is_server_error(error: Exception) -> bool:
+        # client errors (guards, validation) are answered, not hidden behind stale
+        if isinstance(error, HttpException):
+            return error.status_code >= 500
+        return True
+
+    async def _single_flight(
+        self,
+        key: str,
+        store: CacheStore,
+        res: Response,
+        policy: CachePolicy,
+        produce: Producer,
+    ) -> Response:
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            shared = await asyncio.shield(inflight)
+            if shared is not None:
+                return await self._restore(res, shared, 0)
+            return await produce(res)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        entry: Optional[CachedResponse] = None
+        try:
+            response = await produce(res)
+            entry = await self._save(key, store, response, policy)
+            return response
+        finally:
+            self._inflight.pop(key, None)
+            future.set_result(entry)
+
+    def _revalidate(
+        self,
+        key: str,
+        store: CacheStore,
+        res: Response,
+        policy: CachePolicy,
+        produce: Producer,
+    ) -> None:
+        if key in self._revalidating or key in self._inflight:
+            return
+
+        async def _run():
+            try:
+                await self._single_flight(
+                    key, store, Response(res.template_engine), policy, produce
+                )
+            except Exception as e:
+                logger.warning("Response cache revalidation failed: %s", e)
+            finally:
+                self._revalidating.pop(key, None)
+
+        self._revalidating[key] = asyncio.create_task(_run())
+
+    @staticmethod
+    async def _load(store: CacheStore, key: str) -> Optional[CachedResponse]:
+        try:
+            data = await store.get(key)
+            return CachedResponse.loads(data) if data else None
+        except Exception as e:
+            logger.warning("Response cache read failed: %s", e)
+            return None
+
+    @classmethod
+    async def _save(
+        cls, key: str, store: CacheStore, response: Response, policy: CachePolicy
+    ) -> Optional[CachedResponse]:
+        entry = cls._to_entry(response)
+        if entry is None:
+            return None
+        ttl = max(0, int(policy.max_age or 0)) + max(
+            int(policy.stale_while_revalidate or 0), int(policy.stale_if_error or 0), 0
+        )
+        if ttl <= 0:
+            return entry
+        try:
+            await store.set(key, entry.dumps(), ttl)
+        except Exception as e:
+            logger.warning("Response cache write failed: %s", e)
+        return entry
+
+    @staticmethod
+    def _to_entry(response: Response) -> Optional[CachedResponse]:
+        if (
+            response.status_code() not in _CACHEABLE_STATUS
+            or response.is_stream()
+            or response.cookies()
+        ):
+            return None
+        headers = []
+        for name, value in response.headers():
+            lower = name.lower()
+            if lower == "cache-control" and (
+                "no-store" in value or "private" in value
+            ):
+                return None
+            if lower not in _SKIPPED_HEADERS:
+                headers.append((name, value))
+        return CachedResponse(
+            status_code=response.status_code(),
+            headers=sorted(headers),
+            body=response.content() or b"",
+            created_at=time.time(),
+        )
+
+    @staticmethod
+    async def _restore(res: Response, entry: CachedResponse, age: float) -> Response:
+        res.status(entry.status_code)
+        for name, value in entry.headers:
+            res.header(name, value)
+        res.header("Age", str(max(0, int(age))))
+        await res._write(entry.body)
+        return res
+
+
+__all__ = ["CachedResponse", "ResponseCache"]
@@ -0,0 +1,139 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class CacheStore(ABC):
+    """
+    Byte-oriented key/value store used by the server-side response cache.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        pass
+
+
+class MemoryCacheStore(CacheStore):
+    """
+    In-process LRU store with per-entry TTL and a total byte budget.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: Optional[int] = 1024 * 1024,
+    ):
+        """
+        :param max_entries: Maximum number of entries kept.
+        :param max_bytes: Maximum total size of the stored values.
+        :param max_entry_bytes: Values larger than this are not stored (None for no limit).
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: OrderedDict[str, tuple[bytes, Optional[float]]] = OrderedDict()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        if self.max_entry_bytes is not None and len(value) > self.max_entry_bytes:
+            self._remove(key)
+            return
+        if len(value) > self.max_bytes:
+            self._remove(key)
+            return
+        self._remove(key)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._size += len(value)
+        while self._entries and (
+            self._size > self.max_bytes or len(self._entries) > self.max_entries
+        ):
+            _, (old_value, _expires) = self._entries.popitem(last=False)
+            self._size -= len(old_value)
+
+    async def delete(self, key: str) -> None:
+        self._remove(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+
+class RedisCacheStore(CacheStore):
+    """
+    Store speaking the Redis protocol (Redis, Valkey, KeyDB, ...), shared by every
+    worker connected to the same server.
+    """
+
+    def __init__(
+        self,
+        client: Optional[Any] = None,
+        url: str = "redis://localhost:6379/0",
+        prefix: str = "nestipy:cache:",
+    ):
+        """
+        :param client: An existing redis.asyncio client. Created from url when omitted.
+        :param url: Connection URL used when no client is given.
+        :param prefix: Prefix of every key written by the store.
+        """
+        if client is None:
+            from redis.asyncio import Redis
+
+            client = Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        px = max(1, int(ttl * 1000)) if ttl is not None else None
+        await self.client.set(self.prefix + key, value, px=px)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        keys = [k async for k in self.client.scan_iter(match=f"{self.prefix}*")]
+        if keys:
+            await self.client.delete(*keys)
+
+
+__all__ = ["CacheStore", "MemoryCacheStore", "RedisCacheStore"]
@@ -8,6 +8,20 @@ from nestipy.core.types import (
 )
 
 class ArgumentHost(ABC):
+    __slots__ = (
+        "_adapter",
+        "_module",
+        "_handler",
+        "_class_handler",
+        "_req",
+        "_res",
+        "_graphql_args",
+        "_graphql_context",
+        "_socket_server",
+        "_socket_client",
+        "_socket_data",
+    )
+
     def __init__(
         self,
         adapter: HttpAdapterLike | None,
@@ -17,6 +17,8 @@ class ExecutionContext(ArgumentHost):
     Enables switching between different transport layers (HTTP, GraphQL, WebSocket, RPC).
     """
 
+    __slots__ = ("_pipes",)
+
     def get_args(
         self,
     ) -> tuple[type | None, HandlerFn, Request | None, Response | None]:
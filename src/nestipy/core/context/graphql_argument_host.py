@@ -8,6 +8,8 @@ if TYPE_CHECKING:
 
 
 class GraphqlArgumentHost(ArgumentHost):
+    __slots__ = ()
+
     def get_request(self) -> Request:
         return cast(Request, self._req)
 
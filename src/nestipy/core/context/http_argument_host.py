@@ -4,6 +4,8 @@ from .argument_host import ArgumentHost
 
 
 class HttpArgumentHost(ArgumentHost):
+    __slots__ = ()
+
     def get_request(self) -> Request:
         return typing.cast(Request, self._req)
 
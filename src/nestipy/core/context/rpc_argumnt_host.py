@@ -7,6 +7,8 @@ from .argument_host import ArgumentHost
 
 
 class RpcArgumentHost(ArgumentHost):
+    __slots__ = ()
+
     def get_args(self):
         return self.get_request(), self.get_data()
 
@@ -5,6 +5,8 @@ from .argument_host import ArgumentHost
 
 
 class WebsocketArgumentHost(ArgumentHost):
+    __slots__ = ()
+
     def get_request(self) -> Request:
         return typing.cast(Request, self._req)
 
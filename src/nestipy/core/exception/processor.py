@@ -10,8 +10,8 @@ from nestipy.common.utils import uniq_list
 from nestipy.core.constant import APP_FILTER
 from nestipy.core.context.argument_host import ArgumentHost
 from nestipy.core.types import HandlerReturn
-from nestipy.ioc import NestipyContainer
-from nestipy.metadata import Reflect, ClassMetadata
+from nestipy.ioc import EnhancerScopeRegistry, NestipyContainer
+from nestipy.metadata import Reflect
 
 
 @Injectable()
@@ -22,6 +22,7 @@ class ExceptionFilterHandler(SpecialProviderExtractor):
         self,
     ):
         self.container = NestipyContainer.get_instance()
+        self.scopes = EnhancerScopeRegistry.get_instance()
 
     async def catch(
         self, exception: HttpException, context: ArgumentHost, is_http: bool = True
@@ -44,16 +45,6 @@ class ExceptionFilterHandler(SpecialProviderExtractor):
         all_filters = uniq_list(
             handler_filters + class_filters + module_filters + global_filters
         )
-        # setup dependency as the same as the container
-        for fit in all_filters:
-            if issubclass(fit, ExceptionFilter):
-                # Put dependency
-                services = self.container.get_all_services()
-                Reflect.set_metadata(
-                    fit,
-                    ClassMetadata.Metadata,
-                    ClassMetadata(handler_class, global_providers=services),
-                )
         return await self._apply_exception_filter(exception, 0, all_filters, None)
 
     async def _apply_exception_filter(
@@ -111,7 +102,7 @@ class ExceptionFilterHandler(SpecialProviderExtractor):
         exception: "HttpException",
     ):
         instance = (
-            await self.container.get(exception_filter)
+            await self.scopes.get(exception_filter, self.context.get_class())
             if not isinstance(exception_filter, ExceptionFilter)
             else exception_filter
         )
@@ -8,48 +8,59 @@ from nestipy.common.guards.meta import GuardKey
 from nestipy.common.helpers import SpecialProviderExtractor
 from nestipy.core.constant import APP_GUARD
 from nestipy.core.context.execution_context import ExecutionContext
-from nestipy.ioc import NestipyContainer
-from nestipy.metadata import ClassMetadata, Reflect
+from nestipy.core.types import HandlerFn, HttpAdapterLike
+from nestipy.ioc import EnhancerScopeRegistry, NestipyContainer
+from nestipy.metadata import Reflect
 
 
 @Injectable()
 class GuardProcessor(SpecialProviderExtractor):
     def __init__(self):
         self.container = NestipyContainer.get_instance()
+        self.scopes = EnhancerScopeRegistry.get_instance()
+
+    @classmethod
+    def collect(
+        cls,
+        adapter: HttpAdapterLike | None,
+        module: type | None,
+        class_handler: type | None,
+        handler: HandlerFn | None,
+    ) -> list[Type[CanActivate]]:
+        """
+        Collect guard classes in execution order: global -> module -> class -> handler.
+        """
+        global_guards = adapter.get_global_guards() if adapter is not None else []
+        module_guards = cls.extract_special_providers(
+            typing.cast(Type, module), CanActivate, APP_GUARD
+        )
+        class_guards = Reflect.get_metadata(class_handler, GuardKey.Meta, [])
+        handler_guards = Reflect.get_metadata(handler, GuardKey.Meta, [])
+        return [
+            g
+            for g in global_guards + module_guards + class_guards + handler_guards
+            if inspect.isclass(g) and issubclass(g, CanActivate)
+        ]
 
     async def process(
         self, context: ExecutionContext, is_http: bool = True
     ) -> tuple[bool, Type | None]:
-        handler_module_class = context.get_module()
         handler_class = context.get_class()
-        handler = context.get_handler()
-        global_guards = []
-        if is_http:
-            adapter = context.get_adapter()
-            global_guards = adapter.get_global_guards() if adapter is not None else []
-        module_guards = self.extract_special_providers(
-            typing.cast(Type, handler_module_class), CanActivate, APP_GUARD
+        guards = self.collect(
+            context.get_adapter() if is_http else None,
+            context.get_module(),
+            handler_class,
+            context.get_handler(),
         )
-        handler_class_guards = Reflect.get_metadata(handler_class, GuardKey.Meta, [])
-        handler_guards = Reflect.get_metadata(handler, GuardKey.Meta, [])
-
-        for g in global_guards + module_guards + handler_class_guards + handler_guards:
-            if inspect.isclass(g) and issubclass(g, CanActivate):
-                services = self.container.get_all_services()
-                # Put dependency
-                Reflect.set_metadata(
-                    g,
-                    ClassMetadata.Metadata,
-                    ClassMetadata(handler_class, global_providers=services),
-                )
-                #  load instance from container
-                instance: CanActivate = await self.container.get(g)
-                callback = instance.can_activate
-                # check if can_activate is coroutine
-                if inspect.iscoroutinefunction(callback):
-                    can_activate: bool = await callback(context)
-                else:
-                    can_activate: bool = callback(context)
-                if not can_activate:
-                    return False, g
+        for g in guards:
+            #  load instance scoped to the handler class
+            instance: CanActivate = await self.scopes.get(g, handler_class)
+            callback = instance.can_activate
+            # check if can_activate is coroutine
+            if inspect.iscoroutinefunction(callback):
+                can_activate: bool = await callback(context)
+            else:
+                can_activate: bool = callback(context)
+            if not can_activate:
+                return False, g
         return True, None
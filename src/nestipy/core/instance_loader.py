@@ -1,3 +1,4 @@
+import asyncio
 import enum
 import inspect
 import time
@@ -10,6 +11,12 @@ from nestipy.dynamic_module.module.interface import NestipyModule
 from nestipy.ioc import NestipyContainer, ModuleProviderDict
 from nestipy.metadata import ModuleMetadata, Reflect
 from nestipy.core.providers.discover import DiscoverService
+from nestipy.core.bootstrap_scheduler import (
+    BootstrapNode,
+    BootstrapScheduler,
+    module_levels,
+    walk_modules,
+)
 from nestipy.core.types import ControllerInstance, ModuleInstance, ModuleRef, ProviderInstance
 from nestipy.common.constant import (
     NESTIPY_SCOPE_ATTR,
@@ -53,6 +60,9 @@ class InstanceLoader:
     _profile_controller_ms: float = 0.0
     _profile_module_ms: float = 0.0
     _profile_modules: list[dict] = []
+    _profile_critical_path: list[dict] = []
+    _profile_levels: int = 0
+    _parallel: bool = False
 
     def __init__(self) -> None:
         self._is_controller = False
@@ -67,10 +77,21 @@ class InstanceLoader:
         self._profile_controller_ms = 0.0
         self._profile_module_ms = 0.0
         self._profile_modules = []
+        self._profile_critical_path = []
+        self._profile_levels = 0
+        self._parallel = False
 
     def enable_profile(self, enabled: bool) -> None:
         self._profile_enabled = enabled
 
+    def enable_parallel(self, enabled: bool) -> None:
+        """
+        Instantiate independent providers and controllers concurrently instead of
+        one module at a time.
+        :param enabled: Use the parallel bootstrap.
+        """
+        self._parallel = enabled
+
     def reset_profile(self) -> None:
         self._profile_provider_count = 0
         self._profile_controller_count = 0
@@ -79,6 +100,8 @@ class InstanceLoader:
         self._profile_controller_ms = 0.0
         self._profile_module_ms = 0.0
         self._profile_modules = []
+        self._profile_critical_path = []
+        self._profile_levels = 0
 
     def get_profile_summary(self) -> dict:
         return {
@@ -89,21 +112,21 @@ class InstanceLoader:
             "controllers_ms": self._profile_controller_ms,
             "modules_ms": self._profile_module_ms,
             "module_breakdown": list(self._profile_modules),
+            "levels": self._profile_levels,
+            "critical_path": list(self._profile_critical_path),
+            "critical_path_ms": sum(n["ms"] for n in self._profile_critical_path),
         }
 
     async def create_instances(
         self, modules: list[ModuleRef]
     ) -> typing.Optional[GraphqlModule]:
-        from nestipy.common import (
-            NestipyInterceptor,
-            CanActivate,
-            NestipyMiddleware,
-            ExceptionFilter,
-        )
-
         self.discover: DiscoverService = await NestipyContainer.get_instance().get(
             DiscoverService
         )
+        if self._parallel:
+            await self._create_instances_parallel(modules)
+            await self._create_enhancers()
+            return self.graphql_instance
         for module in modules:
             if isinstance(module, DynamicModule):
                 module = module.module
@@ -141,6 +164,17 @@ class InstanceLoader:
                         "controllers": len(controllers),
                     }
                 )
+        await self._create_enhancers()
+        return self.graphql_instance
+
+    async def _create_enhancers(self) -> None:
+        from nestipy.common import (
+            NestipyInterceptor,
+            CanActivate,
+            NestipyMiddleware,
+            ExceptionFilter,
+        )
+
         # Create  NestipyInterceptor, CanActivate, NestipyMiddleware,ExceptionFilter without scope
         container = NestipyContainer.get_instance()
         all_services = container.get_all_services()
@@ -153,22 +187,117 @@ class InstanceLoader:
             )
         ]:
             await self.create_instance(service, with_scope=False)
-        return self.graphql_instance
+
+    async def _create_instances_parallel(self, modules: list[ModuleRef]) -> None:
+        """
+        Bootstrap the module graph with a BootstrapScheduler.
+        - Providers (factory providers included) and controllers of all modules
+          are created level by level, concurrently within a level, each after
+          the services it injects.
+        - Module instances are then created in the order of the serial loader,
+          which keeps the order of the middleware they configure.
+        - on_module_init hooks run once the modules a module imports are
+          initialized, modules of a same level concurrently.
+        """
+        container = NestipyContainer.get_instance()
+        order, imports = walk_modules(modules)
+        order = [m for m in order if m not in self._module_instances]
+        scheduler = BootstrapScheduler(self._create_node)
+        module_providers: dict[Type, list] = {}
+        module_controllers: dict[Type, list] = {}
+        for module in order:
+            if module not in container.get_all_services():
+                container.add_singleton(module)
+            providers = []
+            for provider in Reflect.get_metadata(module, ModuleMetadata.Providers, []):
+                if isinstance(provider, ModuleProviderDict):
+                    try:
+                        scheduler.add(provider.token, "factory", provider)
+                    except TypeError:
+                        # unhashable token, resolved on injection
+                        pass
+                    continue
+                self._register_provider(provider)
+                scheduler.add(provider, "provider", provider)
+                providers.append(provider)
+            controllers = []
+            for controller in Reflect.get_metadata(module, ModuleMetadata.Controllers, []):
+                if controller not in container.get_all_services():
+                    container.add_singleton(controller)
+                scheduler.add(controller, "controller", controller)
+                controllers.append(controller)
+            module_providers[module] = providers
+            module_controllers[module] = controllers
+        await scheduler.run()
+        if self._profile_enabled:
+            for node in scheduler.nodes.values():
+                if node.kind == "provider":
+                    self._profile_provider_count += 1
+                    self._profile_provider_ms += node.ms
+                elif node.kind == "controller":
+                    self._profile_controller_count += 1
+                    self._profile_controller_ms += node.ms
+
+        instances: dict[Type, tuple[list, list, ModuleInstance]] = {}
+        for module in order:
+            start = time.perf_counter() if self._profile_enabled else None
+            instance = await self.create_instance(module)
+            providers = [scheduler.nodes[p].instance for p in module_providers[module]]
+            controllers = [
+                scheduler.nodes[c].instance for c in module_controllers[module]
+            ]
+            self.discover.add_provider(*providers)
+            self.discover.add_controller(*controllers)
+            self._module_instances.append(module)
+            self.discover.add_module(instance)
+            if isinstance(instance, GraphqlModule):
+                self.graphql_instance = instance
+            instances[module] = (providers, controllers, instance)
+            if self._profile_enabled and start is not None:
+                ms = (time.perf_counter() - start) * 1000 + sum(
+                    scheduler.nodes[k].ms
+                    for k in (*module_providers[module], *module_controllers[module])
+                )
+                self._profile_module_count += 1
+                self._profile_module_ms += ms
+                self._profile_modules.append(
+                    {
+                        "module": getattr(module, "__name__", str(module)),
+                        "ms": ms,
+                        "providers": len(providers),
+                        "controllers": len(controllers),
+                    }
+                )
+
+        for level in module_levels(order, imports):
+            await asyncio.gather(
+                *(
+                    self._call_on_module_init(
+                        providers=instances[m][0],
+                        controllers=instances[m][1],
+                        module_instance=instances[m][2],
+                    )
+                    for m in level
+                )
+            )
+        if self._profile_enabled:
+            self._profile_levels = len(scheduler.levels)
+            self._profile_critical_path = [
+                {"name": node.name, "kind": node.kind, "ms": node.ms}
+                for node in scheduler.critical_path()
+            ]
+
+    async def _create_node(self, node: BootstrapNode) -> object:
+        if node.kind == "factory":
+            return await NestipyContainer.get_instance().get(node.key)
+        return await self.create_instance(node.key)
 
     async def _create_providers(self, module: Type) -> list[ProviderInstance]:
         provider_instance: list[ProviderInstance] = []
-        container = NestipyContainer.get_instance()
         for provider in Reflect.get_metadata(module, ModuleMetadata.Providers, []):
             if isinstance(provider, ModuleProviderDict):
                 continue
-            if provider not in container.get_all_services():
-                scope = getattr(provider, NESTIPY_SCOPE_ATTR, SCOPE_SINGLETON)
-                if scope == SCOPE_TRANSIENT:
-                    container.add_transient(provider)
-                elif scope == SCOPE_REQUEST:
-                    container.add_request_scoped(provider)
-                else:
-                    container.add_singleton(provider)
+            self._register_provider(provider)
             start = time.perf_counter() if self._profile_enabled else None
             ins = await self.create_instance(provider)
             if self._profile_enabled and start is not None:
@@ -177,6 +306,18 @@ class InstanceLoader:
             provider_instance.append(ins)
         return provider_instance
 
+    @staticmethod
+    def _register_provider(provider: Type) -> None:
+        container = NestipyContainer.get_instance()
+        if provider not in container.get_all_services():
+            scope = getattr(provider, NESTIPY_SCOPE_ATTR, SCOPE_SINGLETON)
+            if scope == SCOPE_TRANSIENT:
+                container.add_transient(provider)
+            elif scope == SCOPE_REQUEST:
+                container.add_request_scoped(provider)
+            else:
+                container.add_singleton(provider)
+
     async def _create_controllers(self, module: Type) -> list[ControllerInstance]:
         controller_instance: list[ControllerInstance] = []
         container = NestipyContainer.get_instance()
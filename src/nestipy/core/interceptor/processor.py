@@ -6,8 +6,9 @@ from nestipy.common.helpers import SpecialProviderExtractor
 from nestipy.common.interceptor import NestipyInterceptor, InterceptorKey
 from nestipy.core.constant import APP_INTERCEPTOR
 from nestipy.core.context.execution_context import ExecutionContext
-from nestipy.ioc import NestipyContainer
-from nestipy.metadata import ClassMetadata, Reflect
+from nestipy.core.types import HandlerFn, HttpAdapterLike
+from nestipy.ioc import EnhancerScopeRegistry, NestipyContainer
+from nestipy.metadata import Reflect
 
 if TYPE_CHECKING:
     from nestipy.types_.handler import NextFn
@@ -19,48 +20,48 @@ class RequestInterceptor(NestipyInterceptor, SpecialProviderExtractor):
 
     def __init__(self):
         self.container = NestipyContainer.get_instance()
+        self.scopes = EnhancerScopeRegistry.get_instance()
 
-    async def intercept(
-        self, context: ExecutionContext, next_fn: "NextFn", is_http: bool = True
-    ):
-        self.context = context
-        handler_module_class = context.get_module()
-        handler_class = context.get_class()
-        handler = context.get_handler()
-
-        if is_http:
-            adapter = context.get_adapter()
-            global_interceptors = (
-                adapter.get_global_interceptors() if adapter is not None else []
-            )
-        else:
-            global_interceptors = []
-        module_interceptors = self.extract_special_providers(
-            typing.cast(typing.Type, handler_module_class),
+    @classmethod
+    def collect(
+        cls,
+        adapter: HttpAdapterLike | None,
+        module: type | None,
+        class_handler: type | None,
+        handler: HandlerFn | None,
+    ) -> list[typing.Type[NestipyInterceptor]]:
+        """
+        Collect interceptors from the innermost (handler) to the outermost (global).
+        """
+        global_interceptors = (
+            adapter.get_global_interceptors() if adapter is not None else []
+        )
+        module_interceptors = cls.extract_special_providers(
+            typing.cast(typing.Type, module),
             NestipyInterceptor,
             APP_INTERCEPTOR,
         )
         class_interceptors = Reflect.get_metadata(
-            handler_class, InterceptorKey.Meta, []
+            class_handler, InterceptorKey.Meta, []
         )
         handler_interceptors = Reflect.get_metadata(handler, InterceptorKey.Meta, [])
-        all_interceptors = (
+        return (
             handler_interceptors
             + class_interceptors
             + module_interceptors
             + global_interceptors
         )
-        # setup dependency as the same as the container
-        for intercept in all_interceptors:
-            if issubclass(intercept, NestipyInterceptor):
-                # Put dependency
-                services = self.container.get_all_services()
-                Reflect.set_metadata(
-                    intercept,
-                    ClassMetadata.Metadata,
-                    ClassMetadata(handler_class, global_providers=services),
-                )
 
+    async def intercept(
+        self, context: ExecutionContext, next_fn: "NextFn", is_http: bool = True
+    ):
+        self.context = context
+        all_interceptors = self.collect(
+            context.get_adapter() if is_http else None,
+            context.get_module(),
+            context.get_class(),
+            context.get_handler(),
+        )
         return await self._recursive_apply_interceptor(0, all_interceptors, next_fn)
 
     async def _recursive_apply_interceptor(
@@ -68,7 +69,9 @@ class RequestInterceptor(NestipyInterceptor, SpecialProviderExtractor):
     ):
         if len(all_interceptors) > index:
             interceptor = all_interceptors[index]
-            instance: NestipyInterceptor = await self.container.get(interceptor)
+            instance: NestipyInterceptor = await self.scopes.get(
+                interceptor, self.context.get_class()
+            )
 
             async def _next_fn():
                 return await instance.intercept(self.context, next_fn)
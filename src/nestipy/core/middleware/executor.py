@@ -1,6 +1,6 @@
 import inspect
 import traceback
-from typing import Callable
+from typing import Callable, Optional
 
 from nestipy.common.http_ import Request, Response
 from nestipy.common.logger import logger
@@ -17,17 +17,43 @@ class MiddlewareExecutor:
     Handles matching routes, excluding paths, and recursive execution of middleware functions.
     """
 
-    def __init__(self, req: Request, res: Response, next_fn: Callable):
+    def __init__(
+        self,
+        req: Request,
+        res: Response,
+        next_fn: Callable,
+        middlewares: Optional[list[_MiddlewareEntry]] = None,
+    ):
         """
         Initialize the MiddlewareExecutor.
         :param req: The current Request object.
         :param res: The current Response object.
         :param next_fn: The next function to call after the middleware chain (usually the route handler).
+        :param middlewares: Middleware already matched for this request (see match()).
         """
         self.container = MiddlewareContainer.get_instance()
         self._req = req
         self._res = res
         self._next_fn = next_fn
+        self._middlewares = middlewares
+
+    @classmethod
+    def match(cls, req: Request, route: Optional[str] = None) -> list[_MiddlewareEntry]:
+        """
+        Middleware that applies to a request.
+        When the registered route template is known the match is computed once per
+        (method, template); wildcard routes, mounted apps and patterns that depend on
+        path param values use the per-path LRU of MiddlewareContainer.match().
+        :param req: The current Request object.
+        :param route: The route template the request was dispatched to.
+        :return: The matching middleware entries.
+        """
+        container = MiddlewareContainer.get_instance()
+        if route is not None and not req.scope.get("root_path"):
+            matched = container.match_route(route, req.method)
+            if matched is not None:
+                return matched
+        return container.match(req.path, req.method)
 
     async def execute(self) -> HandlerReturn:
         """
@@ -35,7 +61,9 @@ class MiddlewareExecutor:
         If no middleware matches, it immediately calls the next_fn.
         :return: The result of the middleware chain execution.
         """
-        middleware_to_apply = self.container.match(self._req.path, self._req.method)
+        middleware_to_apply = self._middlewares
+        if middleware_to_apply is None:
+            middleware_to_apply = self.container.match(self._req.path, self._req.method)
         if len(middleware_to_apply) == 0:
             # if no middleware call next_fn that call handler
             return await self._next_fn()
@@ -43,18 +71,25 @@ class MiddlewareExecutor:
 
     async def _create_middleware_callable(self, entry: _MiddlewareEntry):
         middleware = entry.middleware
+        bound = self.container.get_bound_callable(middleware)
+        if bound is not None:
+            return bound
         if inspect.isclass(middleware) and issubclass(
             middleware, NestipyMiddleware
         ):
             try:
                 #  get instance of Middleware
+                container = NestipyContainer.get_instance()
                 try:
-                    instance = await NestipyContainer.get_instance().get(middleware)
+                    instance = await container.get(middleware)
                 except ValueError:
                     # Allow class-based middleware without explicit DI registration
                     instance = middleware()
                 # get use method if it is a middleware class
-                return getattr(instance, "use")
+                use = getattr(instance, "use")
+                if container.is_singleton(middleware):
+                    self.container.bind_callable(middleware, use)
+                return use
             except Exception as e:
                 tb = traceback.format_exc()
                 logger.error(e)
@@ -62,6 +97,7 @@ class MiddlewareExecutor:
                 raise e
                 return None
         elif inspect.isfunction(middleware):
+            self.container.bind_callable(middleware, middleware)
             return middleware
         else:
             raise Exception(
@@ -23,10 +23,12 @@ from typing import (
 
 from rich.traceback import install
 
+from nestipy.common.exception.traceback_capture import TracebackSampler
 from nestipy.common.logger import logger, console
 from nestipy.common.middleware import NestipyMiddleware
 from nestipy.common.template import TemplateEngine
 from nestipy.core.providers.background import BackgroundTasks
+from nestipy.core.cache import CacheStore, ResponseCache
 from nestipy.graphql.graphql_adapter import GraphqlAdapter
 from nestipy.graphql.strawberry.strawberry_adapter import StrawberryAdapter
 from nestipy.ioc import (
@@ -169,6 +171,7 @@ class NestipyConfig:
     cors: Optional[Union[bool, CorsOptions, dict]] = None
     debug: bool = True
     profile: bool = False
+    parallel_bootstrap: bool = False
     dependency_graph_debug: bool = False
     dependency_graph_limit: int = 200
     dependency_graph_json_path: Optional[str] = None
@@ -196,6 +199,12 @@ class NestipyConfig:
     router_detect_conflicts: bool = True
     security_headers: bool = True
     health_enabled: bool = True
+    # resolve request-scoped properties of singletons on first read instead of
+    # preloading them; those whose construction may await I/O (async factory,
+    # request body) are still preloaded for every request
+    lazy_request_scope: bool = False
+    response_cache: Optional[CacheStore] = None
+    error_traceback_sample_rate: Optional[float] = None
 
 
 class NestipyApplication:
@@ -318,7 +327,12 @@ class NestipyApplication:
         self._dependency_graph_debug = config.dependency_graph_debug
         self._dependency_graph_limit = config.dependency_graph_limit
         self._dependency_graph_json_path = config.dependency_graph_json_path
+        NestipyContainer.set_lazy_request_scope(config.lazy_request_scope)
+        ResponseCache.get_instance().set_store(config.response_cache)
+        if config.error_traceback_sample_rate is not None:
+            TracebackSampler.set_rate(config.error_traceback_sample_rate)
         self.instance_loader.enable_profile(self._profile or self._log_bootstrap)
+        self.instance_loader.enable_parallel(config.parallel_bootstrap)
         web_static = WebStaticHandler(
             self._http_adapter, on_ssr_renderer=self._set_web_ssr_renderer
         )
@@ -346,6 +360,7 @@ class NestipyApplication:
         self.on_startup(self._helpers.lifecycle.startup)
         self.on_shutdown(self._helpers.lifecycle.shutdown)
         self.on_shutdown(self._shutdown_adapters)
+        self.on_shutdown(self._close_web_ssr_renderer)
 
     # ------------------------------------------------------------------
     # Lifecycle Hooks
@@ -630,6 +645,15 @@ class NestipyApplication:
                 m["providers"],
                 m["controllers"],
             )
+        if profile["critical_path"]:
+            logger.info(
+                "[BOOTSTRAP] Levels=%s CriticalPath=%.2fms %s",
+                profile["levels"],
+                profile["critical_path_ms"],
+                " -> ".join(
+                    f"{n['name']}({n['ms']:.2f}ms)" for n in profile["critical_path"]
+                ),
+            )
         total_elapsed = (time.perf_counter() - setup_start) * 1000
         logger.info("[BOOTSTRAP] Total=%.2fms", total_elapsed)
 
@@ -674,6 +698,14 @@ class NestipyApplication:
     def _set_web_ssr_renderer(self, renderer: Optional[SSRRenderer]) -> None:
         self._web_ssr_renderer = renderer
 
+    async def _close_web_ssr_renderer(self) -> None:
+        try:
+            await self._helpers.web_static.close()
+            if self._web_ssr_renderer is not None:
+                await self._web_ssr_renderer.close()
+        except Exception as exc:
+            logger.error("Error while closing the SSR renderer: %s", exc)
+
     # ------------------------------------------------------------------
     # Adapter Accessors
     # ------------------------------------------------------------------
@@ -0,0 +1,237 @@
+import re
+import uuid
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+_PARAM = re.compile(r"{(\w+)(?::(\w+))?}")
+
+
+def _convert_str(value: str) -> str:
+    if not value:
+        raise ValueError("empty path segment")
+    return value
+
+
+def _convert_int(value: str) -> int:
+    if not value.isdigit():
+        raise ValueError(f"{value!r} is not an integer")
+    return int(value)
+
+
+def _convert_float(value: str) -> float:
+    if not value or value.lower() in ("nan", "inf", "-inf", "infinity"):
+        raise ValueError(f"{value!r} is not a number")
+    return float(value)
+
+
+class Converters:
+    """
+    Path parameter converters, keyed by the type written in route templates
+    (``{id:int}``). A converter raises ValueError when the segment does not match,
+    and the router then tries the next candidate route.
+    """
+
+    _converters: dict[str, Callable[[str], Any]] = {
+        "str": _convert_str,
+        "int": _convert_int,
+        "float": _convert_float,
+        "uuid": uuid.UUID,
+    }
+
+    @classmethod
+    def register(cls, name: str, converter: Callable[[str], Any]) -> None:
+        cls._converters[name] = converter
+
+    @classmethod
+    def get(cls, name: str) -> Callable[[str], Any]:
+        if name not in cls._converters:
+            raise ValueError(f"Unknown path parameter type: {name}")
+        return cls._converters[name]
+
+
+class _Node(Generic[T]):
+    __slots__ = ("static", "params", "patterns", "catch_all", "handlers")
+
+    def __init__(self):
+        self.static: dict[str, "_Node[T]"] = {}
+        # {name:type} segments
+        self.params: list[tuple[str, Callable[[str], Any], "_Node[T]"]] = []
+        # segments mixing text and parameters, like {name}.json
+        self.patterns: list[
+            tuple[re.Pattern, list[tuple[str, Callable[[str], Any]]], "_Node[T]"]
+        ] = []
+        # {name:path}, matches the rest of the path
+        self.catch_all: Optional[tuple[str, dict[str, T]]] = None
+        self.handlers: dict[str, T] = {}
+
+
+class RouteMatch(Generic[T]):
+    __slots__ = ("handler", "params", "catch_all")
+
+    def __init__(self, handler: T, params: dict[str, Any], catch_all: bool = False):
+        self.handler = handler
+        self.params = params
+        self.catch_all = catch_all
+
+
+class RadixRouter(Generic[T]):
+    """
+    Router built as a tree of path segments. Static segments are looked up in a
+    dict, then parameter segments are tried with their converters, then catch-all
+    ``{name:path}`` routes; a failed branch backtracks to the next candidate.
+    Routes without parameters are also kept in a flat table answered in one lookup.
+    """
+
+    ANY = "*"
+
+    def __init__(self):
+        self._root: _Node[T] = _Node()
+        self._static: dict[str, dict[str, T]] = {}
+
+    @staticmethod
+    def _split(path: str) -> list[str]:
+        return path[1:].split("/") if path.startswith("/") else path.split("/")
+
+    def add(self, method: str, template: str, handler: T) -> None:
+        """
+        Register a handler.
+        :param method: HTTP method, or RadixRouter.ANY for every method.
+        :param template: Route template, like /users/{id:int} or /files/{rest:path}.
+        :param handler: Value returned by match().
+        """
+        template = template or "/"
+        method = method.upper()
+        if not _PARAM.search(template):
+            self._static.setdefault(template, {})[method] = handler
+            return
+        node = self._root
+        segments = self._split(template)
+        for index, segment in enumerate(segments):
+            full = _PARAM.fullmatch(segment)
+            if full and full.group(2) == "path":
+                if index != len(segments) - 1:
+                    raise ValueError(f"{{{full.group(1)}:path}} must end {template}")
+                if node.catch_all is None:
+                    node.catch_all = (full.group(1), {})
+                node.catch_all[1][method] = handler
+                return
+            if full:
+                node = self._param_child(node, full.group(1), full.group(2) or "str")
+            elif "{" in segment:
+                node = self._pattern_child(node, segment)
+            else:
+                node = node.static.setdefault(segment, _Node())
+        node.handlers[method] = handler
+
+    @staticmethod
+    def _param_child(node: _Node[T], name: str, type_: str) -> _Node[T]:
+        converter = Converters.get(type_)
+        for param_name, param_converter, child in node.params:
+            if param_name == name and param_converter is converter:
+                return child
+        child = _Node()
+        node.params.append((name, converter, child))
+        # try the most specific converters first, plain str last
+        node.params.sort(key=lambda p: p[1] is _convert_str)
+        return child
+
+    @staticmethod
+    def _pattern_child(node: _Node[T], segment: str) -> _Node[T]:
+        regex = ""
+        names: list[tuple[str, Callable[[str], Any]]] = []
+        position = 0
+        for match in _PARAM.finditer(segment):
+            regex += re.escape(segment[position : match.start()]) + "([^/]+?)"
+            names.append((match.group(1), Converters.get(match.group(2) or "str")))
+            position = match.end()
+        pattern = re.compile(regex + re.escape(segment[position:]))
+        for existing, _names, child in node.patterns:
+            if existing.pattern == pattern.pattern:
+                return child
+        child = _Node()
+        node.patterns.append((pattern, names, child))
+        return child
+
+    def match(self, method: str, path: str) -> Optional[RouteMatch[T]]:
+        """
+        Find the handler of a request.
+        :param method: HTTP method of the request.
+        :param path: Request path, without root path.
+        :return: The handler and its converted path parameters, or None.
+        """
+        path = path or "/"
+        handlers = self._static.get(path)
+        if handlers is not None:
+            handler = self._for_method(handlers, method)
+            if handler is not None:
+                return RouteMatch(handler, {})
+        params: dict[str, Any] = {}
+        found = self._match(self._root, self._split(path), 0, method, params)
+        if found is None:
+            return None
+        handler, catch_all = found
+        return RouteMatch(handler, params, catch_all)
+
+    def _match(
+        self,
+        node: _Node[T],
+        segments: list[str],
+        index: int,
+        method: str,
+        params: dict[str, Any],
+    ) -> Optional[tuple[T, bool]]:
+        if index == len(segments):
+            handler = self._for_method(node.handlers, method)
+            if handler is not None:
+                return handler, False
+        else:
+            segment = segments[index]
+            child = node.static.get(segment)
+            if child is not None:
+                found = self._match(child, segments, index + 1, method, params)
+                if found is not None:
+                    return found
+            for name, converter, child in node.params:
+                try:
+                    value = converter(segment)
+                except ValueError:
+                    continue
+                found = self._match(child, segments, index + 1, method, params)
+                if found is not None:
+                    params[name] = value
+                    return found
+            for pattern, names, child in node.patterns:
+                matched = pattern.fullmatch(segment)
+                if matched is None:
+                    continue
+                try:
+                    values = [
+                        converter(value)
+                        for (_name, converter), value in zip(names, matched.groups())
+                    ]
+                except ValueError:
+                    continue
+                found = self._match(child, segments, index + 1, method, params)
+                if found is not None:
+                    for (name, _converter), value in zip(names, values):
+                        params[name] = value
+                    return found
+        if node.catch_all is not None:
+            name, handlers = node.catch_all
+            handler = self._for_method(handlers, method)
+            if handler is not None:
+                params[name] = "/".join(segments[index:])
+                return handler, True
+        return None
+
+    def _for_method(self, handlers: dict[str, T], method: str) -> Optional[T]:
+        handler = handlers.get(method)
+        if handler is None and method == "HEAD":
+            handler = handlers.get("GET")
+        if handler is None:
+            handler = handlers.get(self.ANY)
+        return handler
+
+
+__all__ = ["RadixRouter", "RouteMatch", "Converters"]
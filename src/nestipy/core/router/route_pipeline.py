@@ -0,0 +1,118 @@
+import dataclasses
+import inspect
+import typing
+from typing import Type
+
+from nestipy.common.guards.can_activate import CanActivate
+from nestipy.common.interceptor import NestipyInterceptor
+from nestipy.common.pipes import PipeTransform
+from nestipy.core.context.execution_context import ExecutionContext
+from nestipy.core.guards import GuardProcessor
+from nestipy.core.interceptor import RequestInterceptor
+from nestipy.core.pipes.processor import PipeProcessor
+from nestipy.core.types import HandlerFn, HttpAdapterLike
+from nestipy.ioc import EnhancerScopeRegistry, NestipyIContainer
+
+if typing.TYPE_CHECKING:
+    from nestipy.types_ import NextFn
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class RoutePipeline:
+    """
+    Guards, pipes and interceptors of a single route, collected once when the
+    route is registered instead of on every request.
+    """
+
+    class_handler: type | None = None
+    guards: tuple[Type[CanActivate], ...] = ()
+    pipes: tuple[Type | PipeTransform, ...] = ()
+    interceptors: tuple[Type[NestipyInterceptor], ...] = ()
+
+    @classmethod
+    def compile(
+        cls,
+        adapter: HttpAdapterLike | None,
+        module: type | None,
+        class_handler: type | None,
+        handler: HandlerFn | None,
+    ) -> "RoutePipeline":
+        """
+        Build the pipeline of a route and bind the DI scope of its enhancers.
+        :param adapter: The HTTP adapter holding global enhancers (None for non-HTTP).
+        :param module: The module owning the controller.
+        :param class_handler: The controller class.
+        :param handler: The route handler.
+        :return: A frozen RoutePipeline.
+        """
+        pipeline = cls(
+            class_handler=class_handler,
+            guards=tuple(
+                GuardProcessor.collect(adapter, module, class_handler, handler)
+            ),
+            pipes=tuple(PipeProcessor.collect(adapter, module, class_handler, handler)),
+            interceptors=tuple(
+                RequestInterceptor.collect(adapter, module, class_handler, handler)
+            ),
+        )
+        scopes = EnhancerScopeRegistry.get_instance()
+        for enhancer in (*pipeline.guards, *pipeline.pipes, *pipeline.interceptors):
+            scopes.bind(enhancer, class_handler)
+        return pipeline
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.guards or self.pipes or self.interceptors)
+
+    async def get_pipes(self, container: NestipyIContainer) -> list[Type | PipeTransform]:
+        """
+        Pipes to set on the execution context, singleton pipe classes being replaced
+        by their cached instances.
+        """
+        scopes = EnhancerScopeRegistry.get_instance()
+        pipes = []
+        for p in self.pipes:
+            if inspect.isclass(p) and container.is_singleton(p):
+                p = await scopes.get(p, self.class_handler)
+            pipes.append(p)
+        return pipes
+
+    async def can_activate(self, context: ExecutionContext) -> tuple[bool, Type | None]:
+        """
+        Run guards in order and stop at the first one that rejects the request.
+        :return: A tuple of (passed, rejecting_guard).
+        """
+        scopes = EnhancerScopeRegistry.get_instance()
+        for g in self.guards:
+            instance = typing.cast(CanActivate, await scopes.get(g, self.class_handler))
+            can_activate = instance.can_activate(context)
+            if inspect.isawaitable(can_activate):
+                can_activate = await can_activate
+            if not can_activate:
+                return False, g
+        return True, None
+
+    async def intercept(self, context: ExecutionContext, next_fn: "NextFn"):
+        """
+        Wrap next_fn with interceptors, the global ones being the outermost.
+        """
+        scopes = EnhancerScopeRegistry.get_instance()
+        call_next = next_fn
+        for interceptor in self.interceptors:
+            instance = typing.cast(
+                NestipyInterceptor, await scopes.get(interceptor, self.class_handler)
+            )
+            call_next = self._bind_interceptor(instance, context, call_next)
+        return await call_next()
+
+    @staticmethod
+    def _bind_interceptor(
+        instance: NestipyInterceptor, context: ExecutionContext, next_fn: "NextFn"
+    ) -> "NextFn":
+        async def _next_fn():
+            return await instance.intercept(context, next_fn)
+
+        return _next_fn
+
+
+__all__ = ["RoutePipeline"]
@@ -1,31 +1,41 @@
 import dataclasses
 import inspect
-import os
-import sys
 import traceback
 import typing
+import zlib
+from email.utils import parsedate_to_datetime
 
 from pydantic import BaseModel
 
 from nestipy.common.exception import HttpException
-from nestipy.common.exception.http import ExceptionDetail, RequestTrack, Traceback
+from nestipy.common.exception.http import ExceptionDetail
+from nestipy.common.exception.traceback_capture import (
+    TracebackCapture,
+    TracebackSampler,
+    code_context,
+)
+from nestipy.common.logger import logger
 from nestipy.common.exception.message import HttpStatusMessages
 from nestipy.common.exception.status import HttpStatus
 from nestipy.common.http_ import Request, Response
 from nestipy.common.utils import snakecase_to_camelcase
-from nestipy.common.cache import CachePolicy
+from nestipy.common.cache import CachePolicy, ETagValidator
+from nestipy.common.constant import NESTIPY_SCOPE_ATTR
 from nestipy.core.exception.processor import ExceptionFilterHandler
-from nestipy.core.guards import GuardProcessor
-from nestipy.core.interceptor import RequestInterceptor
-from nestipy.core.pipes.processor import PipeProcessor
+from nestipy.core.cache import ResponseCache
 from nestipy.core.middleware import MiddlewareExecutor
 from nestipy.core.template import TemplateRendererProcessor
 from nestipy.core.types import ModuleRef, JsonValue
 from nestipy.ioc import NestipyContainer, NestipyIContainer
-from nestipy.ioc import RequestContextContainer
+from nestipy.ioc import (
+    EnhancerScopeRegistry,
+    MiddlewareContainer,
+    RequestContextContainer,
+)
 from nestipy.openapi.openapi_docs.v3 import Operation, PathItem, Response as ApiResponse
 from nestipy.types_ import NextFn, CallableHandler
 from .route_explorer import RouteExplorer
+from .route_pipeline import RoutePipeline
 from ..context.execution_context import ExecutionContext
 
 if typing.TYPE_CHECKING:
@@ -113,6 +123,7 @@ class RouterProxy:
                         method_name,
                         cache_policy=cache_policy,
                         container=self.container,
+                        route_path=path,
                     )
                 for method in methods:
                     if detect_conflicts:
@@ -127,6 +138,8 @@ class RouterProxy:
                         seen_routes[key] = route
                     if register_routes and handler is not None:
                         getattr(self.router, method.lower())(path, handler, route)
+                        # match middleware once for the route template
+                        MiddlewareContainer.get_instance().match_route(path, method)
                     # OPEN API REGISTER
                     if build_openapi:
                         if path in json_paths:
@@ -160,20 +173,136 @@ class RouterProxy:
         ] = None,
         cache_policy: typing.Optional[CachePolicy] = None,
         container: typing.Optional[NestipyIContainer] = None,
+        route_path: typing.Optional[str] = None,
     ) -> CallableHandler:
         controller_method_handler = custom_callback or getattr(
             controller, typing.cast(str, method_name)
         )
         _template_processor = TemplateRendererProcessor(http_adapter)
         context_container = RequestContextContainer.get_instance()
+        middleware_container = MiddlewareContainer.get_instance()
         container = container or NestipyContainer.get_instance()
+        handler_module = custom_callback or module_ref
+        handler_class = custom_callback or controller
+        pipeline = RoutePipeline.compile(
+            http_adapter,
+            typing.cast(type, handler_module),
+            typing.cast(type, handler_class),
+            controller_method_handler,
+        )
+        response_cache = ResponseCache.get_instance()
+        cache_response = ResponseCache.is_cacheable(cache_policy)
+        etag_validator = cache_policy.etag_validator if cache_policy else None
+        resolve_etag = (
+            cls._compile_etag_validator(
+                etag_validator, typing.cast(type, handler_class)
+            )
+            if etag_validator is not None
+            else None
+        )
+        if custom_callback is None and isinstance(container, NestipyContainer):
+            try:
+                # work out the handler arguments at bootstrap, not on first request
+                container.compile_method(controller, typing.cast(str, method_name))
+            except Exception:
+                # reported when the route is called
+                pass
+
+        async def call_handler(req: "Request", res: "Response", next_fn: NextFn):
+            if custom_callback:
+                callback_res = custom_callback(req, res, next_fn)
+                if inspect.isawaitable(callback_res):
+                    return await callback_res
+                return callback_res
+            return await container.get(
+                typing.cast(type | str, controller),
+                typing.cast(str, method_name),
+            )
+
+        async def finalize(res: "Response", result) -> "Response":
+            # process template rendering
+            if _template_processor.can_process(controller_method_handler, result):
+                result = await res.html(_template_processor.render() or "")
+            # transform result to response
+            return await cls._ensure_response(res, result)
+
+        async def call_route(req: "Request", res: "Response", next_fn: NextFn):
+            if resolve_etag is not None:
+                etag = await resolve_etag(context_container.execution_context)
+                if etag is not None:
+                    res.header("ETag", etag)
+                    if req.method in ("GET", "HEAD") and cls._is_not_modified(
+                        req, etag, None
+                    ):
+                        # validator matched: skip the controller
+                        return await cls._not_modified(res)
+            if not cache_response or not response_cache.enabled:
+                return await call_handler(req, res, next_fn)
+
+            async def produce(target: "Response") -> "Response":
+                if target is not res:
+                    # background revalidation: @Res() must resolve to the new
+                    # response, this runs in a task with its own context copy
+                    current = context_container.execution_context
+                    revalidation_context = ExecutionContext(
+                        http_adapter,
+                        handler_module,
+                        handler_class,
+                        controller_method_handler,
+                        req,
+                        target,
+                    )
+                    if current is not None:
+                        revalidation_context.set_pipes(current.get_pipes())
+                    context_container.reset_request_cache()
+                    context_container.set_execution_context(revalidation_context)
+                    await container.preload_request_scoped_properties()
+                return await finalize(target, await call_handler(req, target, next_fn))
+
+            return await response_cache.serve(
+                req, res, typing.cast(CachePolicy, cache_policy), produce
+            )
+
+        async def call_pipeline(
+            execution_context: ExecutionContext,
+            req: "Request",
+            res: "Response",
+            next_fn: NextFn,
+        ):
+            passed = await pipeline.can_activate(execution_context)
+            if not passed[0]:
+                raise HttpException(
+                    HttpStatus.UNAUTHORIZED,
+                    HttpStatusMessages.UNAUTHORIZED,
+                    details=f"Not authorized from guard {passed[1]}",
+                )
+            execution_context.set_pipes(await pipeline.get_pipes(container))
+            if not pipeline.interceptors:
+                return await call_route(req, res, next_fn)
 
-        async def request_handler(req: "Request", res: "Response", next_fn: NextFn):
             interceptor_called = False
+
+            async def next_fn_interceptor(ex: Exception | None = None):
+                nonlocal interceptor_called
+                interceptor_called = True
+                if ex is not None:
+                    return await cls._ensure_response(res, await next_fn(ex))
+                return await call_route(req, res, next_fn)
+
+            resp = await pipeline.intercept(execution_context, next_fn_interceptor)
+            #  execute Interceptor by using middleware execution as next_handler
+            if not interceptor_called:
+                raise HttpException(
+                    HttpStatus.BAD_REQUEST,
+                    "Handler not called because of interceptor: Invalid Request",
+                )
+            return resp
+
+        async def request_handler(req: "Request", res: "Response", next_fn: NextFn):
             execution_context = ExecutionContext(
                 http_adapter,
-                custom_callback or module_ref,
-                custom_callback or controller,
+                handler_module,
+                handler_class,
                 controller_method_handler,
                 req,
                 res,
@@ -184,70 +313,34 @@ class RouterProxy:
             await container.preload_request_scoped_properties()
             handler_response: Response
             try:
+                middlewares = (
+                    MiddlewareExecutor.match(req, route_path)
+                    if middleware_container.all()
+                    else []
+                )
+                if pipeline.is_empty and not middlewares:
+                    # fast path: nothing to run around the handler
+                    result = await call_route(req, res, next_fn)
+                else:
 
-                async def next_fn_interceptor(ex: Exception | None = None):
-                    nonlocal interceptor_called
-                    interceptor_called = True
-                    if ex is not None:
-                        return await cls._ensure_response(res, await next_fn(ex))
-                    if custom_callback:
-                        callback_res = custom_callback(req, res, next_fn)
-                        if inspect.isawaitable(callback_res):
-                            return await callback_res
-                        else:
-                            return callback_res
-                    return await container.get(
-                        typing.cast(type | str, controller),
-                        typing.cast(str, method_name),
-                    )
+                    async def next_fn_middleware(ex: Exception | None = None):
+                        if ex is not None:
+                            raise ex
+                        if pipeline.is_empty:
+                            return await call_route(req, res, next_fn)
+                        return await call_pipeline(execution_context, req, res, next_fn)
 
-                async def next_fn_middleware(ex: Exception | None = None):
-                    if ex is not None:
-                        raise ex
-                    g_processor: GuardProcessor = typing.cast(
-                        GuardProcessor, await container.get(GuardProcessor)
-                    )
-                    passed = await g_processor.process(execution_context)
-                    if not passed[0]:
-                        raise HttpException(
-                            HttpStatus.UNAUTHORIZED,
-                            HttpStatusMessages.UNAUTHORIZED,
-                            details=f"Not authorized from guard {passed[1]}",
-                        )
-
-                    pipe_processor: PipeProcessor = typing.cast(
-                        PipeProcessor, await container.get(PipeProcessor)
-                    )
-                    pipes = await pipe_processor.get_pipes(execution_context)
-                    execution_context.set_pipes(pipes)
+                    # Call middleware before all
+                    result = await MiddlewareExecutor(
+                        req, res, next_fn_middleware, middlewares
+                    ).execute()
 
-                    interceptor: RequestInterceptor = typing.cast(
-                        RequestInterceptor, await container.get(RequestInterceptor)
-                    )
-                    resp = await interceptor.intercept(
-                        execution_context, next_fn_interceptor
-                    )
-                    #  execute Interceptor by using middleware execution as next_handler
-                    if not interceptor_called:
-                        raise HttpException(
-                            HttpStatus.BAD_REQUEST,
-                            "Handler not called because of interceptor: Invalid Request",
-                        )
-                    return resp
-
-                # Call middleware before all
-                result = await MiddlewareExecutor(
-                    req, res, next_fn_middleware
-                ).execute()
-
-                # process template rendering
-
-                if _template_processor.can_process(controller_method_handler, result):
-                    result = await res.html(_template_processor.render() or "")
-                # transform result to response
-                handler_response = await cls._ensure_response(res, result)
+                handler_response = await finalize(res, result)
                 if cache_policy is not None:
                     cls._apply_cache_policy(handler_response, cache_policy)
+                    handler_response = await cls._apply_conditional(
+                        req, handler_response, cache_policy
+                    )
 
             except Exception as e:
                 handler_response = await cls.handle_exception(
@@ -300,6 +393,136 @@ class RouterProxy:
         if policy.last_modified and not cls._response_has_header(res, "Last-Modified"):
             res.header("Last-Modified", policy.last_modified)
 
+    @staticmethod
+    def _response_header(res: "Response", name: str) -> typing.Optional[str]:
+        lower = name.lower()
+        for k, v in res.headers():
+            if k.lower() == lower:
+                return v
+        return None
+
+    @staticmethod
+    def _weak_etag(body: bytes) -> str:
+        # crc32 is a fast non-cryptographic hash, enough to tell representations apart
+        return f'W/"{len(body):x}-{zlib.crc32(body):08x}"'
+
+    @staticmethod
+    def _etag_matches(if_none_match: str, etag: str) -> bool:
+        if if_none_match.strip() == "*":
+            return True
+        target = etag.strip().removeprefix("W/")
+        return any(
+            tag.strip().removeprefix("W/") == target for tag in if_none_match.split(",")
+        )
+
+    @classmethod
+    def _is_not_modified(
+        cls,
+        req: "Request",
+        etag: typing.Optional[str],
+        last_modified: typing.Optional[str],
+    ) -> bool:
+        headers = req.headers
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            # If-Modified-Since is ignored when If-None-Match is present (RFC 9110)
+            return etag is not None and cls._etag_matches(if_none_match, etag)
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since and last_modified:
+            try:
+                return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+                    if_modified_since
+                )
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    @staticmethod
+    async def _not_modified(res: "Response") -> "Response":
+        res.status(304)
+        await res._write(b"")
+        return res
+
+    @classmethod
+    def _compile_etag_validator(
+        cls,
+        validator: typing.Type[ETagValidator],
+        class_handler: typing.Optional[type],
+    ) -> typing.Callable[
+        [typing.Optional[ExecutionContext]], typing.Awaitable[typing.Optional[str]]
+    ]:
+        """
+        Work out once how a route ETag validator is built and called.
+        A validator known by the container is resolved with the controller scope,
+        any other one is instantiated once here. version() may take the execution
+        context or nothing.
+        :param validator: The ETagValidator class.
+        :param class_handler: The controller class.
+        :return: Coroutine function giving the weak ETag of the current request.
+        """
+        registry = EnhancerScopeRegistry.get_instance()
+        container = NestipyContainer.get_instance()
+        shared: typing.Optional[ETagValidator] = None
+        if hasattr(validator, NESTIPY_SCOPE_ATTR) or validator in (
+            container.get_all_services()
+        ):
+            registry.bind(validator, class_handler)
+        else:
+            shared = validator()
+        parameters = list(inspect.signature(validator.version).parameters.values())
+        takes_context = any(
+            parameter.kind
+            in (
+                inspect.Parameter.POSITIONAL_ONLY,
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                inspect.Parameter.VAR_POSITIONAL,
+            )
+            for parameter in parameters[1:]
+        )
+
+        async def resolve_etag(
+            context: typing.Optional[ExecutionContext],
+        ) -> typing.Optional[str]:
+            instance = shared
+            if instance is None:
+                instance = await registry.get(validator, class_handler)
+            version = (
+                instance.version(context)
+                if takes_context
+                else typing.cast(typing.Any, instance).version()
+            )
+            if inspect.isawaitable(version):
+                version = await version
+            if version is None:
+                return None
+            return f'W/"{version}"'
+
+        return resolve_etag
+
+    @classmethod
+    async def _apply_conditional(
+        cls, req: "Request", res: "Response", policy: CachePolicy
+    ) -> "Response":
+        """
+        Answer conditional GET/HEAD requests with a body-less 304 when the response
+        validators (ETag, Last-Modified) match. With auto_etag, a weak ETag is computed
+        from the final body when the handler did not set one.
+        """
+        if (
+            req.method not in ("GET", "HEAD")
+            or res.status_code() != 200
+            or res.is_stream()
+        ):
+            return res
+        etag = cls._response_header(res, "ETag")
+        content = res.content()
+        if etag is None and policy.auto_etag and content is not None:
+            etag = cls._weak_etag(content)
+            res.header("ETag", etag)
+        if cls._is_not_modified(req, etag, cls._response_header(res, "Last-Modified")):
+            return await cls._not_modified(res)
+        return res
+
     @classmethod
     def get_center_elements(cls, lst: list, p: int, m: int):
         n = len(lst)
@@ -313,13 +536,7 @@ class RouterProxy:
 
     @classmethod
     def get_code_context(cls, filename, lineno, n):
-        try:
-            with open(filename, "r") as file:
-                lines = file.readlines()
-            elements, start_line = cls.get_center_elements(lines, lineno, n)
-            return "".join(elements), start_line
-        except Exception as e:
-            return f"Could not read file {filename}: {str(e)}", 1
+        return code_context(filename, lineno, n)
 
     @classmethod
     async def render_not_found(
@@ -358,12 +575,16 @@ class RouterProxy:
                     ex.message or HttpStatusMessages.INTERNAL_SERVER_ERROR,
                     details,
                 )
-        track_b = cls.get_full_traceback_details(
-            execution_context.get_request(),
-            ex.message,
-            os.getcwd(),
-        )
-        ex.track_back = track_b
+        req = execution_context.get_request()
+        # frames only, the code of each frame is read if an error page needs it
+        ex.track_back = TracebackCapture.capture(req, ex.message)
+        if ex.status_code >= 500 and TracebackSampler.should_log():
+            logger.error(
+                "[HTTP] %s %s failed\n%s",
+                req.method if req else "-",
+                req.path if req else "-",
+                traceback.format_exc(),
+            )
         container = container or NestipyContainer.get_instance()
         exception_handler = typing.cast(
             ExceptionFilterHandler, await container.get(ExceptionFilterHandler)
@@ -379,35 +600,5 @@ class RouterProxy:
     @classmethod
     def get_full_traceback_details(
         cls, req: typing.Optional[Request], exception: str, file_path: str
-    ):
-        exc_type, exc_value, exc_tb = sys.exc_info()
-        traceback_details = []
-
-        # Extracting traceback details
-        tb = exc_tb
-        while tb is not None:
-            filename: str = tb.tb_frame.f_code.co_filename
-            code, start = cls.get_code_context(
-                tb.tb_frame.f_code.co_filename, tb.tb_lineno, 9
-            )
-            frame_info = Traceback(
-                filename=f"{filename.replace(file_path, '').strip('/')}",
-                lineno=tb.tb_lineno,
-                name=tb.tb_frame.f_code.co_name,
-                code=code,
-                start_line_number=start,
-                is_package=not filename.startswith(file_path),
-            )
-            traceback_details.append(frame_info)
-            tb = tb.tb_next
-        traceback_details.reverse()
-        return ExceptionDetail(
-            exception=exception,
-            type=exc_type.__name__ if exc_type else "Unknown",
-            root=file_path,
-            traceback=traceback_details,
-            request=RequestTrack(method=req.method, host=req.path)
-            if req
-            else RequestTrack(method="GET", host="localhost"),
-            message=getattr(exc_value, "details", None) or str(exc_value),
-        )
+    ) -> ExceptionDetail:
+        return TracebackCapture.capture(req, exception, file_path).materialize()
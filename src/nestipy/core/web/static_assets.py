@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import gzip
+import mimetypes
+import os
+import zlib
+from typing import Callable, Optional
+
+from nestipy.common.http_ import Request, Response
+from nestipy.common.http_.file_body import _parse_range, prepare_file_response
+from nestipy.common.logger import logger
+
+# encodings in order of preference when the client accepts several of them
+ENCODINGS = ("br", "zstd", "gzip")
+_SIBLING_EXTENSIONS = {".br": "br", ".zst": "zstd", ".gz": "gzip"}
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/xml",
+    "application/wasm",
+    "image/svg+xml",
+)
+
+
+def _brotli_compress() -> Optional[Callable[[bytes], bytes]]:
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return lambda data: brotli.compress(data, quality=9)
+
+
+def _zstd_compress() -> Optional[Callable[[bytes], bytes]]:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    compressor = zstandard.ZstdCompressor(level=19)
+    return compressor.compress
+
+
+class StaticAsset:
+    __slots__ = (
+        "rel_path",
+        "path",
+        "mtime_ns",
+        "size",
+        "mime_type",
+        "etag",
+        "cache_control",
+        "content",
+        "variants",
+    )
+
+    def __init__(
+        self,
+        rel_path: str,
+        path: str,
+        mtime_ns: int,
+        size: int,
+        mime_type: str,
+        cache_control: Optional[str],
+        content: Optional[bytes],
+    ):
+        self.rel_path = rel_path
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.mime_type = mime_type
+        self.cache_control = cache_control
+        # None for files too large to be kept in memory, sent from disk instead
+        self.content = content
+        self.etag = (
+            f'"{size:x}-{zlib.crc32(content):08x}"'
+            if content is not None
+            else f'"{mtime_ns // 1000:x}-{size:x}"'
+        )
+        self.variants: dict[str, bytes] = {}
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        if encoding is None:
+            return self.etag
+        return self.etag[:-1] + f'-{encoding}"'
+
+    def matches(self, if_none_match: str) -> bool:
+        """
+        Tell if an If-None-Match header names any representation of the asset.
+        """
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if self.etag in tags:
+            return True
+        return any(self.etag_for(encoding) in tags for encoding in self.variants)
+
+    def negotiate(self, accept_encoding: str) -> tuple[Optional[str], bytes]:
+        """
+        Pick the representation to send.
+        :param accept_encoding: Accept-Encoding header of the request.
+        :return: The content encoding (None for identity) and the body.
+        """
+        content = self.content or b""
+        if not self.variants or not accept_encoding:
+            return None, content
+        accepted: dict[str, float] = {}
+        for item in accept_encoding.lower().split(","):
+            name, _, params = item.strip().partition(";")
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip()] = quality
+        best: Optional[str] = None
+        best_quality = 0.0
+        for encoding in ENCODINGS:
+            if encoding not in self.variants:
+                continue
+            quality = accepted.get(encoding, accepted.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        if best is None:
+            return None, content
+        return best, self.variants[best]
+
+
+class StaticAssetIndex:
+    """
+    Index of the files of a web dist directory, built once at startup.
+    Each entry keeps the content, mime type, ETag and Cache-Control of the file
+    with its precompressed variants, so serving an asset is a dict lookup.
+    Compressed siblings written by the build (app.js.br, app.js.gz) are used
+    as is; other text assets are compressed with gzip, and with brotli or zstd
+    when those packages are installed.
+    In watch mode (dev), entries are checked against the file system on lookup
+    and rebuilt when the file changed.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        cache_control_for: Callable[[str], Optional[str]],
+        *,
+        compress: bool = True,
+        watch: bool = False,
+        max_inline_size: int = 1024 * 1024,
+        min_compress_size: int = 1024,
+    ):
+        self.root = os.path.realpath(root)
+        self.watch = watch
+        self._cache_control_for = cache_control_for
+        self._max_inline_size = max_inline_size
+        self._min_compress_size = min_compress_size
+        self._compressors: dict[str, Callable[[bytes], bytes]] = {}
+        if compress:
+            self._compressors["gzip"] = lambda data: gzip.compress(data, 9, mtime=0)
+            brotli = _brotli_compress()
+            if brotli is not None:
+                self._compressors["br"] = brotli
+            zstd = _zstd_compress()
+            if zstd is not None:
+                self._compressors["zstd"] = zstd
+        self._assets: dict[str, StaticAsset] = {}
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def build(self) -> "StaticAssetIndex":
+        self._assets.clear()
+        for directory, _dirs, files in os.walk(self.root):
+            for name in files:
+                path = os.path.join(directory, name)
+                if not self._contains(path):
+                    # a symlink leading out of the dist directory
+                    logger.warning("[WEB] Static asset skipped %s (outside)", path)
+                    continue
+                rel_path = os.path.relpath(path, self.root).replace(os.sep, "/")
+                base, ext = os.path.splitext(rel_path)
+                if ext in _SIBLING_EXTENSIONS and os.path.isfile(
+                    os.path.join(self.root, base)
+                ):
+                    # precompressed variant, attached to its original file
+                    continue
+                try:
+                    self._assets[rel_path] = self._load(rel_path, path)
+                except OSError as exc:
+                    logger.warning("[WEB] Static asset skipped %s (%s)", path, exc)
+        return self
+
+    def _contains(self, path: str) -> bool:
+        return os.path.realpath(path).startswith(self.root + os.sep)
+
+    def _load(self, rel_path: str, path: str) -> StaticAsset:
+        stat = os.stat(path)
+        mime_type, _ = mimetypes.guess_type(path)
+        mime_type = mime_type or "application/octet-stream"
+        content: Optional[bytes] = None
+        if stat.st_size <= self._max_inline_size:
+            with open(path, "rb") as f:
+                content = f.read()
+        asset = StaticAsset(
+            rel_path,
+            path,
+            stat.st_mtime_ns,
+            stat.st_size,
+            mime_type,
+            self._cache_control_for(rel_path),
+            content,
+        )
+        if content is not None:
+            self._add_variants(asset, content)
+        return asset
+
+    def _add_variants(self, asset: StaticAsset, content: bytes) -> None:
+        for ext, encoding in _SIBLING_EXTENSIONS.items():
+            sibling = asset.path + ext
+            if os.path.isfile(sibling) and self._contains(sibling):
+                with open(sibling, "rb") as f:
+                    asset.variants[encoding] = f.read()
+        if (
+            len(content) < self._min_compress_size
+            or not asset.mime_type.startswith(_COMPRESSIBLE_TYPES)
+        ):
+            return
+        for encoding, compress in self._compressors.items():
+            if encoding in asset.variants:
+                continue
+            compressed = compress(content)
+            # keep the variant only when it saves bytes
+            if len(compressed) < len(content):
+                asset.variants[encoding] = compressed
+
+    def lookup(self, rel_path: str) -> Optional[StaticAsset]:
+        """
+        Find the asset served at a path relative to the dist directory.
+        :param rel_path: Relative path, with forward slashes.
+        :return: The asset or None.
+        """
+        rel_path = rel_path.strip("/")
+        asset = self._assets.get(rel_path)
+        if not self.watch:
+            return asset
+        path = os.path.join(self.root, rel_path)
+        if not self._contains(path):
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._assets.pop(rel_path, None)
+            return None
+        if not os.path.isfile(path):
+            return None
+        if asset is None or asset.mtime_ns != stat.st_mtime_ns:
+            asset = self._load(rel_path, path)
+            self._assets[rel_path] = asset
+        return asset
+
+
+async def send_asset(asset: StaticAsset, req: Request, res: Response) -> Response:
+    """
+    Write an indexed asset into a response, answering If-None-Match with a 304,
+    a Range with a 206 and picking the encoding from Accept-Encoding.
+    :param asset: The asset to send.
+    :param req: The request.
+    :param res: The response.
+    :return: The response.
+    """
+    if asset.cache_control:
+        res.header("Cache-Control", asset.cache_control)
+    if asset.content is None:
+        await res.send_file(asset.path, content_type=asset.mime_type)
+        return prepare_file_response(res, req.method, req.headers)
+    if asset.variants:
+        res.header("Vary", "Accept-Encoding")
+    if_none_match = req.headers.get("if-none-match")
+    if if_none_match is not None and asset.matches(if_none_match):
+        res.header("ETag", asset.etag)
+        res.status(304)
+        await res._write(b"")
+        return res
+    res.header("Accept-Ranges", "bytes")
+    range_header = req.headers.get("range")
+    if range_header and req.method == "GET":
+        if_range = req.headers.get("if-range")
+        selected = (
+            _parse_range(range_header, asset.size)
+            if if_range is None or if_range.strip() == asset.etag
+            else None
+        )
+        if selected == (0, 0):
+            res.header("Content-Range", f"bytes */{asset.size}")
+            res.status(416)
+            await res._write(b"")
+            return res
+        if selected is not None:
+            # ranges are served from the identity representation
+            start, end = selected
+            res.header("Content-Range", f"bytes {start}-{end - 1}/{asset.size}")
+            res.header("ETag", asset.etag)
+            res.header("Content-Type", asset.mime_type)
+            res.status(206)
+            await res._write(asset.content[start:end])
+            return res
+    encoding, body = asset.negotiate(req.headers.get("accept-encoding", ""))
+    if encoding is not None:
+        res.header("Content-Encoding", encoding)
+    res.header("ETag", asset.etag_for(encoding))
+    res.header("Content-Type", asset.mime_type)
+    await res._write(body)
+    return res
+
+
+__all__ = ["StaticAsset", "StaticAssetIndex", "send_asset", "ENCODINGS"]
@@ -1,18 +1,15 @@
 from __future__ import annotations
 
-import collections
+import asyncio
 import json
-import mimetypes
 import os
 import re
 import sys
-import time
 import typing
 from typing import Callable, Optional, Awaitable
 
-import aiofiles
-
 from nestipy.common.http_ import Request, Response
+from nestipy.common.http_.file_body import send_file_body
 from nestipy.common.logger import logger
 from nestipy.common.template import TemplateKey
 from nestipy.core.types import JsonValue
@@ -24,7 +21,9 @@ from nestipy.web.ssr import (
     env_ssr_runtime,
     resolve_ssr_entry,
 )
+from nestipy.web.ssr_cache import SSRCache
 from nestipy.core.adapter.http_adapter import HttpAdapter
+from .static_assets import StaticAssetIndex, send_asset
 
 
 class WebStaticHandler:
@@ -39,6 +38,7 @@ class WebStaticHandler:
         self._on_ssr_renderer = on_ssr_renderer
         self._try_handler: Optional[Callable[[Request, Response, bool], Awaitable[bool]]] = None
         self._ssr_renderer: Optional[SSRRenderer] = None
+        self._ssr_cache: Optional[SSRCache] = None
 
     def register(self) -> None:
         """Register static/SSR handlers on the HTTP adapter."""
@@ -90,9 +90,8 @@ class WebStaticHandler:
 
         ssr_enabled = env_ssr_enabled()
         ssr_renderer: Optional[SSRRenderer] = None
-        ssr_cache_size = int(os.getenv("NESTIPY_WEB_SSR_CACHE", "0") or 0)
-        ssr_cache_ttl = float(os.getenv("NESTIPY_WEB_SSR_CACHE_TTL", "0") or 0)
-        ssr_cache: "collections.OrderedDict[str, tuple[float, str]]" = collections.OrderedDict()
+        ssr_cache = SSRCache.from_env() if ssr_enabled else None
+        self._ssr_cache = ssr_cache
         ssr_stream = os.getenv("NESTIPY_WEB_SSR_STREAM", "").strip().lower() in {
             "1",
             "true",
@@ -110,9 +109,6 @@ class WebStaticHandler:
         ssr_routes_loaded = False
         if ssr_enabled:
             runtime = env_ssr_runtime()
-            if ssr_stream and runtime == "jsrun":
-                logger.warning("[WEB] SSR streaming disabled for jsrun runtime")
-                ssr_stream = False
             entry_path = os.getenv("NESTIPY_WEB_SSR_ENTRY") or resolve_ssr_entry(static_dir)
             try:
                 ssr_renderer = create_ssr_renderer(runtime, entry_path)
@@ -314,21 +310,86 @@ class WebStaticHandler:
                 return "public, max-age=31536000, immutable"
             return "public, max-age=3600"
 
-        def _render_ssr_payload(html: str) -> str:
-            index_file = os.path.join(static_dir, index_name)
+        dev_mode = os.getenv("NESTIPY_WEB_DEV") == "1" or "--dev" in sys.argv
+        watch_env = os.getenv("NESTIPY_WEB_STATIC_WATCH", "").strip().lower()
+        compress_env = os.getenv("NESTIPY_WEB_STATIC_COMPRESS", "1").strip().lower()
+        asset_index = StaticAssetIndex(
+            static_dir,
+            _cache_control_for,
+            compress=compress_env not in {"0", "false", "no", "off"},
+            watch=watch_env in {"1", "true", "yes", "on"} if watch_env else dev_mode,
+            max_inline_size=int(
+                os.getenv("NESTIPY_WEB_STATIC_MAX_INLINE", "") or 1024 * 1024
+            ),
+        ).build()
+
+        ssr_root_marker = "<div id=\"root\"></div>"
+
+        def _ssr_template() -> Optional[str]:
+            index_asset = asset_index.lookup(index_name)
+            if index_asset is None:
+                return None
             try:
-                with open(index_file, "r", encoding="utf-8") as f:
-                    template = f.read()
+                if index_asset.content is not None:
+                    template = index_asset.content.decode("utf-8")
+                else:
+                    with open(index_asset.path, "r", encoding="utf-8") as f:
+                        template = f.read()
             except Exception:
-                return html
-            marker = "<div id=\"root\"></div>"
-            if marker in template:
-                template = template.replace(marker, f"<div id=\"root\">{html}</div>")
+                return None
             tags = _build_manifest_tags()
             if tags and "</head>" in template:
                 template = template.replace("</head>", f"{tags}\n</head>")
             return template
 
+        def _render_ssr_payload(html: str) -> str:
+            template = _ssr_template()
+            if template is None:
+                return html
+            if ssr_root_marker in template:
+                template = template.replace(
+                    ssr_root_marker, f"<div id=\"root\">{html}</div>"
+                )
+            return template
+
+        def _ssr_shell() -> Optional[tuple[str, str]]:
+            """Split the page around the root element: head (with tags) and tail."""
+            template = _ssr_template()
+            if template is None or ssr_root_marker not in template:
+                return None
+            head, tail = template.split(ssr_root_marker, 1)
+            return head + "<div id=\"root\">", "</div>" + tail
+
+        async def _stream_page(
+            url: str,
+            shell: tuple[str, str],
+            cache_key: Optional[str],
+            claim: Optional[asyncio.Future],
+        ) -> typing.AsyncIterator[str]:
+            head, tail = shell
+            body: Optional[bytes] = None
+            try:
+                # head and manifest tags go out before the render starts
+                yield head
+                parts: Optional[list[str]] = []
+                try:
+                    renderer = typing.cast(SSRRenderer, ssr_renderer)
+                    async for chunk in renderer.render_stream(url):
+                        if parts is not None:
+                            parts.append(chunk)
+                        yield chunk
+                except Exception as exc:
+                    # the client gets the empty shell and renders on its side
+                    logger.warning("[WEB] SSR stream failed (%s)", exc)
+                    parts = None
+                yield tail
+                if ssr_cache is not None and cache_key is not None and parts:
+                    body = await ssr_cache.put(cache_key, head + "".join(parts) + tail)
+            finally:
+                # requests waiting for this render get the page, or render it
+                if claim is not None and not claim.done():
+                    claim.set_result(body)
+
         async def _try_web_static(req: Request, res: Response, allow_fallback: bool) -> bool:
             rel_path = _resolve_rel_path(req.path)
             if rel_path is None:
@@ -343,30 +404,51 @@ class WebStaticHandler:
                     if not _should_ssr(route_path):
                         raise SSRRenderError("SSR disabled for route")
                     url = route_path + (f"?{qs}" if qs else "")
-                    if ssr_cache_size > 0:
-                        cached = ssr_cache.get(url)
-                        if cached:
-                            ts, payload = cached
-                            if ssr_cache_ttl <= 0 or (time.time() - ts) <= ssr_cache_ttl:
-                                await res.header("Content-Type", "text/html").send(payload)
-                                return True
-                            ssr_cache.pop(url, None)
-                    rendered = await ssr_renderer.render(url)
-                    if rendered:
-                        payload = _render_ssr_payload(rendered)
-                        if ssr_cache_size > 0:
-                            ssr_cache[url] = (time.time(), payload)
-                            while len(ssr_cache) > ssr_cache_size:
-                                ssr_cache.popitem(last=False)
-                        if ssr_stream:
-                            res.header("Content-Type", "text/html")
-
-                            async def _stream():
-                                yield payload
-
-                            await res.stream(_stream)
+
+                    async def _render_page() -> Optional[str]:
+                        rendered = await typing.cast(SSRRenderer, ssr_renderer).render(url)
+                        return _render_ssr_payload(rendered) if rendered else None
+
+                    key: Optional[str] = None
+                    if ssr_cache is not None:
+                        key = ssr_cache.key(url, req.headers, req.cookies)
+                        vary = list(ssr_cache.vary_headers)
+                        if ssr_cache.vary_cookies:
+                            vary.append("cookie")
+                        if vary:
+                            res.header("Vary", ", ".join(vary))
+                    shell = _ssr_shell() if ssr_stream else None
+                    if shell is not None:
+                        claim: Optional[asyncio.Future] = None
+                        if ssr_cache is not None and key is not None:
+                            # stale pages are refreshed by a full render
+                            cached = await ssr_cache.lookup(key, _render_page)
+                            if cached is None:
+                                # waits for the page of a worker rendering it
+                                claim = await ssr_cache.claim(key)
+                                if claim is not None and claim.done():
+                                    cached, claim = claim.result(), None
+                        else:
+                            cached = None
+                        res.header("Content-Type", "text/html")
+                        if cached is not None:
+                            await res._write(cached)
                             return True
-                        await res.header("Content-Type", "text/html").send(payload)
+                        page_shell = shell
+
+                        def _stream():
+                            return _stream_page(url, page_shell, key, claim)
+
+                        await res.stream(_stream)
+                        return True
+                    if ssr_cache is not None and key is not None:
+                        payload = await ssr_cache.get_or_render(key, _render_page)
+                    else:
+                        html = await _render_page()
+                        payload = html.encode("utf-8") if html is not None else None
+                    if payload:
+                        res.header("Content-Type", "text/html")
+                        await res._write(payload)
                         return True
                 except SSRRenderError as exc:
                     message = str(exc)
@@ -374,26 +456,15 @@ class WebStaticHandler:
                         logger.warning("[WEB] SSR render failed (%s)", exc)
                 except Exception:
                     logger.exception("[WEB] SSR render crashed")
-            file_path = os.path.realpath(os.path.join(static_dir, rel_path))
-            if not file_path.startswith(static_dir):
+            asset = asset_index.lookup(rel_path)
+            if asset is None:
+                # directory index
+                asset = asset_index.lookup(f"{rel_path.rstrip('/')}/{index_name}")
+            if asset is None and allow_fallback and fallback_enabled and _accepts_html(req):
+                asset = asset_index.lookup(index_name)
+            if asset is None:
                 return False
-            if os.path.isdir(file_path):
-                file_path = os.path.join(file_path, index_name)
-            if not os.path.isfile(file_path):
-                if allow_fallback and fallback_enabled and _accepts_html(req):
-                    file_path = os.path.join(static_dir, index_name)
-                    rel_path = index_name
-                if not os.path.isfile(file_path):
-                    return False
-            mime_type, _ = mimetypes.guess_type(file_path)
-            mime_type = mime_type or "application/octet-stream"
-            cache_control = _cache_control_for(rel_path)
-            if cache_control:
-                res.header("Cache-Control", cache_control)
-            async with aiofiles.open(file_path, "rb") as f:
-                payload = await f.read()
-            res.header("Content-Type", mime_type)
-            await res._write(payload)
+            await send_asset(asset, req, res)
             return True
 
         async def web_static_handler(req: Request, res: Response, _next_fn):
@@ -403,7 +474,13 @@ class WebStaticHandler:
             return await res.status(404).send("Not found")
 
         self._try_handler = _try_web_static
-        logger.info("[WEB] Serving static from %s at %s", static_dir, static_path)
+        self._asset_index = asset_index
+        logger.info(
+            "[WEB] Serving static from %s at %s (%d assets indexed)",
+            static_dir,
+            static_path,
+            len(asset_index),
+        )
         raw_meta = {"raw": True}
         if static_path == "/":
             self._http_adapter.get("/", web_static_handler, raw_meta)
@@ -424,6 +501,11 @@ class WebStaticHandler:
         self._index_name = index_name
         self._fallback_enabled = fallback_enabled
 
+    async def close(self) -> None:
+        """Stop the SSR cache background work and close its shared store."""
+        if self._ssr_cache is not None:
+            await self._ssr_cache.close()
+
     async def maybe_handle(self, scope: dict, receive: Callable, send_fn: Callable) -> bool:
         """Handle static/SSR requests directly when appropriate."""
         if self._try_handler is None:
@@ -443,7 +525,7 @@ class WebStaticHandler:
         handled = await self._try_handler(req, res, allow_fallback=True)
         if not handled:
             return False
-        await self._send_response(res, send_fn)
+        await self._send_response(res, send_fn, scope)
         return True
 
     def configure_not_found(self, render_not_found: Callable) -> Callable:
@@ -468,26 +550,34 @@ class WebStaticHandler:
             is_index_request = path in {"/", static_path}
             if not _accepts_html(req) and not is_index_request:
                 return await render_not_found(req, res, _next_fn)
-            index_path = os.path.realpath(os.path.join(static_dir, index_name))
-            if not index_path.startswith(static_dir) or not os.path.isfile(index_path):
+            asset_index: Optional[StaticAssetIndex] = getattr(self, "_asset_index", None)
+            asset = asset_index.lookup(index_name) if asset_index is not None else None
+            if asset is None:
                 return await render_not_found(req, res, _next_fn)
-            async with aiofiles.open(index_path, "rb") as f:
-                payload = await f.read()
-            res.header("Content-Type", "text/html; charset=utf-8")
-            await res._write(payload)
-            return res
+            return await send_asset(asset, req, res)
 
         return web_not_found
 
-    async def _send_response(self, res: Response, send_fn: Callable) -> None:
+    async def _send_response(
+        self, res: Response, send_fn: Callable, scope: Optional[dict] = None
+    ) -> None:
         """Write a Response into the ASGI send channel."""
         headers = [
             (k.encode(), v.encode())
             for k, v in typing.cast(set[tuple[str, str]], res.headers())
         ]
+        file = res.file_body()
+        if file is not None:
+            headers.append((b"content-length", str(file.length).encode()))
         await send_fn(
             {"type": "http.response.start", "status": res.status_code(), "headers": headers}
         )
+        if file is not None:
+            if (scope or {}).get("method") == "HEAD":
+                await send_fn({"type": "http.response.body", "body": b"", "more_body": False})
+            else:
+                await send_file_body(file, scope or {}, send_fn)
+            return
         if res.is_stream():
             stream_content = typing.cast(
                 Callable[[], typing.AsyncIterator[bytes | str]],
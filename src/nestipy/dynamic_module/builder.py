@@ -112,10 +112,16 @@ class ConfigurableModuleBuilder(Generic[T]):
     def create_dynamic_module(
         self, obj: Any, imports: list, provider: list
     ) -> DynamicModule:
+        # a module registered again replaces its previous option providers
+        tokens = {p.token for p in provider if isinstance(p, ModuleProviderDict)}
+        providers = [
+            p
+            for p in Reflect.get_metadata(obj, ModuleMetadata.Providers, [])
+            if not (isinstance(p, ModuleProviderDict) and p.token in tokens)
+        ]
         dynamic_module = DynamicModule(
             obj,
-            providers=provider
-            + Reflect.get_metadata(obj, ModuleMetadata.Providers, []),
+            providers=provider + providers,
             exports=Reflect.get_metadata(obj, ModuleMetadata.Exports, []),
             imports=imports + Reflect.get_metadata(obj, ModuleMetadata.Imports, []),
             controllers=Reflect.get_metadata(obj, ModuleMetadata.Controllers, []),
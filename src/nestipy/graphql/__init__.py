@@ -1,5 +1,8 @@
 from .decorator import Resolver, Query, Mutation, Subscription, ResolveField
 from .dependency import Args, Context, Parent
+from .dataloader import DataLoader
+from .persisted_queries import PersistedQueryStore, PersistedQueryError
+from .query_cost import QueryCost, analyze_query
 from .strawberry.dependency import Root, Info
 from .graphql_module import GraphqlModule, GraphqlOption, ASGIOption, SchemaOption
 from .pubsub import PubSub
@@ -14,6 +17,11 @@ __all__ = [
     "ASGIOption",
     "SchemaOption",
     "PubSub",
+    "DataLoader",
+    "PersistedQueryStore",
+    "PersistedQueryError",
+    "QueryCost",
+    "analyze_query",
     "ResolveField",
     "Args",
     "Context",
@@ -0,0 +1,51 @@
+from typing import Generic, Optional, Sequence, TypeVar, Union
+
+from strawberry.dataloader import DataLoader as StrawberryDataLoader
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class DataLoader(StrawberryDataLoader[K, V], Generic[K, V]):
+    """
+    Batch and cache the keyed loads of a GraphQL operation: the keys loaded
+    while resolving a same level of the query reach batch_load in one call.
+
+    Subclass it, implement batch_load and register it as a request scoped
+    provider, so each operation gets its own loader and cache:
+
+        @Injectable(scope=Scope.Request)
+        class UserLoader(DataLoader[int, User]):
+            users: Annotated[UserService, Inject()]
+
+            async def batch_load(self, keys: list[int]) -> list[User]:
+                return await self.users.find_many(keys)
+
+    A subclass defining __init__ must call super().__init__().
+    """
+
+    # keys per batch_load call, None for no limit
+    max_batch_size: Optional[int] = None
+    # keep loaded values for the operation, a key being loaded once
+    cache: bool = True
+
+    def __init__(self) -> None:
+        super().__init__(
+            load_fn=self.batch_load,
+            max_batch_size=type(self).max_batch_size,
+            cache=type(self).cache,
+        )
+
+    async def batch_load(self, keys: list[K]) -> Sequence[Union[V, BaseException]]:
+        """
+        Load the values of a batch of keys.
+        :param keys: The keys, in the order they were loaded.
+        :return: The value of each key, in the order of the keys. An exception in
+        place of a value fails the load of its key only.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} must implement batch_load(keys)"
+        )
+
+
+__all__ = ["DataLoader"]
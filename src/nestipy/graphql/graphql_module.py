@@ -7,6 +7,7 @@ from nestipy.core.security.cors import CorsOptions
 from nestipy.common.decorator import Module
 from nestipy.dynamic_module import ConfigurableModuleBuilder
 from nestipy.ioc import Inject
+from .persisted_queries import PersistedQueryStore
 
 
 @dataclasses.dataclass
@@ -43,6 +44,13 @@ class GraphqlOption:
     context_callback: Optional[Callable[[...], dict]] = None
     schema: Optional[Any] = None
     schema_factory: Optional[Callable[..., Any]] = None
+    # parsed and validated documents kept by query hash, 0 parses every request
+    document_cache_size: int = 1024
+    # automatic persisted queries (Apollo APQ): True for an in-memory store
+    persisted_queries: Union[bool, PersistedQueryStore] = False
+    # operations deeper or more complex than this are rejected before execution
+    max_depth: Optional[int] = None
+    max_complexity: Optional[int] = None
 
     def __post_init__(self):
         if self.ide not in ["default", "graphiql", "apollo-sandbox"]:
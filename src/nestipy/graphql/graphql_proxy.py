@@ -4,10 +4,8 @@ import os.path
 import traceback
 from typing import Union, Type, Callable, Any
 
-from nestipy.core.guards import GuardProcessor
-from nestipy.core.interceptor import RequestInterceptor
-from nestipy.core.pipes.processor import PipeProcessor
 from nestipy.core.exception.processor import ExceptionFilterHandler
+from nestipy.core.router.route_pipeline import RoutePipeline
 from nestipy.graphql.graphql_adapter import GraphqlAdapter
 from nestipy.graphql.meta import NestipyGraphqlKey
 from nestipy.ioc import NestipyContainer
@@ -103,6 +101,15 @@ class GraphqlProxy:
                 token = dep_key.metadata.token
                 if isinstance(token, str) and token not in ("root", "info", "__all_args__"):
                     arg_token_map[token] = param_name
+        # enhancers are collected once; resolvers without any (most field
+        # resolvers) skip the guard/pipe/interceptor chain on every call
+        pipeline = RoutePipeline.compile(self._adapter, module_ref, resolver, method)
+        try:
+            call_resolver = self.container.compile_method(resolver, method_name)
+        except Exception:
+            # reported when the resolver is called
+            async def call_resolver():
+                return await self.container.get(resolver, method_name)
 
         async def graphql_handler(*_args, **kwargs):
             root = None
@@ -134,39 +141,20 @@ class GraphqlProxy:
                 self._adapter,
                 module_ref,
                 resolver,
-                getattr(resolver, method_name),
+                method,
                 default_context.get_request(),
                 default_context.get_response(),
                 graphql_args,
                 graphql_context,
             )
             context_container.set_execution_context(execution_context)
-            await self.container.preload_request_scoped_properties()
             try:
-                guard_processor: GuardProcessor = await self.container.get(
-                    GuardProcessor
-                )
-                can_activate = await guard_processor.process(execution_context)
-                if not can_activate[0]:
-                    raise HttpException(
-                        HttpStatus.UNAUTHORIZED, HttpStatusMessages.UNAUTHORIZED
+                if pipeline.is_empty:
+                    result = await call_resolver()
+                else:
+                    result = await self._call_pipeline(
+                        pipeline, execution_context, call_resolver
                     )
-
-                pipe_processor: PipeProcessor = await self.container.get(PipeProcessor)
-                pipes = await pipe_processor.get_pipes(
-                    execution_context, is_http=True
-                )
-                execution_context.set_pipes(pipes)
-
-                async def next_fn():
-                    return await self.container.get(resolver, method_name)
-
-                interceptor: RequestInterceptor = await self.container.get(
-                    RequestInterceptor
-                )
-                result = await interceptor.intercept(
-                    execution_context, next_fn, is_http=True
-                )
             except Exception as e:
                 tb = traceback.format_exc()
                 logger.error(e)
@@ -204,6 +192,23 @@ class GraphqlProxy:
             graphql_handler,
         )
 
+    async def _call_pipeline(
+        self,
+        pipeline: RoutePipeline,
+        execution_context: ExecutionContext,
+        call_resolver: Callable,
+    ) -> Any:
+        await self.container.preload_request_scoped_properties()
+        can_activate = await pipeline.can_activate(execution_context)
+        if not can_activate[0]:
+            raise HttpException(
+                HttpStatus.UNAUTHORIZED, HttpStatusMessages.UNAUTHORIZED
+            )
+        execution_context.set_pipes(await pipeline.get_pipes(self.container))
+        if not pipeline.interceptors:
+            return await call_resolver()
+        return await pipeline.intercept(execution_context, call_resolver)
+
     async def _create_graphql_request_handler(self, option: GraphqlOption):
         graphql_path = f"/{option.url.strip('/')}"
         schema_option: Any = option.schema_option or {}
@@ -0,0 +1,90 @@
+import collections
+import hashlib
+from typing import Optional
+
+PERSISTED_QUERY_NOT_FOUND = "PERSISTED_QUERY_NOT_FOUND"
+PERSISTED_QUERY_NOT_SUPPORTED = "PERSISTED_QUERY_NOT_SUPPORTED"
+PERSISTED_QUERY_HASH_MISMATCH = "PERSISTED_QUERY_HASH_MISMATCH"
+
+
+class PersistedQueryError(Exception):
+    """A persisted query that cannot be resolved, with its Apollo error code."""
+
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+def query_hash(query: str) -> str:
+    """sha256 hex digest of a query, as sent by Apollo clients."""
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class PersistedQueryStore:
+    """
+    LRU store of the queries registered by automatic persisted queries (APQ),
+    keyed by their sha256 hash. Override get/set to share it between workers.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._queries: collections.OrderedDict[str, str] = collections.OrderedDict()
+
+    async def get(self, sha256_hash: str) -> Optional[str]:
+        query = self._queries.get(sha256_hash)
+        if query is not None:
+            self._queries.move_to_end(sha256_hash)
+        return query
+
+    async def set(self, sha256_hash: str, query: str) -> None:
+        self._queries[sha256_hash] = query
+        self._queries.move_to_end(sha256_hash)
+        if len(self._queries) > self.maxsize:
+            self._queries.popitem(last=False)
+
+    async def resolve(
+        self, query: Optional[str], extensions: Optional[dict]
+    ) -> tuple[Optional[str], Optional[str]]:
+        """
+        Resolve the query of a request using the persistedQuery extension:
+        a hash alone loads the registered query, a hash with its query
+        registers it.
+        :param query: Query of the request, if any.
+        :param extensions: Extensions of the request.
+        :return: The query and its verified hash (None when not persisted).
+        :raise PersistedQueryError: Unknown hash, or a hash not matching the query.
+        """
+        persisted = (extensions or {}).get("persistedQuery")
+        if not isinstance(persisted, dict):
+            return query, None
+        if persisted.get("version", 1) != 1:
+            raise PersistedQueryError(
+                "Unsupported persisted query version", PERSISTED_QUERY_NOT_SUPPORTED
+            )
+        sha256_hash = persisted.get("sha256Hash")
+        if not isinstance(sha256_hash, str):
+            return query, None
+        if not query:
+            query = await self.get(sha256_hash)
+            if query is None:
+                raise PersistedQueryError(
+                    "PersistedQueryNotFound", PERSISTED_QUERY_NOT_FOUND
+                )
+            return query, sha256_hash
+        if query_hash(query) != sha256_hash:
+            raise PersistedQueryError(
+                "provided sha does not match query", PERSISTED_QUERY_HASH_MISMATCH
+            )
+        await self.set(sha256_hash, query)
+        return query, sha256_hash
+
+
+__all__ = [
+    "PersistedQueryStore",
+    "PersistedQueryError",
+    "query_hash",
+    "PERSISTED_QUERY_NOT_FOUND",
+    "PERSISTED_QUERY_NOT_SUPPORTED",
+    "PERSISTED_QUERY_HASH_MISMATCH",
+]
@@ -0,0 +1,120 @@
+import dataclasses
+from typing import Any, Optional
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    VariableNode,
+    value_from_ast_untyped,
+)
+
+# arguments sizing the list returned by a field
+PAGINATION_ARGUMENTS = ("first", "last", "limit", "take")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class QueryCost:
+    # deepest field, root fields being at depth 1
+    depth: int
+    # number of fields resolved, each multiplied by the size of its parent lists
+    complexity: int
+    # whether a variable sizes a list, the cost then depends on the variables
+    variable: bool = False
+
+
+class _Analyzer:
+    __slots__ = ("fragments", "variables", "variable")
+
+    def __init__(self, fragments: dict, variables: Optional[dict]):
+        self.fragments = fragments
+        self.variables = variables or {}
+        self.variable = False
+
+    def selection_set(
+        self, selection_set: Optional[SelectionSetNode], depth: int, seen: frozenset
+    ) -> tuple[int, int]:
+        if selection_set is None:
+            return depth - 1, 0
+        max_depth, complexity = depth - 1, 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                if selection.name.value.startswith("__"):
+                    # introspection does not touch resolvers
+                    continue
+                sub_depth, sub_complexity = self.selection_set(
+                    selection.selection_set, depth + 1, seen
+                )
+                max_depth = max(max_depth, sub_depth, depth)
+                complexity += 1 + self.list_size(selection) * sub_complexity
+            elif isinstance(selection, InlineFragmentNode):
+                sub_depth, sub_complexity = self.selection_set(
+                    selection.selection_set, depth, seen
+                )
+                max_depth = max(max_depth, sub_depth)
+                complexity += sub_complexity
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.fragments.get(name)
+                if fragment is None or name in seen:
+                    continue
+                sub_depth, sub_complexity = self.selection_set(
+                    fragment.selection_set, depth, seen | {name}
+                )
+                max_depth = max(max_depth, sub_depth)
+                complexity += sub_complexity
+        return max_depth, complexity
+
+    def list_size(self, field: FieldNode) -> int:
+        for argument in field.arguments or ():
+            if argument.name.value not in PAGINATION_ARGUMENTS:
+                continue
+            value: Any = None
+            if isinstance(argument.value, IntValueNode):
+                value = int(argument.value.value)
+            elif isinstance(argument.value, VariableNode):
+                self.variable = True
+                value = self.variables.get(argument.value.name.value)
+            else:
+                value = value_from_ast_untyped(argument.value, self.variables)
+            if isinstance(value, int) and value > 0:
+                return value
+        return 1
+
+
+def analyze_query(
+    document: DocumentNode,
+    operation_name: Optional[str] = None,
+    variables: Optional[dict] = None,
+) -> QueryCost:
+    """
+    Depth and complexity of an operation, computed from its document before
+    execution. A field with a first/last/limit/take argument multiplies the
+    complexity of its selection by that size.
+    :param document: The parsed and validated document.
+    :param operation_name: The operation to analyze, when the document has several.
+    :param variables: Variables of the request, sizing lists given by variable.
+    :return: The cost of the operation.
+    """
+    fragments: dict[str, FragmentDefinitionNode] = {}
+    operation: Optional[OperationDefinitionNode] = None
+    for definition in document.definitions:
+        if isinstance(definition, FragmentDefinitionNode):
+            fragments[definition.name.value] = definition
+        elif isinstance(definition, OperationDefinitionNode):
+            name = definition.name.value if definition.name else None
+            if operation is None and (operation_name is None or name == operation_name):
+                operation = definition
+    if operation is None:
+        return QueryCost(0, 0)
+    analyzer = _Analyzer(fragments, variables)
+    depth, complexity = analyzer.selection_set(operation.selection_set, 1, frozenset())
+    return QueryCost(depth, complexity, analyzer.variable)
+
+
+__all__ = ["QueryCost", "analyze_query", "PAGINATION_ARGUMENTS"]
@@ -11,10 +11,13 @@ from strawberry import type as ObjectType, interface as Interface
 from .strawberry_asgi import StrawberryASGI
 from .strawberry_adapter import StrawberryAdapter
 from .dependency import Root, Info
+from .document_cache import DocumentCache, DocumentCacheExtension
 
 __all__ = [
     "StrawberryASGI",
     "StrawberryAdapter",
+    "DocumentCache",
+    "DocumentCacheExtension",
     "ObjectType",
     "Interface",
     "Input",
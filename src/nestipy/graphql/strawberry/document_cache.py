@@ -0,0 +1,155 @@
+import collections
+from typing import Iterator, Optional
+
+from graphql import DocumentNode, GraphQLError, validate
+from strawberry.extensions import SchemaExtension
+
+from ..persisted_queries import query_hash
+from ..query_cost import QueryCost, analyze_query
+
+QUERY_TOO_DEEP = "QUERY_TOO_DEEP"
+QUERY_TOO_COMPLEX = "QUERY_TOO_COMPLEX"
+
+
+class _CachedDocument:
+    __slots__ = ("document", "errors", "costs")
+
+    def __init__(self, document: DocumentNode):
+        self.document = document
+        # validation errors, None until the document is validated
+        self.errors: Optional[tuple[GraphQLError, ...]] = None
+        # cost of each operation, when it does not depend on the variables
+        self.costs: dict[Optional[str], QueryCost] = {}
+
+
+class DocumentCache:
+    """
+    LRU of parsed documents keyed by the sha256 hash of their query, with
+    their validation errors and cost, so a query sent again skips parsing,
+    validation and analysis.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._documents: collections.OrderedDict[str, _CachedDocument] = (
+            collections.OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get(self, key: str) -> Optional[_CachedDocument]:
+        entry = self._documents.get(key)
+        if entry is not None:
+            self._documents.move_to_end(key)
+        return entry
+
+    def put(self, key: str, document: DocumentNode) -> _CachedDocument:
+        entry = _CachedDocument(document)
+        self._documents[key] = entry
+        if len(self._documents) > self.maxsize:
+            self._documents.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        self._documents.clear()
+
+
+class DocumentCacheExtension(SchemaExtension):
+    """
+    Serve parsed and validated documents from a DocumentCache, and reject
+    operations deeper or more complex than the limits before execution.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[DocumentCache],
+        max_depth: Optional[int] = None,
+        max_complexity: Optional[int] = None,
+    ):
+        """
+        :param cache: The cache, None to only check the limits.
+        :param max_depth: Maximum depth of an operation.
+        :param max_complexity: Maximum complexity of an operation.
+        """
+        super().__init__()
+        self.cache = cache
+        self.max_depth = max_depth
+        self.max_complexity = max_complexity
+        self._entry: Optional[_CachedDocument] = None
+
+    def _cache_key(self) -> Optional[str]:
+        # hash the query itself: a persistedQuery hash sent by the client is not
+        # checked against the query on every path reaching the schema
+        query = self.execution_context.query
+        return query_hash(query) if query else None
+
+    def on_parse(self) -> Iterator[None]:
+        context = self.execution_context
+        key = self._cache_key() if self.cache is not None else None
+        entry = self.cache.get(key) if key is not None else None
+        if entry is not None:
+            context.graphql_document = entry.document
+        yield
+        if entry is None and key is not None and context.graphql_document is not None:
+            entry = self.cache.put(key, context.graphql_document)
+        self._entry = entry
+
+    def on_validate(self) -> Iterator[None]:
+        context = self.execution_context
+        entry = self._entry
+        if context.pre_execution_errors is None:
+            if entry is not None and entry.errors is not None:
+                errors = list(entry.errors)
+            elif context.validation_rules:
+                errors = validate(
+                    context.schema._schema,
+                    context.graphql_document,
+                    context.validation_rules,
+                )
+                if entry is not None:
+                    entry.errors = tuple(errors)
+            else:
+                errors = []
+            context.pre_execution_errors = errors
+        if not context.pre_execution_errors:
+            context.pre_execution_errors = self._check_cost(entry)
+        yield
+
+    def _check_cost(self, entry: Optional[_CachedDocument]) -> list[GraphQLError]:
+        if self.max_depth is None and self.max_complexity is None:
+            return []
+        context = self.execution_context
+        operation_name = context.provided_operation_name
+        cost = entry.costs.get(operation_name) if entry is not None else None
+        if cost is None:
+            cost = analyze_query(
+                context.graphql_document, operation_name, context.variables
+            )
+            if entry is not None and not cost.variable:
+                entry.costs[operation_name] = cost
+        errors = []
+        if self.max_depth is not None and cost.depth > self.max_depth:
+            errors.append(
+                GraphQLError(
+                    f"Query depth {cost.depth} exceeds the maximum of {self.max_depth}",
+                    extensions={"code": QUERY_TOO_DEEP},
+                )
+            )
+        if self.max_complexity is not None and cost.complexity > self.max_complexity:
+            errors.append(
+                GraphQLError(
+                    f"Query complexity {cost.complexity} exceeds the maximum of "
+                    f"{self.max_complexity}",
+                    extensions={"code": QUERY_TOO_COMPLEX},
+                )
+            )
+        return errors
+
+
+__all__ = [
+    "DocumentCache",
+    "DocumentCacheExtension",
+    "QUERY_TOO_DEEP",
+    "QUERY_TOO_COMPLEX",
+]
@@ -1,18 +1,28 @@
-from dataclasses import asdict, is_dataclass
-from typing import Union, Callable, MutableMapping, Any, Awaitable, cast
+import functools
+from dataclasses import asdict, is_dataclass, replace
+from typing import Union, Callable, MutableMapping, Any, Awaitable, Optional, cast
 
+from graphql import GraphQLError
 from strawberry.asgi import HTTPException
 from starlette.requests import Request
 from starlette.responses import HTMLResponse, PlainTextResponse, Response
 from starlette.websockets import WebSocket
 from strawberry.asgi import GraphQL
+from strawberry.http import GraphQLRequestData
 from strawberry.http.typevars import Context
 from strawberry.printer import print_schema
 from strawberry.schema import BaseSchema
 from strawberry.subscriptions import GRAPHQL_TRANSPORT_WS_PROTOCOL, GRAPHQL_WS_PROTOCOL
+from strawberry.types import ExecutionResult
 
 from ..graphql_asgi import GraphqlASGI
 from ..graphql_module import GraphqlOption, ASGIOption
+from ..persisted_queries import (
+    PERSISTED_QUERY_NOT_SUPPORTED,
+    PersistedQueryError,
+    PersistedQueryStore,
+)
+from .document_cache import DocumentCache, DocumentCacheExtension
 from nestipy.core.security.cors import apply_cors_headers, resolve_cors_options
 
 
@@ -41,6 +51,40 @@ class StrawberryASGI(GraphQL, GraphqlASGI):
         )
         super().__init__(schema=schema, **asgi_option)
         self.set_graphql_option(option)
+        self.persisted_queries: Optional[PersistedQueryStore] = None
+        if isinstance(option.persisted_queries, PersistedQueryStore):
+            self.persisted_queries = option.persisted_queries
+        elif option.persisted_queries:
+            self.persisted_queries = PersistedQueryStore()
+        self.document_cache: Optional[DocumentCache] = None
+        if option.document_cache_size > 0:
+            self.document_cache = DocumentCache(option.document_cache_size)
+        self._install_document_cache(option)
+
+    def _install_document_cache(self, option: GraphqlOption) -> None:
+        # the schema may be reused by another app, replace its previous cache
+        extensions = [
+            extension
+            for extension in self.schema.extensions
+            if not (
+                isinstance(extension, functools.partial)
+                and extension.func is DocumentCacheExtension
+            )
+        ]
+        if (
+            self.document_cache is not None
+            or option.max_depth is not None
+            or option.max_complexity is not None
+        ):
+            extensions.append(
+                functools.partial(
+                    DocumentCacheExtension,
+                    self.document_cache,
+                    max_depth=option.max_depth,
+                    max_complexity=option.max_complexity,
+                )
+            )
+        self.schema.extensions = extensions
 
     def print_schema(self) -> str:
         return print_schema(self.schema)
@@ -51,6 +95,56 @@ class StrawberryASGI(GraphQL, GraphqlASGI):
         context = {"request": request, "response": response}
         return cast(Context, await self.modify_default_context(context))
 
+    async def execute_single(
+        self,
+        request: Request,
+        request_adapter: Any,
+        sub_response: Any,
+        context: Context,
+        root_value: Any,
+        request_data: GraphQLRequestData,
+    ) -> ExecutionResult:
+        try:
+            query = await self._resolve_persisted_query(request_data)
+        except PersistedQueryError as e:
+            return ExecutionResult(
+                data=None,
+                errors=[GraphQLError(e.message, extensions={"code": e.code})],
+            )
+        if query is not request_data.query:
+            request_data = replace(request_data, query=query)
+        return await super().execute_single(
+            request=request,
+            request_adapter=request_adapter,
+            sub_response=sub_response,
+            context=context,
+            root_value=root_value,
+            request_data=request_data,
+        )
+
+    async def _resolve_persisted_query(
+        self, request_data: GraphQLRequestData
+    ) -> Optional[str]:
+        if self.persisted_queries is not None:
+            query, _ = await self.persisted_queries.resolve(
+                request_data.query, request_data.extensions
+            )
+            return query
+        if not request_data.query and "persistedQuery" in (
+            request_data.extensions or {}
+        ):
+            raise PersistedQueryError(
+                "PersistedQueryNotSupported", PERSISTED_QUERY_NOT_SUPPORTED
+            )
+        return request_data.query
+
+    def should_render_graphql_ide(self, request: Any) -> bool:
+        # a GET with only a persisted query hash is an operation, not the IDE
+        return (
+            super().should_render_graphql_ide(request)
+            and request.query_params.get("extensions") is None
+        )
+
     async def render_graphql_ide(self, request: Union[Request, WebSocket]) -> Response:
         if self.option != None and self.option.ide:
             try:
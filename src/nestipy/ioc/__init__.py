@@ -1,6 +1,7 @@
 from .annotation import ParamAnnotation
 from .container import NestipyContainer
 from .context_container import RequestContextContainer
+from .enhancer_scope import EnhancerScopeRegistry
 from .dependency import (
     Inject,
     Res,
@@ -33,6 +34,7 @@ __all__ = [
     "NestipyContainer",
     "NestipyIContainer",
     "RequestContextContainer",
+    "EnhancerScopeRegistry",
     "ModuleProviderDict",
     "Inject",
     "Res",
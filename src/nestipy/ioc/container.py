@@ -28,6 +28,7 @@ from nestipy.common.constant import (
 )
 from .context_container import RequestContextContainer
 from .dependency import TypeAnnotated
+from .enhancer_scope import EnhancerScopeRegistry
 from .helper import ContainerHelper
 from .utils import uniq
 
@@ -37,6 +38,23 @@ if TYPE_CHECKING:
 _INIT = "__init__"
 _MISSING = object()
 
+_PIPE_TYPES: dict = {
+    CtxDepKey.Body: "body",
+    CtxDepKey.Query: "query",
+    CtxDepKey.Queries: "query",
+    CtxDepKey.Param: "param",
+    CtxDepKey.Params: "param",
+    CtxDepKey.Header: "header",
+    CtxDepKey.Headers: "header",
+    CtxDepKey.Cookie: "cookie",
+    CtxDepKey.Cookies: "cookie",
+    CtxDepKey.Session: "session",
+    CtxDepKey.Sessions: "session",
+    CtxDepKey.Args: "args",
+    CtxDepKey.Arg: "args",
+}
+_PIPEABLE_KEYS = frozenset(_PIPE_TYPES)
+
 
 class RequestScopedProxy:
     def __init__(self, key: Union[Type, str, object]):
@@ -46,12 +64,14 @@ class RequestScopedProxy:
         if instance is None:
             return self
         cache = RequestContextContainer.get_instance().get_request_cache()
-        if cache is None or self._key not in cache:
-            raise RuntimeError(
-                "Request-scoped dependency accessed outside of request context. "
-                "Ensure request context is initialized."
-            )
-        return cache[self._key]
+        if cache is not None and self._key in cache:
+            return cache[self._key]
+        if cache is not None and NestipyContainer.is_lazy_request_scope():
+            return NestipyContainer.get_instance().resolve_request_scoped(self._key)
+        raise RuntimeError(
+            "Request-scoped dependency accessed outside of request context. "
+            "Ensure request context is initialized."
+        )
 
 
 class NestipyContainer:
@@ -71,6 +91,9 @@ class NestipyContainer:
     _request_scoped_property_map: dict = {}
     _method_dependency_cache: dict = {}
     _dependency_metadata_cache: dict = {}
+    _compiled_methods: dict = {}
+    _lazy_request_scope: bool = False
+    _lazy_preload_keys: dict = {}
 
     def __new__(cls, *args, **kwargs):
         """
@@ -102,6 +125,10 @@ class NestipyContainer:
         cls._request_scoped_property_map = {}
         cls._method_dependency_cache = {}
         cls._dependency_metadata_cache = {}
+        cls._compiled_methods = {}
+        cls._lazy_request_scope = False
+        cls._lazy_preload_keys = {}
+        EnhancerScopeRegistry.clear()
 
     def add_transient(self, service: Type):
         """
@@ -130,6 +157,15 @@ class NestipyContainer:
         self._services[service] = service
         self._singleton_classes.add(service)
 
+    def is_singleton(self, service: Union[Type, str, object]) -> bool:
+        """
+        Check if a service is registered as a singleton.
+
+        :param service: The service class or token.
+        :return: True if the service is a singleton.
+        """
+        return service in self._singleton_classes
+
     def get_all_services(self) -> list:
         """
         Returns a list of all registered services in the container.
@@ -144,6 +180,109 @@ class NestipyContainer:
         props = self._request_scoped_property_map.setdefault(owner, {})
         props[name] = dep_key
 
+    @classmethod
+    def set_lazy_request_scope(cls, enabled: bool = True) -> None:
+        """
+        Switch request-scoped properties of singletons to lazy resolution.
+        When enabled, each dependency is resolved by RequestScopedProxy the first time
+        it is read. Dependencies whose construction may await I/O (async factories,
+        request body) cannot be built from a property read, so they keep being
+        preloaded per request.
+
+        :param enabled: True to resolve on first access, False to preload per request.
+        """
+        cls._lazy_request_scope = enabled
+
+    @classmethod
+    def is_lazy_request_scope(cls) -> bool:
+        return cls._lazy_request_scope
+
+    def resolve_request_scoped(self, key: Union[Type, str, object]) -> object:
+        """
+        Resolve a request-scoped dependency synchronously from a property access.
+        Resolution is driven without an event loop round trip, which works as long as
+        building the dependency never suspends. Dependencies that may suspend are
+        preloaded by preload_request_scoped_properties() instead.
+
+        :param key: The request-scoped service class or token.
+        :return: The instance, cached in the request cache for the rest of the request.
+        :raises RuntimeError: If resolving the dependency needs to suspend.
+        """
+        coro = self.get(key)
+        try:
+            coro.send(None)
+        except StopIteration as result:
+            return result.value
+        coro.close()
+        # preload it from the next request on
+        self._lazy_preload_keys[key] = True
+        raise RuntimeError(
+            f"Request-scoped dependency {getattr(key, '__name__', key)} cannot be "
+            "resolved lazily because its construction awaits I/O. "
+            "Disable lazy request scope to preload it."
+        )
+
+    def _may_await_io(self, key: Union[Type, str, object], seen: set) -> bool:
+        """
+        Tell, without building it, whether building a service may await I/O: an
+        async contextual dependency (like the request body) or a provider factory
+        not resolved yet, in the service or in its dependencies.
+
+        :param key: The service class or token.
+        :param seen: The services already checked.
+        :return: True if building the service may suspend.
+        """
+        from .provider import ModuleProviderDict
+
+        if key in seen:
+            return False
+        seen.add(key)
+        if key in self._singleton_instances:
+            instance = self._singleton_instances[key]
+            if not isinstance(instance, ModuleProviderDict) or instance.value:
+                return False
+            if instance.factory:
+                return True
+            existing = instance.existing
+            if isinstance(existing, ProviderToken):
+                existing = existing.key
+            return self._may_await_io(existing or instance.use_class, seen)
+        service = self._services.get(key, key)
+        if not inspect.isclass(service):
+            return False
+        annotations = list(getattr(service, "__annotations__", {}).values())
+        try:
+            params = inspect.signature(service.__init__).parameters.values()
+        except (TypeError, ValueError):
+            params = []
+        annotations += [
+            param.annotation
+            for param in params
+            if param.annotation is not inspect.Parameter.empty
+        ]
+        for param_annotation in annotations:
+            annotation, dep_key = ContainerHelper.get_type_from_annotation(
+                param_annotation
+            )
+            if dep_key.metadata.key is not CtxDepKey.Service:
+                if inspect.iscoroutinefunction(dep_key.metadata.callback):
+                    return True
+                continue
+            dep = dep_key.metadata.token or annotation
+            if isinstance(dep, ForwardRef):
+                # not resolved yet, assume the worst
+                return True
+            if self._may_await_io(dep, seen):
+                return True
+        return False
+
+    def _preload_when_lazy(self, key: Union[Type, str, object]) -> bool:
+        preload = self._lazy_preload_keys.get(key)
+        if preload is None:
+            preload = self._may_await_io(key, set())
+            self._lazy_preload_keys[key] = preload
+        return preload
+
     async def preload_request_scoped_properties(self) -> None:
         if not self._request_scoped_property_map:
             return
@@ -156,6 +295,8 @@ class NestipyContainer:
         for dep in deps:
             if dep in cache:
                 continue
+            if self._lazy_request_scope and not self._preload_when_lazy(dep):
+                continue
             try:
                 await self.get(dep)
             except Exception:
@@ -250,9 +391,23 @@ class NestipyContainer:
         cls._dependency_metadata_cache[service] = deps
         return deps
 
+    @classmethod
+    def reset_dependency_metadata(cls, service: Union[Type, object]) -> None:
+        """
+        Drop the cached dependency metadata of a service so it is recomputed from its
+        current ClassMetadata on next resolution.
+
+        :param service: The service class.
+        """
+        cls._dependency_metadata_cache.pop(service, None)
+        for cache_key in list(cls._compiled_methods):
+            if cache_key[0] is service or cls._services.get(cache_key[0]) is service:
+                del cls._compiled_methods[cache_key]
+
     @classmethod
     def precompute_dependency_graph(cls, modules: list[Type]) -> None:
         cls._dependency_metadata_cache = {}
+        cls._compiled_methods = {}
         candidates: set = set(cls._services.keys())
         from .provider import ModuleProviderDict
 
@@ -561,40 +716,11 @@ class NestipyContainer:
 
     @staticmethod
     def _pipe_type_from_key(key: str) -> str:
-        mapping = {
-            CtxDepKey.Body: "body",
-            CtxDepKey.Query: "query",
-            CtxDepKey.Queries: "query",
-            CtxDepKey.Param: "param",
-            CtxDepKey.Params: "param",
-            CtxDepKey.Header: "header",
-            CtxDepKey.Headers: "header",
-            CtxDepKey.Cookie: "cookie",
-            CtxDepKey.Cookies: "cookie",
-            CtxDepKey.Session: "session",
-            CtxDepKey.Sessions: "session",
-            CtxDepKey.Args: "args",
-            CtxDepKey.Arg: "args",
-        }
-        return mapping.get(key, "custom")
+        return _PIPE_TYPES.get(key, "custom")
 
     @staticmethod
     def _can_apply_pipes(key: str) -> bool:
-        return key in {
-            CtxDepKey.Body,
-            CtxDepKey.Query,
-            CtxDepKey.Queries,
-            CtxDepKey.Param,
-            CtxDepKey.Params,
-            CtxDepKey.Header,
-            CtxDepKey.Headers,
-            CtxDepKey.Cookie,
-            CtxDepKey.Cookies,
-            CtxDepKey.Session,
-            CtxDepKey.Sessions,
-            CtxDepKey.Args,
-            CtxDepKey.Arg,
-        }
+        return key in _PIPEABLE_KEYS
 
     async def _apply_pipes(
         self,
@@ -682,6 +808,79 @@ class NestipyContainer:
         )
         return await self._call_method(method=factory, args=args)
 
+    def compile_method(
+        self, key: Union[Type, str, object], method: str
+    ) -> "CompiledMethod":
+        """
+        Build, once, the resolver calling a method of a service (controller handlers).
+        Parameter annotations, extractors, pipe metadata and scope checks are worked
+        out here instead of on every call.
+
+        :param key: The service class or token.
+        :param method: The name of the method.
+        :return: The compiled resolver, cached until the container is reset.
+        """
+        cache_key = (key, method)
+        compiled = self._compiled_methods.get(cache_key)
+        if compiled is not None:
+            return compiled
+        service, _ = self._check_service(key)
+        method_to_resolve = getattr(service, method, None)
+        if not method_to_resolve:
+            raise Exception(f"Method {method} not found in {service.__name__} service ")
+        search_scope = self.get_dependency_metadata(service)
+        contextual: list[tuple] = []
+        services: list[tuple] = []
+        for name, param in inspect.signature(method_to_resolve).parameters.items():
+            if name == "self" or param.annotation is inspect.Parameter.empty:
+                continue
+            annotation, dep_key = ContainerHelper.get_type_from_annotation(
+                param.annotation
+            )
+            dep_metadata = dep_key.metadata
+            if dep_metadata.key is not CtxDepKey.Service:
+                pipe_metadata = None
+                param_pipes: tuple = ()
+                if dep_metadata.key in _PIPEABLE_KEYS:
+                    param_pipes = tuple(getattr(dep_metadata, "pipes", None) or ())
+                    pipe_metadata = PipeArgumentMetadata(
+                        type=_PIPE_TYPES[dep_metadata.key],
+                        metatype=annotation if isinstance(annotation, type) else None,
+                        data=dep_metadata.token or name,
+                    )
+                contextual.append(
+                    (
+                        name,
+                        dep_metadata.callback,
+                        inspect.iscoroutinefunction(dep_metadata.callback),
+                        dep_metadata.token,
+                        annotation,
+                        pipe_metadata,
+                        param_pipes,
+                    )
+                )
+            elif dep_metadata.token in search_scope or annotation in search_scope:
+                services.append((name, dep_metadata.token or annotation, None))
+            else:
+                _name: str = (
+                    annotation.__name__ if not isinstance(annotation, str) else annotation
+                )
+                # keep failing at call time, like the uncompiled resolution
+                services.append(
+                    (name, None, f"Service {_name} not found in scope {search_scope}")
+                )
+        compiled = CompiledMethod(
+            self,
+            key,
+            method,
+            inspect.iscoroutinefunction(method_to_resolve),
+            key in self._singleton_classes,
+            tuple(contextual),
+            tuple(services),
+        )
+        self._compiled_methods[cache_key] = compiled
+        return compiled
+
     async def _resolve_method(
         self,
         key: Union[Type, str, object],
@@ -727,6 +926,8 @@ class NestipyContainer:
         :param disable_scope: Disabling scope of search for dependencies.
         :return: The service instance.
         """
+        if method != _INIT and origin is None and not disable_scope:
+            return await self.compile_method(key, method)()
         if method == _INIT and key in self._request_scoped_classes:
             context_container = RequestContextContainer.get_instance()
             cache = context_container.get_request_cache()
@@ -755,3 +956,95 @@ class NestipyContainer:
             if cache is not None:
                 cache[key] = result
         return result
+
+
+class CompiledMethod:
+    """
+    Method of a service with its parameters resolved ahead of time by
+    NestipyContainer.compile_method. Calling it resolves the arguments of the
+    current request and calls the method on the service instance.
+    """
+
+    __slots__ = (
+        "_container",
+        "_key",
+        "_method",
+        "_is_async",
+        "_singleton",
+        "_contextual",
+        "_services",
+        "_instance",
+    )
+
+    def __init__(
+        self,
+        container: NestipyContainer,
+        key: Union[Type, str, object],
+        method: str,
+        is_async: bool,
+        singleton: bool,
+        contextual: tuple,
+        services: tuple,
+    ):
+        self._container = container
+        self._key = key
+        self._method = method
+        self._is_async = is_async
+        self._singleton = singleton
+        self._contextual = contextual
+        self._services = services
+        self._instance: Any = None
+
+    async def resolve_args(self) -> dict:
+        container = self._container
+        args = {}
+        if self._contextual:
+            context_container = RequestContextContainer.get_instance()
+            global_pipes = None
+            for (
+                name,
+                callback,
+                is_async,
+                token,
+                annotation,
+                pipe_metadata,
+                param_pipes,
+            ) in self._contextual:
+                if is_async:
+                    value = await callback(name, token, annotation, context_container)
+                else:
+                    value = callback(name, token, annotation, context_container)
+                if pipe_metadata is not None:
+                    if global_pipes is None:
+                        execution_context = context_container.execution_context
+                        global_pipes = (
+                            execution_context.get_pipes() if execution_context else []
+                        )
+                    pipes = (
+                        [*global_pipes, *param_pipes] if param_pipes else global_pipes
+                    )
+                    if pipes:
+                        value = await container._apply_pipes(
+                            value, pipes, pipe_metadata
+                        )
+                args[name] = value
+        for name, dependency, error in self._services:
+            if error is not None:
+                raise ValueError(error)
+            args[name] = await container.get(dependency)
+        return args
+
+    async def __call__(self) -> Any:
+        container = self._container
+        instance = self._instance
+        # the captured singleton is dropped if the container instance was replaced
+        singletons = container._singleton_instances
+        if instance is None or singletons.get(self._key) is not instance:
+            instance = await container.get(self._key)
+            if self._singleton:
+                self._instance = instance
+        args = await self.resolve_args()
+        bound = getattr(instance, self._method)
+        if self._is_async:
+            return await bound(**args)
+        return bound(**args)
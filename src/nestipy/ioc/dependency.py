@@ -1,8 +1,10 @@
 import inspect
+import sys
 from dataclasses import is_dataclass
-from typing import Any, Type, Optional, cast
+from typing import Any, Callable, Type, Optional, cast, get_origin
 
-from pydantic import BaseModel
+import orjson
+from pydantic import BaseModel, TypeAdapter
 
 from nestipy.metadata import CtxDepKey
 from .annotation import ParamAnnotation, TypeAnnotatedCallable
@@ -111,24 +113,84 @@ def to_valid_value(value: Any, _type_ref: Type):
     """
     if is_dataclass(_type_ref):
         return _type_ref(**value)
-    elif issubclass(_type_ref, BaseModel):
+    elif inspect.isclass(_type_ref) and issubclass(_type_ref, BaseModel):
         return _type_ref(**value)
     return value
 
 
+_FORM_CONTENT_TYPES = ("multipart/form-data", "application/x-www-form-urlencoded")
+_body_decoders: dict[Any, Callable[[bytes], Any]] = {}
+
+
+def _load_json(raw: bytes) -> Any:
+    # same leniency as Request.json(): empty or invalid bodies give {}
+    try:
+        return orjson.loads(raw) if raw else {}
+    except orjson.JSONDecodeError:
+        return {}
+
+
+def _body_decoder(_type_ref: Any) -> Callable[[bytes], Any]:
+    """
+    Build the function turning raw JSON bytes into the annotated type, once per
+    annotation.
+    Pydantic models and generic annotations (list[Model], dict[str, Model], ...)
+    are validated straight from the bytes by a TypeAdapter, msgspec structs are
+    decoded by msgspec, dataclasses and plain types go through orjson.
+    :param _type_ref: The annotation of the body parameter.
+    :return: The decoder.
+    """
+    decoder = _body_decoders.get(_type_ref)
+    if decoder is not None:
+        return decoder
+    msgspec = sys.modules.get("msgspec")
+    if (
+        msgspec is not None
+        and inspect.isclass(_type_ref)
+        and issubclass(_type_ref, msgspec.Struct)
+    ):
+        struct_decoder = msgspec.json.Decoder(_type_ref)
+
+        def decoder(raw: bytes) -> Any:
+            return struct_decoder.decode(raw or b"{}")
+
+    elif (inspect.isclass(_type_ref) and issubclass(_type_ref, BaseModel)) or (
+        get_origin(_type_ref) is not None
+    ):
+        adapter = TypeAdapter(_type_ref)
+
+        def decoder(raw: bytes) -> Any:
+            if not raw:
+                return adapter.validate_python({})
+            return adapter.validate_json(raw)
+
+    elif is_dataclass(_type_ref):
+
+        def decoder(raw: bytes) -> Any:
+            return _type_ref(**_load_json(raw))
+
+    else:
+        decoder = _load_json
+    _body_decoders[_type_ref] = decoder
+    return decoder
+
+
 async def body_callback(
     _name: str,
     _token: Optional[str],
     _type_ref: Type,
     _request_context: RequestContextContainer,
 ):
-    """Callback to retrieve and parse the request body."""
+    """
+    Callback to retrieve and parse the request body.
+    The Content-Type header picks the parser: form bodies are parsed as form data,
+    any other body is decoded from its raw bytes in a single pass.
+    """
     req = cast(Any, _request_context.execution_context).get_request()
-    form_data = await req.form()
-    if bool(form_data):
-        return to_valid_value(form_data, _type_ref)
-    else:
-        return to_valid_value(await req.json(), _type_ref)
+    media_type = req.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    if media_type in _FORM_CONTENT_TYPES:
+        return to_valid_value(await req.form(), _type_ref)
+    return _body_decoder(_type_ref)(await req.body())
 
 
 def _get_request_param_value(
@@ -0,0 +1,103 @@
+import inspect
+from typing import Any, Optional, Type, Union, TYPE_CHECKING
+
+from nestipy.metadata import ClassMetadata, Reflect
+
+if TYPE_CHECKING:
+    from .container import NestipyContainer
+
+_MISSING = object()
+
+
+class EnhancerScopeRegistry:
+    """
+    Registry that binds enhancers (guards, pipes, interceptors, filters) to the DI
+    scope of the controller they decorate, and caches their singleton instances per
+    (enhancer, controller) pair so request handling only does dictionary reads.
+    """
+
+    Borrowed = "__enhancer_borrowed_scope__"
+
+    _instance: Union["EnhancerScopeRegistry", None] = None
+    _bound: set = set()
+    _scoped: set = set()
+    _instances: dict = {}
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(EnhancerScopeRegistry, cls).__new__(
+                cls, *args, **kwargs
+            )
+        return cls._instance
+
+    @classmethod
+    def get_instance(cls, *args, **kwargs):
+        return EnhancerScopeRegistry(*args, **kwargs)
+
+    @classmethod
+    def clear(cls):
+        """
+        Forget every binding and cached instance.
+        Called when the NestipyContainer is cleared.
+        """
+        cls._instance = None
+        cls._bound = set()
+        cls._scoped = set()
+        cls._instances = {}
+
+    @staticmethod
+    def _container() -> "NestipyContainer":
+        from .container import NestipyContainer
+
+        return NestipyContainer.get_instance()
+
+    def bind(self, enhancer: Union[Type, object], class_handler: Optional[Any]) -> None:
+        """
+        Give an enhancer class the DI scope of the controller it runs for.
+        An enhancer that has its own scope (registered as a module provider) keeps it;
+        otherwise it borrows the scope of the first controller it is bound to. This runs
+        once per pair, so concurrent requests never rewrite the enhancer's metadata.
+        :param enhancer: The guard, pipe, interceptor or filter.
+        :param class_handler: The controller class (or handler) the enhancer applies to.
+        """
+        key = (enhancer, class_handler)
+        if key in self._bound:
+            return
+        self._bound.add(key)
+        if not inspect.isclass(enhancer) or enhancer in self._scoped:
+            return
+        self._scoped.add(enhancer)
+        own_scope = Reflect.get_metadata(enhancer, ClassMetadata.Metadata, None)
+        if own_scope is not None and not Reflect.get_metadata(
+            enhancer, self.Borrowed, False
+        ):
+            return
+        container = self._container()
+        metadata = Reflect.get_metadata(class_handler, ClassMetadata.Metadata, None)
+        if not isinstance(metadata, ClassMetadata):
+            metadata = ClassMetadata(
+                class_handler, global_providers=container.get_all_services()
+            )
+        Reflect.set_metadata(enhancer, ClassMetadata.Metadata, metadata)
+        Reflect.set_metadata(enhancer, self.Borrowed, True)
+        container.reset_dependency_metadata(enhancer)
+
+    async def get(self, enhancer: Union[Type, object], class_handler: Optional[Any]):
+        """
+        Resolve an enhancer instance for a controller.
+        Singleton enhancers are resolved once and then served from the cache; request
+        and transient scoped enhancers are resolved through the container every time.
+        :param enhancer: The enhancer class.
+        :param class_handler: The controller class (or handler) the enhancer applies to.
+        :return: The enhancer instance.
+        """
+        key = (enhancer, class_handler)
+        instance = self._instances.get(key, _MISSING)
+        if instance is not _MISSING:
+            return instance
+        self.bind(enhancer, class_handler)
+        container = self._container()
+        instance = await container.get(enhancer)
+        if container.is_singleton(enhancer):
+            self._instances[key] = instance
+        return instance
@@ -8,6 +8,10 @@ class NestipyIContainer(Protocol):
 
     def add_singleton(self, service: Type): ...
 
+    def get_all_services(self) -> list: ...
+
+    def is_singleton(self, service: Union[Type, str, object]) -> bool: ...
+
     def add_singleton_instance(
         self, service: Union[Type, str], service_instance: object
     ): ...
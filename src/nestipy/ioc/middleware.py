@@ -92,6 +92,45 @@ def _path_to_regex(path: str) -> Pattern[str]:
     return re.compile("^" + body + "$")
 
 
+_TEMPLATE_PARAM = re.compile(r"^\{(\w+)(?::(\w+))?\}$")
+_PARAM = object()
+_PATH_PARAM = object()
+_PROBE = "\x00"
+
+
+def _template_segments(template: str) -> list:
+    segments: list = []
+    for seg in _normalize_path(template).strip("/").split("/"):
+        param = _TEMPLATE_PARAM.match(seg)
+        if param is None:
+            segments.append(seg)
+        elif param.group(2) == "path":
+            segments.append(_PATH_PARAM)
+        else:
+            segments.append(_PARAM)
+    return segments
+
+
+def _is_static_for_template(pattern: str, segments: list) -> bool:
+    """
+    Tell whether a middleware path pattern gives the same answer for every concrete
+    path of a route template, so the match can be decided once for the template.
+    """
+    pattern_segments = [s for s in _normalize_path(pattern).strip("/").split("/") if s]
+    for idx, seg in enumerate(pattern_segments):
+        if "*" in seg:
+            # a trailing bare wildcard matches everything after it
+            return seg == "*" and idx == len(pattern_segments) - 1
+        if idx >= len(segments):
+            return True
+        target = segments[idx]
+        if target is _PATH_PARAM:
+            return False
+        if target is _PARAM and not seg.startswith(":"):
+            return False
+    return True
+
+
 class MiddlewareProxy:
     """
     Proxy class for configuring middleware.
@@ -194,6 +233,8 @@ class MiddlewareContainer:
     _registry: list[_MiddlewareEntry] = []
     _match_cache: "OrderedDict[tuple[str, str], list[_MiddlewareEntry]]" = OrderedDict()
     _match_cache_size: int = 1024
+    _route_cache: dict[tuple[str, str], Optional[list[_MiddlewareEntry]]] = {}
+    _bound_callables: dict = {}
 
     def __new__(cls, *args, **kwargs):
         """
@@ -277,6 +318,8 @@ class MiddlewareContainer:
         self._registry = entries
         self._registry_dirty = False
         self._match_cache.clear()
+        self._route_cache = {}
+        self._bound_callables = {}
 
     def match(self, path: str, method: str) -> list[_MiddlewareEntry]:
         self._build_registry()
@@ -299,6 +342,55 @@ class MiddlewareContainer:
             self._match_cache.popitem(last=False)
         return matched
 
+    def match_route(
+        self, template: str, method: str
+    ) -> Optional[list[_MiddlewareEntry]]:
+        """
+        Match middleware against a registered route template (e.g. /users/{id}) once.
+        :param template: The route path template.
+        :param method: The HTTP method.
+        :return: The matching entries, or None when the answer depends on the concrete
+            path (path params against literal patterns, mid-path wildcards) and the
+            caller must fall back to match().
+        """
+        self._build_registry()
+        method_upper = (method or "").upper()
+        key = (method_upper, template)
+        if key in self._route_cache:
+            return self._route_cache[key]
+        segments = _template_segments(template)
+        probe = "/" + "/".join(
+            _PROBE if s is _PARAM or s is _PATH_PARAM else s for s in segments
+        )
+        matched: Optional[list[_MiddlewareEntry]] = []
+        for entry in self._registry:
+            if not _method_match(entry.route.method, method_upper):
+                continue
+            patterns = [entry.route.url] + [
+                ex.path
+                for ex in entry.excludes
+                if _method_match(ex.method, method_upper)
+            ]
+            if not all(_is_static_for_template(p, segments) for p in patterns):
+                matched = None
+                break
+            if not entry.include_regex.match(probe):
+                continue
+            if _is_excluded(entry, probe, method_upper):
+                continue
+            matched.append(entry)
+        self._route_cache[key] = matched
+        return matched
+
+    def get_bound_callable(self, middleware: Union[Type, Callable]) -> Optional[Callable]:
+        return self._bound_callables.get(middleware)
+
+    def bind_callable(self, middleware: Union[Type, Callable], use: Callable) -> None:
+        """
+        Keep the resolved `use` callable of a middleware so the chain is only built once.
+        """
+        self._bound_callables[middleware] = use
+
 
 def _method_match(methods: list[HTTPMethod], method: str) -> bool:
     if "ALL" in methods or "ANY" in methods:
@@ -15,6 +15,7 @@ from .client import (
 )
 from .client.option import (
     RedisClientOption,
+    RedisStreamOption,
     MqttClientOption,
     NatsClientOption,
     RabbitMQQueueOption,
@@ -27,7 +28,14 @@ from .context import RpcResponse, RpcRequest
 from .decorator import MessagePattern, EventPattern
 from .dependency import Payload, Ctx, Headers, Pattern, Client, Context
 from .exception import RpcException, RpcExceptionFilter, RPCErrorMessage, RPCErrorCode
-from .serializer import JSONSerializer
+from .serializer import (
+    Serializer,
+    JSONSerializer,
+    BytesSerializer,
+    OrjsonSerializer,
+    MsgpackSerializer,
+    register_serializer,
+)
 from .server import MicroServiceServer
 
 __all__ = [
@@ -43,6 +51,7 @@ __all__ = [
     "MicroserviceOption",
     "TCPClientOption",
     "RedisClientOption",
+    "RedisStreamOption",
     "MqttClientOption",
     "RabbitMQQueueOption",
     "RabbitMQClientOption",
@@ -65,5 +74,10 @@ __all__ = [
     "RPCErrorMessage",
     "RPCErrorCode",
     "ClientModuleFactory",
+    "Serializer",
     "JSONSerializer",
+    "BytesSerializer",
+    "OrjsonSerializer",
+    "MsgpackSerializer",
+    "register_serializer",
 ]
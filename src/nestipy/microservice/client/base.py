@@ -1,14 +1,25 @@
 import asyncio
 import uuid
 from abc import ABC, abstractmethod
-from dataclasses import asdict
 from dataclasses import field, dataclass
-from typing import AsyncIterator, Any, Union, cast
+from typing import AsyncIterator, Any, Awaitable, Callable, Union
 from typing import Optional
 
-from nestipy.microservice.context import RpcRequest, RpcResponse, MICROSERVICE_CHANNEL
+from nestipy.common.logger import logger
+from nestipy.microservice.context import (
+    CORRELATION_ID_HEADER,
+    MICROSERVICE_CHANNEL,
+    RpcRequest,
+    RpcResponse,
+)
 from nestipy.microservice.exception import RpcException, RPCErrorMessage, RPCErrorCode
-from nestipy.microservice.serializer import Serializer, JSONSerializer
+from nestipy.microservice.serializer import (
+    ACCEPT_HEADER,
+    JSONSerializer,
+    Serializer,
+    accept_header,
+    detect_serializer,
+)
 from .option import RabbitMQClientOption, TCPClientOption, GrpcClientOption
 from .option import RedisClientOption, MqttClientOption, NatsClientOption
 from .option import Transport
@@ -32,8 +43,17 @@ class MicroserviceOption:
     channel_key: str = field(default="nestipy")
     timeout: int = 30
     keep_alive: bool = True
+    max_in_flight: int = 64
+    pattern_concurrency: dict[str, int] = field(default_factory=dict)
+    drain_timeout: Optional[float] = 30
+    multiplex_replies: bool = True
 
     def __post_init__(self):
+        if self.serializer.binary and self.transport in (Transport.TCP, Transport.GRPC):
+            raise ValueError(
+                f"{type(self.serializer).__name__} needs a binary-safe transport, "
+                f"{self.transport.value} frames text payloads"
+            )
         if (
             self.transport == Transport.TCP
             and self.option is not None
@@ -87,6 +107,9 @@ class ClientProxy(ABC):
     def __init__(self, option: MicroserviceOption):
         self.option = option
         self._connected: bool = False
+        self._reply_topic = uuid.uuid4().hex
+        self._reply_task: Optional[asyncio.Task] = None
+        self._pending: dict[str, asyncio.Future] = {}
 
     @abstractmethod
     async def slave(self) -> "ClientProxy":
@@ -114,6 +137,19 @@ class ClientProxy(ABC):
     async def send_response(self, topic, data):
         pass
 
+    async def subscribe_all(self, channel: str) -> None:
+        """
+        Subscribe to a broadcast channel, every subscriber receiving each message
+        instead of competing for it. Messages are read with listen().
+        Transports whose subscribers share the messages of a topic (queue groups,
+        named queues) override it, with publish_all().
+        """
+        await self.subscribe(channel)
+
+    async def publish_all(self, channel: str, data: Union[str, bytes]) -> None:
+        """Publish a message to the subscribers of a broadcast channel."""
+        await self._publish(channel, data)
+
     async def before_start(self):
         await asyncio.sleep(0.001)
 
@@ -127,19 +163,21 @@ class ClientProxy(ABC):
     async def send(
         self, topic, data: Any, headers: Optional[dict[str, str]] = None
     ) -> RpcResponse:
+        if self.option.keep_alive and self.option.multiplex_replies:
+            return await self._send_multiplexed(topic, data, headers)
         await self.ensure_connected()
         response_topic = uuid.uuid4().hex
         request = RpcRequest(
             pattern=topic,
             data=data,
             response_topic=response_topic,
-            headers=headers or {},
+            headers=self._request_headers(headers),
         )
         response_channel = f"{MICROSERVICE_CHANNEL}:response:{request.response_topic}"
         await self.subscribe(response_channel)
         await self._publish(
             f"{MICROSERVICE_CHANNEL}:{self.option.channel_key}",
-            await self.option.serializer.serialize(asdict(request)),
+            await self.option.serializer.encode_request(request),
         )
         #  add timeout
         try:
@@ -155,15 +193,136 @@ class ClientProxy(ABC):
         await self.unsubscribe(response_channel)
         if not self.option.keep_alive:
             await self.close()
-        json_rep = await self.option.serializer.deserialize(rpc_response)
-        response = cast(Any, RpcResponse).from_dict(json_rep)
+        response = await self._decode_response(rpc_response)
+        if response.exception:
+            raise response.exception
+        return response
+
+    async def _send_multiplexed(
+        self, topic, data: Any, headers: Optional[dict[str, str]] = None
+    ) -> RpcResponse:
+        """
+        Send a request whose reply comes back on the long-lived reply channel of this
+        client, matched to the caller by a correlation id.
+        """
+        await self.ensure_connected()
+        await self._ensure_reply_listener()
+        correlation_id = uuid.uuid4().hex
+        request = RpcRequest(
+            pattern=topic,
+            data=data,
+            response_topic=self._reply_topic,
+            headers={
+                **self._request_headers(headers),
+                CORRELATION_ID_HEADER: correlation_id,
+            },
+        )
+        future = asyncio.get_running_loop().create_future()
+        self._pending[correlation_id] = future
+        try:
+            await self._publish(
+                f"{MICROSERVICE_CHANNEL}:{self.option.channel_key}",
+                await self.option.serializer.encode_request(request),
+            )
+            async with asyncio.timeout(self.option.timeout):
+                response = await future
+        except asyncio.TimeoutError:
+            raise RpcException(
+                status_code=RPCErrorCode.DEADLINE_EXCEEDED,
+                message=RPCErrorMessage.DEADLINE_EXCEEDED,
+            )
+        finally:
+            self._pending.pop(correlation_id, None)
         if response.exception:
             raise response.exception
         return response
 
+    async def _ensure_reply_listener(self) -> None:
+        if self._reply_task is not None and not self._reply_task.done():
+            return
+        channel = f"{MICROSERVICE_CHANNEL}:response:{self._reply_topic}"
+        await self.subscribe_replies(channel)
+        self._reply_task = asyncio.create_task(self._read_replies(channel))
+
+    async def subscribe_replies(self, channel: str) -> None:
+        """
+        Subscribe to the reply channel of this client. The subscription must be
+        in place when this returns, requests being published right after.
+        """
+        await self.subscribe(channel)
+
+    async def _read_replies(self, channel: str) -> None:
+        error: Optional[BaseException] = None
+        try:
+            async for payload in self.listen_replies(channel):
+                try:
+                    response = await self._decode_response(payload)
+                except Exception as e:
+                    logger.warning("Invalid RPC reply on %s: %s", channel, e)
+                    continue
+                if response.status not in ("success", "error"):
+                    # not a reply, like a request echoed by the broker
+                    continue
+                correlation_id = (response.headers or {}).get(CORRELATION_ID_HEADER)
+                future = self._pending.pop(correlation_id, None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+            logger.error("RPC reply listener on %s stopped: %s", channel, e)
+        finally:
+            self._fail_pending(error)
+
+    def _fail_pending(self, error: Optional[BaseException] = None) -> None:
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(
+                    RpcException(
+                        status_code=RPCErrorCode.UNAVAILABLE,
+                        message=str(error) if error else RPCErrorMessage.UNAVAILABLE,
+                    )
+                )
+
+    async def listen_replies(self, channel: str) -> AsyncIterator[str]:
+        """
+        Replies received on the reply channel of this client, already subscribed.
+        The default reads them one by one with listen_response(); transports whose
+        listen_response() subscribes on each call override it.
+        """
+        while True:
+            payload = await self.listen_response(channel, self.option.timeout)
+            if not payload:
+                return
+            yield payload
+
+    def _request_headers(self, headers: Optional[dict[str, str]]) -> dict[str, str]:
+        accept = accept_header(self.option.serializer)
+        if accept is None:
+            return headers or {}
+        return {ACCEPT_HEADER: accept, **(headers or {})}
+
+    async def _decode_response(self, payload: Union[str, bytes]) -> RpcResponse:
+        serializer = detect_serializer(payload, self.option.serializer)
+        return await serializer.decode_response(payload)
+
+    def _payload_bytes(self, data: Union[str, bytes]) -> bytes:
+        return data if isinstance(data, bytes) else data.encode("utf-8")
+
+    def _payload_from_bytes(self, raw: bytes) -> Union[str, bytes]:
+        """
+        Received payload as given to the serializers: built-in serializers detect the
+        format from the raw bytes, custom ones keep receiving text.
+        """
+        if self.option.serializer.content_type is None:
+            return raw.decode("utf-8")
+        return raw
+
     async def emit(self, topic, data, headers: Optional[dict[str, str]] = None):
         request = RpcRequest(pattern=topic, data=data, headers=headers or {})
-        json_req = await self.option.serializer.serialize(asdict(request))
+        json_req = await self.option.serializer.encode_request(request)
         await self._publish(
             f"{MICROSERVICE_CHANNEL}:{self.option.channel_key}", json_req
         )
@@ -174,11 +333,22 @@ class ClientProxy(ABC):
     def listen(self) -> AsyncIterator[str]:
         pass
 
+    def take_ack(self) -> Optional[Callable[[], Awaitable]]:
+        """
+        Acknowledgement of the message last yielded by listen(), called by the server
+        once the message is handled. None for transports without acknowledgement.
+        """
+        return None
+
     @abstractmethod
     async def listen_response(self, from_topic: str, timeout: int = 30) -> str:
         pass
 
     async def close(self):
+        if self._reply_task is not None:
+            self._reply_task.cancel()
+            self._reply_task = None
+            self._fail_pending()
         if not self._connected:
             return
         await self._close()
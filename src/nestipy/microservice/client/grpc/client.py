@@ -48,6 +48,8 @@ class GrpcClientProxy(ClientProxy):
 
     async def _publish(self, topic, data):
         """Publish data"""
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
         request = pb2.DataRequest(topic=topic, data=data)
         if self.stub:
             await self.stub.SendData(request)
@@ -76,6 +78,13 @@ class GrpcClientProxy(ClientProxy):
             )
         return ""
 
+    async def listen_replies(self, channel: str) -> AsyncIterator[str]:
+        """Read replies of the already subscribed reply channel, without deadline."""
+        if self.subscription:
+            async for response in self.subscription:
+                if response.topic == channel:
+                    yield response.data
+
     async def listen(self) -> AsyncIterator[str]:
         """Continuously listen for incoming responses."""
         if self.subscription:
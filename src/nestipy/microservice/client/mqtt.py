@@ -43,12 +43,12 @@ class MqttClientProxy(ClientProxy):
 
     async def listen(self) -> AsyncIterator[str]:
         async for message in self.client.messages:
-            yield message.payload.decode("utf-8")
+            yield self._payload_from_bytes(message.payload)
         await asyncio.sleep(0.01)
 
     async def listen_response(self, from_topic: str, timeout: int = 30) -> Any:
         async for message in self.client.messages:
-            return message.payload.decode("utf-8")
+            return self._payload_from_bytes(message.payload)
         await asyncio.sleep(0.01)
 
     async def _close(self):
@@ -31,11 +31,15 @@ class NatsClientProxy(ClientProxy):
         self.client = await nats.connect(**asdict(_option))
 
     async def _publish(self, topic: str, data: str):
-        await self.client.publish(topic, data.encode())
+        await self.client.publish(topic, self._payload_bytes(data))
 
     async def subscribe(self, *args, **kwargs):
         self.consumer = await self.client.subscribe(*args, **kwargs, queue=NATS_QUEUE)
 
+    async def subscribe_all(self, channel: str) -> None:
+        # no queue group, each subscriber gets every message
+        self.consumer = await self.client.subscribe(channel)
+
     async def unsubscribe(self, *args):
         await self.consumer.unsubscribe()
 
@@ -45,13 +49,13 @@ class NatsClientProxy(ClientProxy):
     async def listen(self) -> AsyncIterator[str]:
         while True:
             async for msg in self.consumer.messages:
-                yield msg.data.decode("utf-8")
+                yield self._payload_from_bytes(msg.data)
             await asyncio.sleep(0.01)
 
     async def listen_response(self, from_topic: str, timeout: int = 30) -> str:
         while True:
             async for msg in self.consumer.messages:
-                return msg.data.decode("utf-8")
+                return self._payload_from_bytes(msg.data)
             await asyncio.sleep(0.01)
 
     async def _close(self):
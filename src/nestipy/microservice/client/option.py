@@ -54,6 +54,32 @@ class GrpcClientOption:
     verbose: bool = field(default=True)
 
 
+@dataclass
+class RedisStreamOption:
+    """
+    Deliver requests and events through a Redis stream read by a consumer group,
+    so that each message goes to one worker and is acknowledged once handled.
+    A message whose handler fails is not acknowledged and is claimed again.
+    Replies still use pub/sub.
+    """
+
+    group: str = field(default="nestipy")
+    # defaults to a name unique to the process
+    consumer: Optional[str] = None
+    count: int = 16
+    block_ms: int = 5000
+    # approximate stream length kept by XADD, None to keep everything
+    maxlen: Optional[int] = 10000
+    # pending messages idle for longer (failed, or of dead consumers) are claimed
+    # and delivered again, None to disable
+    claim_idle_ms: Optional[int] = 60000
+    # deliveries after which a claimed message is moved to the dead-letter stream,
+    # None to deliver it again forever
+    max_deliveries: Optional[int] = 5
+    # defaults to "<stream>:dead"
+    dead_letter_stream: Optional[str] = None
+
+
 @dataclass
 class RedisClientOption:
     host: str = field(default="127.0.0.1")
@@ -92,6 +118,7 @@ class RedisClientOption:
     redis_connect_func = None
     credential_provider: Optional[CredentialProvider] = None
     protocol: Optional[int] = 2
+    stream: Optional[RedisStreamOption] = None
 
 
 @dataclass
@@ -1,7 +1,8 @@
 import asyncio
+import collections
 import typing
 from dataclasses import asdict
-from typing import AsyncIterator, Union, cast
+from typing import AsyncIterator, Optional, Union, cast
 
 import async_timeout
 from aio_pika import connect_robust, Message, ExchangeType
@@ -18,9 +19,34 @@ class RabbitMQClientProxy(ClientProxy):
     exchange: AbstractRobustExchange
     consumer_queue: Union[AbstractRobustQueue, None]
     CHANGE = "microservice:exchange"
+    # response exchanges kept declared, of the most recent reply topics
+    RESPONSE_EXCHANGES = 1024
 
     def __init__(self, option: MicroserviceOption):
         super().__init__(option)
+        self._reply_exchange: Optional[AbstractRobustExchange] = None
+        self._reply_queue: Optional[AbstractRobustQueue] = None
+        self._consumer_exchange: Optional[AbstractRobustExchange] = None
+        self._broadcast_exchanges: dict[str, AbstractRobustExchange] = {}
+        # reply topics are stable per client, declare their exchange once
+        self._response_exchanges: collections.OrderedDict[
+            str, AbstractRobustExchange
+        ] = collections.OrderedDict()
+
+    def _response_exchange_name(self, topic: str) -> str:
+        option = cast(Optional[RabbitMQClientOption], self.option.option)
+        name = option.queue_option.name if option is not None else None
+        return f"{name or self.CHANGE}:{topic}"
+
+    async def _broadcast_exchange(self, channel: str) -> AbstractRobustExchange:
+        exchange = self._broadcast_exchanges.get(channel)
+        if exchange is None:
+            exchange = await self.channel.declare_exchange(
+                self._response_exchange_name(f"broadcast:{channel}"),
+                ExchangeType.FANOUT,
+            )
+            self._broadcast_exchanges[channel] = exchange
+        return exchange
 
     async def slave(self) -> "ClientProxy":
         return RabbitMQClientProxy(
@@ -33,6 +59,8 @@ class RabbitMQClientProxy(ClientProxy):
         )
         self.connection = await connect_robust(**asdict(option))
         self.channel = cast(AbstractRobustChannel, await self.connection.channel())
+        self._response_exchanges.clear()
+        self._broadcast_exchanges.clear()
         await self.channel.__aenter__()
         self.exchange = await self.channel.declare_exchange(
             option.queue_option.name or self.CHANGE,
@@ -40,24 +68,48 @@ class RabbitMQClientProxy(ClientProxy):
             **asdict(option.queue_option),
         )
 
-    async def _publish(self, topic: str, data: str):
-        await self.exchange.publish(Message(body=data.encode()), routing_key=topic)
+    async def _publish(self, topic: str, data: Union[str, bytes]):
+        await self.exchange.publish(
+            Message(body=self._payload_bytes(data)), routing_key=topic
+        )
 
-    async def send_response(self, topic: str, data: str):
-        option = cast(RabbitMQClientOption, self.option.option)
-        response_exchange = await self.channel.declare_exchange(
-            f"{option.queue_option.name or self.CHANGE}:{topic}",
-            ExchangeType.FANOUT,
+    async def send_response(self, topic: str, data: Union[str, bytes]):
+        response_exchange = self._response_exchanges.get(topic)
+        if response_exchange is None:
+            response_exchange = await self.channel.declare_exchange(
+                self._response_exchange_name(topic), ExchangeType.FANOUT
+            )
+            self._response_exchanges[topic] = response_exchange
+            if len(self._response_exchanges) > self.RESPONSE_EXCHANGES:
+                self._response_exchanges.popitem(last=False)
+        else:
+            self._response_exchanges.move_to_end(topic)
+        await response_exchange.publish(
+            Message(body=self._payload_bytes(data)), routing_key=topic
         )
-        await response_exchange.publish(Message(body=data.encode()), routing_key=topic)
 
     async def subscribe(self, *args, **kwargs):
         self.consumer_queue = await self.channel.declare_queue(*args)
+        self._consumer_exchange = self.exchange
         await self.consumer_queue.bind(self.exchange)
 
+    async def subscribe_all(self, channel: str) -> None:
+        exchange = await self._broadcast_exchange(channel)
+        # a queue of this subscriber alone: subscribers sharing a named queue
+        # would compete for the messages instead of each getting all of them
+        self.consumer_queue = await self.channel.declare_queue(exclusive=True)
+        self._consumer_exchange = exchange
+        await self.consumer_queue.bind(exchange)
+
+    async def publish_all(self, channel: str, data: Union[str, bytes]) -> None:
+        exchange = await self._broadcast_exchange(channel)
+        await exchange.publish(
+            Message(body=self._payload_bytes(data)), routing_key=channel
+        )
+
     async def unsubscribe(self, *args):
         if self.consumer_queue is not None:
-            await self.consumer_queue.unbind(self.exchange)
+            await self.consumer_queue.unbind(self._consumer_exchange or self.exchange)
             await self.consumer_queue.delete()
 
     async def listen(self) -> AsyncIterator[str]:
@@ -66,11 +118,11 @@ class RabbitMQClientProxy(ClientProxy):
                 async for message in queue_iter:
                     async with message.process():
                         msg = cast(Message, message)
-                        yield msg.body.decode("utf-8")
+                        yield self._payload_from_bytes(msg.body)
 
     async def listen_response(self, from_topic: str, timeout: int = 30) -> str:
         response_exchange = await self.channel.declare_exchange(
-            f"{self.CHANGE}:{from_topic}", ExchangeType.FANOUT
+            self._response_exchange_name(from_topic), ExchangeType.FANOUT
         )
         response_queue = await self.channel.declare_queue(from_topic)
         await response_queue.bind(response_exchange)
@@ -81,7 +133,7 @@ class RabbitMQClientProxy(ClientProxy):
                         async with message.process():
                             msg = cast(Message, message)
                             if message.routing_key == from_topic:
-                                res = msg.body.decode("utf-8")
+                                res = self._payload_from_bytes(msg.body)
                                 break
 
         except asyncio.TimeoutError as e:
@@ -92,6 +144,33 @@ class RabbitMQClientProxy(ClientProxy):
             await response_exchange.delete()
         return res
 
+    async def subscribe_replies(self, channel: str) -> None:
+        self._reply_exchange = await self.channel.declare_exchange(
+            self._response_exchange_name(channel), ExchangeType.FANOUT
+        )
+        # a queue of this client alone, bound to its replies only: bound to the
+        # request exchange, it would also receive the requests of this client
+        self._reply_queue = await self.channel.declare_queue(exclusive=True)
+        await self._reply_queue.bind(self._reply_exchange)
+
+    async def listen_replies(self, channel: str) -> AsyncIterator[str]:
+        queue, exchange = self._reply_queue, self._reply_exchange
+        if queue is None or exchange is None:
+            return
+        try:
+            async with queue.iterator() as queue_iter:
+                async for message in queue_iter:
+                    async with message.process():
+                        if message.routing_key != channel:
+                            continue
+                        yield self._payload_from_bytes(cast(Message, message).body)
+        finally:
+            self._reply_queue = None
+            self._reply_exchange = None
+            await queue.unbind(exchange)
+            await queue.delete()
+            await exchange.delete()
+
     async def _close(self):
         await self.channel.__aexit__(None, None, None)
         await self.connection.close()
@@ -1,20 +1,40 @@
-import asyncio
+import os
+import time
 import typing
+import uuid
 from dataclasses import asdict
-from typing import AsyncIterator
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
 from redis.asyncio import Redis, client
+from redis.exceptions import ResponseError
 
+from nestipy.common.logger import logger
+from nestipy.microservice.context import MICROSERVICE_CHANNEL
 from .base import ClientProxy, MicroserviceOption
-from .option import RedisClientOption
+from .option import RedisClientOption, RedisStreamOption
+
+STREAM_FIELD = "d"
 
 
 class RedisClientProxy(ClientProxy):
     broker: Redis
     pub_sub: client.PubSub
+    # seconds a blocking pub/sub read waits before checking the connection again
+    LISTEN_TIMEOUT = 1.0
 
     def __init__(self, option: MicroserviceOption):
         super().__init__(option)
+        redis_option = typing.cast(
+            RedisClientOption, self.option.option or RedisClientOption()
+        )
+        self._stream_option: Optional[RedisStreamOption] = redis_option.stream
+        self._consumer = (
+            self._stream_option.consumer
+            if self._stream_option and self._stream_option.consumer
+            else f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+        self._streams: list[str] = []
+        self._last_ack: Optional[Callable[[], Awaitable]] = None
 
     async def _connect(self):
         option = typing.cast(
@@ -22,23 +42,133 @@ class RedisClientProxy(ClientProxy):
         )
         # url = f"redis://{option.host}:{option.port}"
         # self.broker = Redis.from_url(url, max_connections=10, decode_responses=True)
-        self.broker = Redis(**asdict(option))
+        kwargs = asdict(option)
+        kwargs.pop("stream", None)
+        self.broker = Redis(**kwargs)
         self.pub_sub = self.broker.pubsub()
         await self.pub_sub.connect()
 
+    def _is_stream(self, topic: str) -> bool:
+        return self._stream_option is not None and not topic.startswith(
+            f"{MICROSERVICE_CHANNEL}:response:"
+        )
+
     async def _publish(self, topic, data):
-        await self.broker.publish(topic, data)
+        if self._is_stream(topic):
+            stream_option = typing.cast(RedisStreamOption, self._stream_option)
+            await self.broker.xadd(
+                topic, {STREAM_FIELD: data}, maxlen=stream_option.maxlen
+            )
+        else:
+            await self.broker.publish(topic, data)
 
     async def send_response(self, topic, data):
         await self._publish(topic, data)
 
     async def listen(self) -> AsyncIterator[str]:
+        if self._streams:
+            async for payload in self._listen_streams():
+                yield payload
+            return
         while True:
-            message = await self.pub_sub.get_message(ignore_subscribe_messages=True)
-            if message is not None:
-                if message["type"] == "message":
-                    yield message["data"]
-            await asyncio.sleep(0.01)
+            message = await self.pub_sub.get_message(
+                ignore_subscribe_messages=True, timeout=self.LISTEN_TIMEOUT
+            )
+            if message is not None and message["type"] == "message":
+                yield message["data"]
+
+    async def _listen_streams(self) -> AsyncIterator[str]:
+        stream_option = typing.cast(RedisStreamOption, self._stream_option)
+        last_claim = 0.0
+        while True:
+            entries: list[tuple[str, str, dict]] = []
+            if (
+                stream_option.claim_idle_ms is not None
+                and time.monotonic() - last_claim >= stream_option.claim_idle_ms / 1000
+            ):
+                last_claim = time.monotonic()
+                entries.extend(await self._claim_stale(stream_option))
+            if not entries:
+                response = await self.broker.xreadgroup(
+                    stream_option.group,
+                    self._consumer,
+                    {stream: ">" for stream in self._streams},
+                    count=stream_option.count,
+                    block=stream_option.block_ms,
+                )
+                for stream, messages in _stream_items(response):
+                    entries.extend(
+                        (stream, msg_id, fields) for msg_id, fields in messages
+                    )
+            for stream, msg_id, fields in entries:
+                payload = fields.get(STREAM_FIELD, fields.get(STREAM_FIELD.encode()))
+                ack = self._acknowledger(stream, msg_id)
+                if payload is None:
+                    await ack()
+                    continue
+                self._last_ack = ack
+                yield payload
+
+    async def _claim_stale(self, stream_option: RedisStreamOption) -> list:
+        entries = []
+        for stream in self._streams:
+            result = await self.broker.xautoclaim(
+                stream,
+                stream_option.group,
+                self._consumer,
+                stream_option.claim_idle_ms,
+                count=stream_option.count,
+            )
+            for msg_id, fields in result[1]:
+                if not fields:
+                    continue
+                if await self._exhausted(stream, msg_id, stream_option):
+                    await self._dead_letter(stream, msg_id, fields, stream_option)
+                    continue
+                entries.append((stream, msg_id, fields))
+        return entries
+
+    async def _exhausted(
+        self, stream: str, msg_id: str, stream_option: RedisStreamOption
+    ) -> bool:
+        if stream_option.max_deliveries is None:
+            return False
+        pending = await self.broker.xpending_range(
+            stream, stream_option.group, min=msg_id, max=msg_id, count=1
+        )
+        return bool(pending) and (
+            pending[0]["times_delivered"] > stream_option.max_deliveries
+        )
+
+    async def _dead_letter(
+        self, stream: str, msg_id: str, fields: dict, stream_option: RedisStreamOption
+    ):
+        dead_letter_stream = stream_option.dead_letter_stream or f"{stream}:dead"
+        await self.broker.xadd(
+            dead_letter_stream,
+            {**fields, "stream": stream, "id": msg_id},
+            maxlen=stream_option.maxlen,
+        )
+        await self.broker.xack(stream, stream_option.group, msg_id)
+        logger.warning(
+            "Message %s of %s moved to %s after %s deliveries",
+            msg_id,
+            stream,
+            dead_letter_stream,
+            stream_option.max_deliveries,
+        )
+
+    def _acknowledger(self, stream: str, msg_id: str) -> Callable[[], Awaitable]:
+        stream_option = typing.cast(RedisStreamOption, self._stream_option)
+
+        async def ack():
+            await self.broker.xack(stream, stream_option.group, msg_id)
+
+        return ack
+
+    def take_ack(self) -> Optional[Callable[[], Awaitable]]:
+        ack, self._last_ack = self._last_ack, None
+        return ack
 
     async def listen_response(self, from_topic: str, timeout: int = 30) -> str:
         async for message in self.pub_sub.listen():
@@ -53,10 +183,41 @@ class RedisClientProxy(ClientProxy):
         await self.broker.close()
 
     async def subscribe(self, *args, **kwargs):
+        if args and self._is_stream(args[0]):
+            stream_option = typing.cast(RedisStreamOption, self._stream_option)
+            try:
+                await self.broker.xgroup_create(
+                    args[0], stream_option.group, id="$", mkstream=True
+                )
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+            if args[0] not in self._streams:
+                self._streams.append(args[0])
+            return
         await self.pub_sub.subscribe(*args, **kwargs)
 
+    async def subscribe_all(self, channel: str) -> None:
+        # pub/sub even with streams configured, stream groups share messages out
+        await self.pub_sub.subscribe(channel)
+
+    async def publish_all(self, channel: str, data) -> None:
+        await self.broker.publish(channel, data)
+
     async def unsubscribe(self, *args):
+        if args and args[0] in self._streams:
+            self._streams.remove(args[0])
+            return
         await self.pub_sub.unsubscribe(*args)
 
     async def slave(self) -> "ClientProxy":
         return RedisClientProxy(self.option)
+
+
+def _stream_items(response) -> typing.Iterable[tuple[str, list]]:
+    # RESP2 answers a list of [stream, messages], RESP3 a mapping
+    if not response:
+        return []
+    if isinstance(response, dict):
+        return response.items()
+    return response
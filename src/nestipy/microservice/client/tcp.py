@@ -1,6 +1,6 @@
 import asyncio
 import typing
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Optional, Union
 
 from rich.style import Style
 
@@ -133,9 +133,11 @@ class TCPClientProxy(ClientProxy):
         """Return a new instance for slave connection."""
         return TCPClientProxy(self.option)
 
-    async def _publish(self, topic: str, data: str):
+    async def _publish(self, topic: str, data: Union[str, bytes]):
         """Publish a message to the specified topic."""
         await self.ensure_connected()
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
         if self.writer:
             self.writer.write(
                 f"PUBLISH{__SPLIT__}{topic}{__SPLIT__}{data}\n".encode("utf-8")
@@ -187,6 +189,17 @@ class TCPClientProxy(ClientProxy):
         finally:
             await self.unsubscribe(from_topic)
 
+    async def listen_replies(self, channel: str) -> AsyncIterator[str]:
+        """Read replies of the already subscribed reply channel."""
+        key = f"[{channel}]{__SPLIT__}"
+        while self.reader:
+            data = await self.reader.readline()
+            if not data:
+                return
+            message = data.decode("utf-8").strip()
+            if message.startswith(key):
+                yield message[len(key) :]
+
     async def _close(self):
         """Close the connection."""
         if self.writer:
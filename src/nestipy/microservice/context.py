@@ -6,6 +6,7 @@ from dataclasses_json import dataclass_json
 from .exception import RpcException
 
 MICROSERVICE_CHANNEL = "__channel__:microservice"
+CORRELATION_ID_HEADER = "x-correlation-id"
 
 
 @dataclasses.dataclass
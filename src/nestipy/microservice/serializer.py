@@ -1,22 +1,266 @@
+import dataclasses
 from abc import ABC, abstractmethod
-from typing import Any
+from dataclasses import asdict
+from typing import Any, Callable, Optional, Union
 
 import ujson
 
+from .context import RpcRequest, RpcResponse
+from .exception import RpcException
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+ACCEPT_HEADER = "accept"
+
+Payload = Union[str, bytes]
+
 
 class Serializer(ABC):
+    """
+    Encodes the RPC envelopes exchanged by clients and servers.
+    Serializers with a content_type take part in the negotiation: payloads in another
+    registered format are still decoded, and replies use a format the caller accepts.
+    Serializers without one (custom formats) are always used as is.
+    """
+
+    content_type: Optional[str] = None
+    # payloads are raw bytes that text-framed transports (TCP, gRPC) can not carry
+    binary: bool = False
+
     @abstractmethod
-    async def serialize(self, data: Any) -> str:
+    async def serialize(self, data: Any) -> Payload:
         pass
 
     @abstractmethod
-    async def deserialize(self, data: str) -> Any:
+    async def deserialize(self, data: Payload) -> Any:
         pass
 
+    async def encode_request(self, request: RpcRequest) -> Payload:
+        return await self.serialize(asdict(request))
+
+    async def decode_request(self, data: Payload) -> RpcRequest:
+        return RpcRequest(**await self.deserialize(data))
+
+    async def encode_response(self, response: RpcResponse) -> Payload:
+        return await self.serialize(asdict(response))
+
+    async def decode_response(self, data: Payload) -> RpcResponse:
+        return _response_from_dict(await self.deserialize(data))
+
 
 class JSONSerializer(Serializer):
+    content_type = JSON_CONTENT_TYPE
+
     async def serialize(self, data: Any) -> str:
         return ujson.dumps(data)
 
-    async def deserialize(self, data: str) -> Any:
+    async def deserialize(self, data: Payload) -> Any:
         return ujson.loads(data)
+
+
+class BytesSerializer(Serializer, ABC):
+    """
+    Serializer producing bytes, encoding RpcRequest and RpcResponse field by field
+    instead of going through dataclasses.asdict.
+    """
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, data: Payload) -> Any:
+        pass
+
+    async def serialize(self, data: Any) -> bytes:
+        return self.dumps(data)
+
+    async def deserialize(self, data: Payload) -> Any:
+        return self.loads(data)
+
+    async def encode_request(self, request: RpcRequest) -> bytes:
+        return self.dumps(
+            {
+                "data": request.data,
+                "pattern": request.pattern,
+                "response_topic": request.response_topic,
+                "headers": request.headers,
+            }
+        )
+
+    async def decode_request(self, data: Payload) -> RpcRequest:
+        return RpcRequest(**self.loads(data))
+
+    async def encode_response(self, response: RpcResponse) -> bytes:
+        exception = response.exception
+        return self.dumps(
+            {
+                "pattern": response.pattern,
+                "data": response.data,
+                "status": response.status,
+                "exception": (
+                    {"status_code": exception.status_code, "message": exception.message}
+                    if exception is not None
+                    else None
+                ),
+                "headers": response.headers,
+            }
+        )
+
+    async def decode_response(self, data: Payload) -> RpcResponse:
+        return _response_from_dict(self.loads(data))
+
+
+class OrjsonSerializer(BytesSerializer):
+    """
+    JSON encoded with orjson, wire compatible with JSONSerializer.
+    """
+
+    content_type = JSON_CONTENT_TYPE
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, data: Any) -> bytes:
+        return self._orjson.dumps(data, default=_default)
+
+    def loads(self, data: Payload) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgpackSerializer(BytesSerializer):
+    """
+    MessagePack payloads, requires the msgpack package and a binary-safe transport.
+    """
+
+    content_type = MSGPACK_CONTENT_TYPE
+    binary = True
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as e:
+            raise ImportError(
+                "MsgpackSerializer requires msgpack, install it with `pip install msgpack`"
+            ) from e
+        self._packb = msgpack.packb
+        self._unpackb = msgpack.unpackb
+
+    def dumps(self, data: Any) -> bytes:
+        return self._packb(data, default=_default, use_bin_type=True)
+
+    def loads(self, data: Payload) -> Any:
+        return self._unpackb(data, raw=False)
+
+
+def _default(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Type is not serializable: {type(value).__name__}")
+
+
+def _response_from_dict(data: dict) -> RpcResponse:
+    exception = data.get("exception")
+    return RpcResponse(
+        pattern=data.get("pattern"),
+        data=data.get("data"),
+        status=data.get("status"),
+        exception=RpcException(**exception) if exception else None,
+        headers=data.get("headers") or {},
+    )
+
+
+_factories: dict[str, Callable[[], Serializer]] = {
+    JSON_CONTENT_TYPE: JSONSerializer,
+    MSGPACK_CONTENT_TYPE: MsgpackSerializer,
+}
+_instances: dict[str, Optional[Serializer]] = {}
+
+
+def register_serializer(content_type: str, factory: Callable[[], Serializer]):
+    """
+    Make a format decodable and usable for replies by every client and server.
+    :param content_type: The content type announced in the accept header.
+    :param factory: Callable creating the serializer.
+    """
+    _factories[content_type] = factory
+    _instances.pop(content_type, None)
+
+
+def get_serializer(content_type: str) -> Optional[Serializer]:
+    if content_type not in _instances:
+        factory = _factories.get(content_type)
+        try:
+            _instances[content_type] = factory() if factory is not None else None
+        except ImportError:
+            _instances[content_type] = None
+    return _instances[content_type]
+
+
+def detect_serializer(data: Payload, preferred: Serializer) -> Serializer:
+    """
+    Find the serializer able to decode a payload, so that peers using another
+    built-in format can still talk to each other.
+    :param data: The received payload.
+    :param preferred: The serializer configured for the client or server.
+    :return: The serializer to decode the payload with.
+    """
+    if preferred.content_type is None:
+        return preferred
+    if isinstance(data, str) or not data or data[:1] in (b"{", b"["):
+        content_type = JSON_CONTENT_TYPE
+    else:
+        content_type = MSGPACK_CONTENT_TYPE
+    if content_type == preferred.content_type:
+        return preferred
+    return get_serializer(content_type) or preferred
+
+
+def negotiate_serializer(accept: Optional[str], preferred: Serializer) -> Serializer:
+    """
+    Choose the serializer of a reply from the accept header of the request.
+    Requests without accept header come from peers that only understand JSON.
+    :param accept: Comma separated content types accepted by the caller.
+    :param preferred: The serializer configured for the server.
+    :return: The serializer to encode the reply with.
+    """
+    if preferred.content_type is None:
+        return preferred
+    accepted = [t.strip() for t in accept.split(",")] if accept else [JSON_CONTENT_TYPE]
+    if preferred.content_type in accepted:
+        return preferred
+    for content_type in accepted:
+        serializer = get_serializer(content_type)
+        if serializer is not None:
+            return serializer
+    return preferred
+
+
+def accept_header(serializer: Serializer) -> Optional[str]:
+    """
+    Value of the accept header sent with requests, None when JSON is enough.
+    """
+    if serializer.content_type in (None, JSON_CONTENT_TYPE):
+        return None
+    return f"{serializer.content_type}, {JSON_CONTENT_TYPE}"
+
+
+__all__ = [
+    "Serializer",
+    "JSONSerializer",
+    "BytesSerializer",
+    "OrjsonSerializer",
+    "MsgpackSerializer",
+    "register_serializer",
+    "get_serializer",
+    "detect_serializer",
+    "negotiate_serializer",
+    "accept_header",
+    "JSON_CONTENT_TYPE",
+    "MSGPACK_CONTENT_TYPE",
+    "ACCEPT_HEADER",
+]
@@ -1,11 +1,23 @@
+import asyncio
 from abc import ABC
-from dataclasses import asdict
-from typing import Callable, Any
+from typing import Awaitable, Callable, Any, Optional
 
+from nestipy.common.logger import logger
 from nestipy.microservice.client import ClientProxy
 from nestipy.microservice.client.option import Transport
-from nestipy.microservice.context import RpcRequest, RpcResponse, MICROSERVICE_CHANNEL
+from nestipy.microservice.context import (
+    CORRELATION_ID_HEADER,
+    MICROSERVICE_CHANNEL,
+    RpcRequest,
+    RpcResponse,
+)
 from nestipy.microservice.exception import RpcException, RPCErrorCode, RPCErrorMessage
+from nestipy.microservice.serializer import (
+    ACCEPT_HEADER,
+    detect_serializer,
+    negotiate_serializer,
+)
+from .dispatcher import MessageDispatcher
 
 
 class MicroServiceServer(ABC):
@@ -13,28 +25,111 @@ class MicroServiceServer(ABC):
         self._pub_sub = pub_sub
         self._subscriptions: list[tuple[str, Callable]] = []
         self._request_subscriptions: list[tuple[str, Callable]] = []
+        self._dispatcher: Optional[MessageDispatcher] = None
+        self._closing = False
+        self._responder: Optional[ClientProxy] = None
+        self._responder_lock = asyncio.Lock()
 
     async def listen(self):
+        option = self._pub_sub.option
         await self._pub_sub.before_start()
         await self._pub_sub.ensure_connected()
-        await self._pub_sub.subscribe(
-            f"{MICROSERVICE_CHANNEL}:{self._pub_sub.option.channel_key}"
-        )
-        async for data in self._pub_sub.listen():
-            json_rep = await self._pub_sub.option.serializer.deserialize(data)
-            request = RpcRequest(**json_rep)
-            if request.is_event():
-                await self.handle_event(request)
-            else:
-                await self.handle_request(request=request)
+        await self._pub_sub.subscribe(f"{MICROSERVICE_CHANNEL}:{option.channel_key}")
+        self._closing = False
+        dispatcher = MessageDispatcher(option.max_in_flight, option.pattern_concurrency)
+        self._dispatcher = dispatcher
+        messages = self._pub_sub.listen().__aiter__()
+        try:
+            while not self._closing:
+                # backpressure: do not read from the transport while saturated
+                await dispatcher.acquire()
+                try:
+                    data = await messages.__anext__()
+                except StopAsyncIteration:
+                    dispatcher.release()
+                    break
+                except Exception:
+                    dispatcher.release()
+                    raise
+                ack = self._pub_sub.take_ack()
+                try:
+                    serializer = detect_serializer(data, option.serializer)
+                    request = await serializer.decode_request(data)
+                except Exception as e:
+                    dispatcher.release()
+                    # a message that cannot be decoded never will: drop it
+                    logger.error("Dropped invalid microservice message: %s", e)
+                    if ack is not None:
+                        await ack()
+                    continue
+                dispatcher.dispatch(request.pattern, self._handler_for(request, ack))
+        finally:
+            await dispatcher.drain(option.drain_timeout)
+
+    def _handler_for(
+        self, request: RpcRequest, ack: Optional[Callable[[], Awaitable]] = None
+    ) -> Callable:
+        if request.is_event():
+            handler = lambda: self.handle_event(request)  # noqa: E731
+        else:
+            handler = lambda: self.handle_request(request=request)  # noqa: E731
+        if ack is None:
+            return handler
+
+        async def handle_and_ack():
+            await handler()
+            # a failed message is left pending, to be delivered again
+            await ack()
+
+        return handle_and_ack
 
     def get_transport(self) -> Transport:
         return self._pub_sub.option.transport
 
     async def close(self):
+        """
+        Stop reading new messages, wait for the ones in flight (up to the option
+        drain_timeout) and close the transport.
+        """
+        self._closing = True
+        if self._dispatcher is not None:
+            if not await self._dispatcher.drain(self._pub_sub.option.drain_timeout):
+                self._dispatcher.cancel()
+        if self._responder is not None:
+            await self._responder.close()
+            self._responder = None
         await self._pub_sub.before_close()
         await self._pub_sub.close()
 
+    async def _get_responder(self) -> ClientProxy:
+        """
+        Connection used to publish replies, opened once and shared by every request.
+        """
+        if self._responder is not None and self._responder.is_connected():
+            return self._responder
+        async with self._responder_lock:
+            if self._responder is None:
+                self._responder = await self._pub_sub.slave()
+            await self._responder.ensure_connected()
+        return self._responder
+
+    async def _send_response(self, request: RpcRequest, rpc_response: RpcResponse):
+        headers = request.headers or {}
+        correlation_id = headers.get(CORRELATION_ID_HEADER)
+        if correlation_id is not None:
+            rpc_response.headers = {
+                **(rpc_response.headers or {}),
+                CORRELATION_ID_HEADER: correlation_id,
+            }
+        serializer = negotiate_serializer(
+            headers.get(ACCEPT_HEADER), self._pub_sub.option.serializer
+        )
+        responder = await self._get_responder()
+        await responder.send_response(
+            f"{MICROSERVICE_CHANNEL}:response:{request.response_topic}",
+            await serializer.encode_response(rpc_response),
+        )
+
     def subscribe(self, topic: str, callback: Callable):
         self._subscriptions.append((topic, callback))
 
@@ -53,77 +148,60 @@ class MicroServiceServer(ABC):
 
     async def handle_request(self, request: RpcRequest) -> Any:
         # process pattern
-        slave = await self._pub_sub.slave()
-        await slave.ensure_connected()
-        try:
-            for pattern, callback in self._request_subscriptions:
-                if pattern == request.pattern:
-                    # resolve dependencies
-                    try:
-                        response = await callback(self, request)
-                        if isinstance(response, RpcResponse):
-                            if request.response_topic:
-                                response.pattern = request.response_topic
-                            if response.exception and response.status != "error":
-                                response.status = "error"
-                            rpc_response = response
-                        elif isinstance(response, RpcException):
-                            rpc_response = RpcResponse(
-                                pattern=request.response_topic,
-                                data=None,
-                                status="error",
-                                exception=response,
-                            )
-                        else:
-                            rpc_response = RpcResponse(
-                                pattern=request.response_topic,
-                                data=response,
-                                status="success",
-                            )
-                    except Exception as exc:
-                        if isinstance(exc, RpcException):
-                            rpc_exception = exc
-                        else:
-                            rpc_exception = RpcException(
-                                status_code=RPCErrorCode.INTERNAL,
-                                message=str(exc) or RPCErrorMessage.INTERNAL,
-                            )
+        for pattern, callback in self._request_subscriptions:
+            if pattern == request.pattern:
+                # resolve dependencies
+                try:
+                    response = await callback(self, request)
+                    if isinstance(response, RpcResponse):
+                        if request.response_topic:
+                            response.pattern = request.response_topic
+                        if response.exception and response.status != "error":
+                            response.status = "error"
+                        rpc_response = response
+                    elif isinstance(response, RpcException):
                         rpc_response = RpcResponse(
                             pattern=request.response_topic,
                             data=None,
                             status="error",
-                            exception=rpc_exception,
+                            exception=response,
                         )
-                    if request.response_topic:
-                        await slave.send_response(
-                            f"{MICROSERVICE_CHANNEL}:response:{request.response_topic}",
-                            await self._pub_sub.option.serializer.serialize(
-                                asdict(rpc_response)
-                            ),
+                    else:
+                        rpc_response = RpcResponse(
+                            pattern=request.response_topic,
+                            data=response,
+                            status="success",
                         )
-                    return
-            if request.response_topic:
-                rpc_response_data: Any = (
-                    await self._pub_sub.option.serializer.serialize(
-                        asdict(
-                            RpcResponse(
-                                pattern=request.pattern,
-                                data=None,
-                                status="error",
-                                exception=RpcException(
-                                    status_code=RPCErrorCode.NOT_FOUND,
-                                    message=RPCErrorMessage.NOT_FOUND,
-                                ),
-                            )
+                except Exception as exc:
+                    if isinstance(exc, RpcException):
+                        rpc_exception = exc
+                    else:
+                        rpc_exception = RpcException(
+                            status_code=RPCErrorCode.INTERNAL,
+                            message=str(exc) or RPCErrorMessage.INTERNAL,
                         )
+                    rpc_response = RpcResponse(
+                        pattern=request.response_topic,
+                        data=None,
+                        status="error",
+                        exception=rpc_exception,
                     )
-                )
-                await slave.send_response(
-                    f"{MICROSERVICE_CHANNEL}:response:{request.response_topic}",
-                    rpc_response_data,
-                )
-        finally:
-            await slave.close()
+                if request.response_topic:
+                    await self._send_response(request, rpc_response)
+                return
+        if request.response_topic:
+            await self._send_response(
+                request,
+                RpcResponse(
+                    pattern=request.pattern,
+                    data=None,
+                    status="error",
+                    exception=RpcException(
+                        status_code=RPCErrorCode.NOT_FOUND,
+                        message=RPCErrorMessage.NOT_FOUND,
+                    ),
+                ),
+            )
 
     async def handle_event(self, request: RpcRequest):
         # process pattern
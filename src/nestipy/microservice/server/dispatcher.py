@@ -0,0 +1,113 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from nestipy.common.logger import logger
+
+
+class MessageDispatcher:
+    """
+    Runs incoming microservice messages concurrently with a bound on the number of
+    messages in flight, optionally narrowed per pattern.
+    The listen loop acquires a slot before reading the next message from the
+    transport, so a saturated server stops pulling and leaves messages with the broker.
+    A message waiting for its pattern limit waits in a room of max_in_flight
+    places instead of holding a slot, so the other patterns keep running; while the
+    room is full, waiters keep their slot and the listen loop stops reading.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 64,
+        pattern_limits: Optional[dict[str, int]] = None,
+    ):
+        """
+        :param max_in_flight: Maximum number of messages handled at the same time.
+        :param pattern_limits: Maximum number of concurrent handlers for given patterns.
+        """
+        self._slots = asyncio.Semaphore(max(1, max_in_flight))
+        self._waiting_room = asyncio.Semaphore(max(1, max_in_flight))
+        self._pattern_slots: dict[str, asyncio.Semaphore] = {
+            pattern: asyncio.Semaphore(max(1, limit))
+            for pattern, limit in (pattern_limits or {}).items()
+        }
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def acquire(self) -> None:
+        """
+        Wait for a free slot. Must be followed by dispatch() or release().
+        """
+        await self._slots.acquire()
+
+    def release(self) -> None:
+        self._slots.release()
+
+    def dispatch(
+        self, pattern: Optional[str], handler: Callable[[], Awaitable]
+    ) -> asyncio.Task:
+        """
+        Start handling a message in the slot acquired by the caller.
+        :param pattern: The message pattern, used for per-pattern limits.
+        :param handler: Coroutine function handling the message.
+        :return: The handling task.
+        """
+        task = asyncio.create_task(self._run(pattern, handler))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, pattern: Optional[str], handler: Callable[[], Awaitable]):
+        holding = True
+        waiting = False
+        pattern_slot = self._pattern_slots.get(pattern) if pattern else None
+        try:
+            if pattern_slot is not None and pattern_slot.locked():
+                # queued behind its pattern limit: give the global slot back, so
+                # the listen loop keeps reading messages of the other patterns,
+                # unless too many messages wait already
+                await self._waiting_room.acquire()
+                waiting = True
+                self._slots.release()
+                holding = False
+            if pattern_slot is None:
+                await handler()
+            else:
+                async with pattern_slot:
+                    if waiting:
+                        self._waiting_room.release()
+                        waiting = False
+                    if not holding:
+                        await self._slots.acquire()
+                        holding = True
+                    await handler()
+        except Exception as e:
+            logger.error("Microservice handler for %s failed: %s", pattern, e)
+        finally:
+            if waiting:
+                self._waiting_room.release()
+            if holding:
+                self._slots.release()
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the messages in flight, including those dispatched while draining.
+        :param timeout: Maximum time to wait, None to wait forever.
+        :return: True if everything finished, False if the timeout expired.
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                while self._tasks:
+                    await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        except TimeoutError:
+            return False
+        return True
+
+    def cancel(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+
+
+__all__ = ["MessageDispatcher"]
@@ -80,7 +80,7 @@ def get_example_scope(
         if isinstance(query, list):
             query = dict(query)
         if isinstance(query, dict):
-            query_string = urlencode(query).encode()
+            query_string = urlencode(query, doseq=True).encode()
         if isinstance(query, str):
             query_string = query.encode()
         if isinstance(query, bytes):
@@ -59,6 +59,8 @@ class TestSimulator:
                 (key.encode("utf-8"), value.encode("utf-8"))
                 for key, value in headers.items()
             ]
+        # a fresh queue, a previous request may not have read its body
+        self.receive_queue = asyncio.Queue()
         # app request
         self.scope = self._create_scope(
             method,
@@ -65,6 +65,7 @@ from .ssr import (
     env_ssr_runtime,
     resolve_ssr_entry,
 )
+from .ssr_cache import SSRCache, SSRCacheEntry, SSRCacheStore, RedisSSRCacheStore
 
 __all__ = [
     "WebConfig",
@@ -121,6 +122,10 @@ __all__ = [
     "SSRRenderer",
     "SSRRenderError",
     "create_ssr_renderer",
+    "SSRCache",
+    "SSRCacheEntry",
+    "SSRCacheStore",
+    "RedisSSRCacheStore",
     "env_ssr_enabled",
     "env_ssr_runtime",
     "resolve_ssr_entry",
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
+import collections
 import inspect
+import itertools
+import json
 import os
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Union
 
 from nestipy.common.logger import logger
 
@@ -21,6 +25,19 @@ class SSRRenderer:
     async def render(self, url: str) -> str | None:  # pragma: no cover - interface
         raise NotImplementedError
 
+    async def render_stream(self, url: str) -> AsyncIterator[str]:
+        """
+        Render a page as chunks of HTML, sent as soon as the entry produces them.
+        Renderers without streaming support yield the whole page at once.
+        """
+        html = await self.render(url)
+        if html:
+            yield html
+
+    async def close(self) -> None:
+        """Release the resources held by the renderer (processes, runtimes)."""
+        return None
+
 
 class JSRUNRenderer(SSRRenderer):
     """SSR renderer backed by jsrun (V8 via PyO3)."""
@@ -77,11 +94,334 @@ class JSRUNRenderer(SSRRenderer):
             return str(html) if html is not None else None
         return str(result) if result is not None else None
 
+    async def render_stream(self, url: str) -> AsyncIterator[str]:
+        exports = await self._ensure_exports()
+        stream_fn = exports.get("renderStream")
+        if stream_fn is None:
+            html = await self.render(url)
+            if html:
+                yield html
+            return
+        result = stream_fn(url)
+        if inspect.isawaitable(result):
+            result = await result
+        if hasattr(result, "__aiter__"):
+            async for chunk in result:
+                yield str(chunk)
+        elif isinstance(result, (list, tuple)):
+            for chunk in result:
+                yield str(chunk)
+        elif isinstance(result, dict):
+            html = result.get("html") or result.get("body")
+            if html:
+                yield str(html)
+        elif result:
+            yield str(result)
+
+
+# turns what an entry returns (string, {html}, async iterable, Node stream or React
+# PipeableStream) into an async iterable of strings
+_NODE_CHUNKS_JS = "\n".join(
+    [
+        "const toHtml = (result) => {",
+        "  let html = result;",
+        "  if (result && typeof result === 'object') {",
+        "    html = result.html ?? result.body ?? '';",
+        "  }",
+        "  return html === undefined || html === null ? '' : String(html);",
+        "};",
+        "async function* chunksOf(source) {",
+        "  const result = await source;",
+        "  if (result && typeof result.pipe === 'function' && !result[Symbol.asyncIterator]) {",
+        "    const { PassThrough } = await import('stream');",
+        "    const through = new PassThrough();",
+        "    result.pipe(through);",
+        "    yield* chunksOf(through);",
+        "    return;",
+        "  }",
+        "  if (result && typeof result[Symbol.asyncIterator] === 'function') {",
+        "    const decoder = new TextDecoder();",
+        "    for await (const chunk of result) {",
+        "      const text = typeof chunk === 'string' ? chunk : decoder.decode(chunk, { stream: true });",
+        "      if (text) yield text;",
+        "    }",
+        "    const rest = decoder.decode();",
+        "    if (rest) yield rest;",
+        "    return;",
+        "  }",
+        "  const html = toHtml(result);",
+        "  if (html) yield html;",
+        "}",
+        "const streamSource = (mod, url) =>",
+        "  typeof mod.renderStream === 'function' ? mod.renderStream(url) : mod.render(url);",
+    ]
+)
+
+_NODE_WORKER_SCRIPT = "\n".join(
+    [
+        "import { pathToFileURL } from 'url';",
+        "import readline from 'readline';",
+        "const entry = process.argv[1];",
+        "// stdout carries the protocol, route console output to stderr",
+        "for (const level of ['log', 'info', 'debug']) {",
+        "  console[level] = (...args) => console.error(...args);",
+        "}",
+        "const send = (message) => process.stdout.write(JSON.stringify(message) + '\\n');",
+        "let mod;",
+        "try {",
+        "  mod = await import(pathToFileURL(entry).href);",
+        "} catch (err) {",
+        "  send({ id: 0, error: String((err && err.stack) || err) });",
+        "  process.exit(1);",
+        "}",
+        "if (!mod || (typeof mod.render !== 'function'",
+        "    && typeof mod.renderStream !== 'function')) {",
+        "  send({ id: 0, error: 'SSR entry does not export render()' });",
+        "  process.exit(1);",
+        "}",
+        _NODE_CHUNKS_JS,
+        "send({ id: 0, ready: true });",
+        "const lines = readline.createInterface({ input: process.stdin });",
+        "lines.on('line', async (line) => {",
+        "  let request;",
+        "  try {",
+        "    request = JSON.parse(line);",
+        "  } catch {",
+        "    return;",
+        "  }",
+        "  try {",
+        "    if (request.stream) {",
+        "      for await (const chunk of chunksOf(streamSource(mod, request.url))) {",
+        "        send({ id: request.id, chunk });",
+        "      }",
+        "      send({ id: request.id, done: true });",
+        "      return;",
+        "    }",
+        "    send({ id: request.id, html: toHtml(await mod.render(request.url)) });",
+        "  } catch (err) {",
+        "    send({ id: request.id, error: String((err && err.stack) || err) });",
+        "  }",
+        "});",
+        "lines.on('close', () => process.exit(0));",
+    ]
+)
+
+
+class _NodeWorker:
+    """
+    A long-lived Node process rendering pages of one SSR entry.
+    Requests and replies are JSON lines carrying a request id, so several renders
+    can be in flight on the same worker.
+    """
+
+    # replies are single lines holding a whole page
+    STREAM_LIMIT = 64 * 1024 * 1024
+
+    def __init__(self, node: str, entry_path: str) -> None:
+        self._node = node
+        self._entry_path = entry_path
+        self._process: Optional[asyncio.subprocess.Process] = None
+        # futures of renders, queues of streamed renders
+        self._pending: Dict[int, Union[asyncio.Future, asyncio.Queue]] = {}
+        self._ids = itertools.count(1)
+        self._stderr: collections.deque[str] = collections.deque(maxlen=20)
+        # the readers end by themselves when the process exits
+        self._tasks: list[asyncio.Task] = []
+        self.renders = 0
+        self.retired = False
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    @property
+    def load(self) -> int:
+        return len(self._pending)
+
+    async def start(self, timeout: float) -> None:
+        self._process = await asyncio.create_subprocess_exec(
+            self._node,
+            "--input-type=module",
+            "-e",
+            _NODE_WORKER_SCRIPT,
+            self._entry_path,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=self.STREAM_LIMIT,
+        )
+        ready = asyncio.get_running_loop().create_future()
+        self._pending[0] = ready
+        self._tasks = [
+            asyncio.create_task(self._read_replies()),
+            asyncio.create_task(self._read_stderr()),
+        ]
+        try:
+            await asyncio.wait_for(ready, timeout)
+        except asyncio.TimeoutError as exc:
+            await self.kill()
+            raise SSRRenderError(f"SSR worker did not start ({timeout}s).") from exc
+        except SSRRenderError:
+            await self.kill()
+            raise
+
+    async def _read_replies(self) -> None:
+        process = _running_process(self._process)
+        assert process.stdout is not None
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                request_id = message.get("id")
+                target = self._pending.get(request_id)
+                if target is None:
+                    continue
+                error = message.get("error")
+                if isinstance(target, asyncio.Queue):
+                    if "chunk" in message:
+                        target.put_nowait(message["chunk"])
+                        continue
+                    self._pending.pop(request_id, None)
+                    target.put_nowait(SSRRenderError(error) if error is not None else None)
+                    continue
+                self._pending.pop(request_id, None)
+                if target.done():
+                    continue
+                if error is not None:
+                    target.set_exception(SSRRenderError(error))
+                else:
+                    target.set_result(message.get("html"))
+        except ValueError as exc:
+            logger.warning("[WEB] SSR worker reply unreadable (%s)", exc)
+        finally:
+            # reading failed (e.g. a reply over STREAM_LIMIT), the worker is unusable
+            if process.returncode is None:
+                process.kill()
+            await process.wait()
+            detail = "\n".join(self._stderr).strip()
+            error = f"SSR worker exited with code {process.returncode}."
+            if detail:
+                error += f"\n{detail}"
+            for target in self._pending.values():
+                if isinstance(target, asyncio.Queue):
+                    target.put_nowait(SSRRenderError(error))
+                elif not target.done():
+                    target.set_exception(SSRRenderError(error))
+            self._pending.clear()
+
+    async def _read_stderr(self) -> None:
+        process = _running_process(self._process)
+        assert process.stderr is not None
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                return
+            text = line.decode("utf-8", "replace").rstrip()
+            self._stderr.append(text)
+            logger.debug("[WEB] SSR worker: %s", text)
+
+    async def render(self, url: str, timeout: float) -> str | None:
+        process = _running_process(self._process)
+        if not self.alive or process.stdin is None:
+            raise SSRRenderError("SSR worker is not running.")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.renders += 1
+        try:
+            process.stdin.write(
+                json.dumps({"id": request_id, "url": url}).encode() + b"\n"
+            )
+            await process.stdin.drain()
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError as exc:
+            # the render may be stuck, replace the worker once its other renders end
+            self.retired = True
+            raise SSRRenderError(f"SSR render timed out ({timeout}s).") from exc
+        except (BrokenPipeError, ConnectionResetError) as exc:
+            raise SSRRenderError("SSR worker exited.") from exc
+        finally:
+            self._pending.pop(request_id, None)
+            if self.retired and not self._pending:
+                await self.kill()
+
+    async def render_stream(self, url: str, timeout: float) -> AsyncIterator[str]:
+        """
+        Render a page as chunks; timeout applies to the wait for each chunk.
+        """
+        process = _running_process(self._process)
+        if not self.alive or process.stdin is None:
+            raise SSRRenderError("SSR worker is not running.")
+        request_id = next(self._ids)
+        queue: asyncio.Queue = asyncio.Queue()
+        self._pending[request_id] = queue
+        self.renders += 1
+        try:
+            process.stdin.write(
+                json.dumps({"id": request_id, "url": url, "stream": True}).encode()
+                + b"\n"
+            )
+            await process.stdin.drain()
+            while True:
+                item = await asyncio.wait_for(queue.get(), timeout)
+                if item is None:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        except asyncio.TimeoutError as exc:
+            self.retired = True
+            raise SSRRenderError(f"SSR render timed out ({timeout}s).") from exc
+        except (BrokenPipeError, ConnectionResetError) as exc:
+            raise SSRRenderError("SSR worker exited.") from exc
+        finally:
+            self._pending.pop(request_id, None)
+            if self.retired and not self._pending:
+                await self.kill()
+
+    async def retire(self) -> None:
+        """Stop sending renders to the worker, and stop it once idle."""
+        self.retired = True
+        if not self._pending:
+            await self.kill()
+
+    async def kill(self) -> None:
+        process = self._process
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+
+
+def _running_process(
+    process: Optional[asyncio.subprocess.Process],
+) -> asyncio.subprocess.Process:
+    if process is None:
+        raise SSRRenderError("SSR worker is not started.")
+    return process
+
 
 class NodeRenderer(SSRRenderer):
-    """SSR renderer backed by a Node.js process."""
-
-    def __init__(self, entry_path: str, node_binary: str | None = None) -> None:
+    """
+    SSR renderer backed by Node.js.
+    Without pool, every render spawns a Node process importing the entry. With a
+    pool (pool_size > 0, or NESTIPY_WEB_SSR_POOL), long-lived workers import the
+    entry once and render over a JSON lines protocol on stdio; a worker is replaced
+    after max_renders renders (NESTIPY_WEB_SSR_POOL_MAX_RENDERS), after a timeout
+    or when it crashes.
+    """
+
+    def __init__(
+        self,
+        entry_path: str,
+        node_binary: str | None = None,
+        pool_size: Optional[int] = None,
+        max_renders: Optional[int] = None,
+    ) -> None:
         entry_file = Path(entry_path)
         if not entry_file.is_file():
             raise FileNotFoundError(f"SSR entry not found: {entry_path}")
@@ -97,12 +437,22 @@ class NodeRenderer(SSRRenderer):
             self._timeout = max(1.0, float(timeout_raw))
         except Exception:
             self._timeout = 5.0
+        if pool_size is None:
+            pool_size = _env_int("NESTIPY_WEB_SSR_POOL", 0)
+        if max_renders is None:
+            max_renders = _env_int("NESTIPY_WEB_SSR_POOL_MAX_RENDERS", 0)
+        self._pool_size = max(0, pool_size)
+        self._max_renders = max(0, max_renders)
+        self._workers: list[_NodeWorker] = []
+        # retired workers finishing their renders, killed on close
+        self._retired: list[_NodeWorker] = []
+        self._pool_lock = asyncio.Lock()
 
         self._script = "\n".join(
             [
                 "import { pathToFileURL } from 'url';",
-                "const entry = process.argv[2];",
-                "const url = process.argv[3] || '/';",
+                "const entry = process.argv[1];",
+                "const url = process.argv[2] || '/';",
                 "const entryUrl = pathToFileURL(entry).href;",
                 "const mod = await import(entryUrl);",
                 "if (!mod || typeof mod.render !== 'function') {",
@@ -120,9 +470,122 @@ class NodeRenderer(SSRRenderer):
                 "process.stdout.write(String(html));",
             ]
         )
+        self._stream_script = "\n".join(
+            [
+                "import { pathToFileURL } from 'url';",
+                "const entry = process.argv[1];",
+                "const url = process.argv[2] || '/';",
+                "const mod = await import(pathToFileURL(entry).href);",
+                "if (!mod || (typeof mod.render !== 'function'",
+                "    && typeof mod.renderStream !== 'function')) {",
+                "  console.error('SSR entry does not export render()');",
+                "  process.exit(1);",
+                "}",
+                _NODE_CHUNKS_JS,
+                "for await (const chunk of chunksOf(streamSource(mod, url))) {",
+                "  process.stdout.write(chunk);",
+                "}",
+            ]
+        )
+
+    @property
+    def pooled(self) -> bool:
+        return self._pool_size > 0
 
     async def render(self, url: str) -> str | None:
-        return await asyncio.to_thread(self._render_sync, url)
+        if not self.pooled:
+            return await asyncio.to_thread(self._render_sync, url)
+        worker = await self._acquire()
+        try:
+            return await worker.render(url, self._timeout)
+        finally:
+            if self._max_renders and worker.renders >= self._max_renders:
+                await self._release(worker)
+
+    async def render_stream(self, url: str) -> AsyncIterator[str]:
+        if not self.pooled:
+            async for chunk in self._stream_process(url):
+                yield chunk
+            return
+        worker = await self._acquire()
+        try:
+            async for chunk in worker.render_stream(url, self._timeout):
+                yield chunk
+        finally:
+            if self._max_renders and worker.renders >= self._max_renders:
+                await self._release(worker)
+
+    async def _stream_process(self, url: str) -> AsyncIterator[str]:
+        process = await asyncio.create_subprocess_exec(
+            self._node,
+            "--input-type=module",
+            "-e",
+            self._stream_script,
+            self._entry_path,
+            url,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        assert process.stdout is not None and process.stderr is not None
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        try:
+            while True:
+                data = await asyncio.wait_for(process.stdout.read(65536), self._timeout)
+                if not data:
+                    break
+                text = decoder.decode(data)
+                if text:
+                    yield text
+            rest = decoder.decode(b"", final=True)
+            if rest:
+                yield rest
+            stderr = await process.stderr.read()
+            if await process.wait() != 0:
+                message = stderr.decode("utf-8", "replace").strip()
+                raise SSRRenderError(message or "SSR render failed.")
+        except asyncio.TimeoutError as exc:
+            raise SSRRenderError(f"SSR render timed out ({self._timeout}s).") from exc
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    async def _acquire(self) -> _NodeWorker:
+        async with self._pool_lock:
+            for worker in [w for w in self._workers if w.retired or not w.alive]:
+                self._workers.remove(worker)
+                self._retired.append(worker)
+            self._retired = [w for w in self._retired if w.alive]
+            missing = self._pool_size - len(self._workers)
+            if missing > 0:
+                started = await asyncio.gather(
+                    *(self._start_worker() for _ in range(missing)),
+                    return_exceptions=True,
+                )
+                errors = [w for w in started if isinstance(w, BaseException)]
+                self._workers.extend(w for w in started if isinstance(w, _NodeWorker))
+                if not self._workers:
+                    raise errors[0]
+                for error in errors:
+                    logger.warning("[WEB] SSR worker failed to start (%s)", error)
+            return min(self._workers, key=lambda w: w.load)
+
+    async def _start_worker(self) -> _NodeWorker:
+        worker = _NodeWorker(self._node, self._entry_path)
+        await worker.start(self._timeout * 2)
+        return worker
+
+    async def _release(self, worker: _NodeWorker) -> None:
+        if worker in self._workers:
+            self._workers.remove(worker)
+        self._retired.append(worker)
+        await worker.retire()
+
+    async def close(self) -> None:
+        workers = self._workers + self._retired
+        self._workers, self._retired = [], []
+        for worker in workers:
+            await worker.kill()
 
     def _render_sync(self, url: str) -> str | None:
         try:
@@ -140,6 +603,13 @@ class NodeRenderer(SSRRenderer):
         return result.stdout
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
 def create_ssr_renderer(runtime: str, entry_path: str) -> SSRRenderer:
     """Create an SSR renderer for the requested runtime."""
     runtime = (runtime or "jsrun").strip().lower()
@@ -0,0 +1,427 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import hashlib
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, Iterable, Mapping, Optional
+
+import orjson
+
+from nestipy.common.logger import logger
+
+RenderFn = Callable[[], Awaitable[Optional[str]]]
+
+
+class SSRCacheEntry:
+    __slots__ = ("body", "created")
+
+    def __init__(self, body: bytes, created: float) -> None:
+        self.body = body
+        self.created = created
+
+
+class SSRCacheStore:
+    """
+    Store shared by the workers of an application, so that a page rendered by one
+    worker is served by the others. The lock methods let one worker render a
+    missing page while the others wait for it.
+    """
+
+    async def get(self, key: str) -> Optional[SSRCacheEntry]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    async def set(self, key: str, entry: SSRCacheEntry, expire: Optional[float]) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    async def acquire(self, key: str, timeout: float) -> bool:
+        return True
+
+    async def release(self, key: str) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisSSRCacheStore(SSRCacheStore):
+    """
+    SSR cache store kept in Redis.
+    A render lock holds a token of its holder, so that a worker whose render
+    outlived the lock does not release the lock taken since by another worker.
+    """
+
+    # delete the lock only if it still holds the token of this worker
+    RELEASE_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('del', KEYS[1]) end return 0"
+    )
+
+    def __init__(self, url: str, prefix: str = "nestipy:ssr:") -> None:
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(url)
+        self._prefix = prefix
+        self._tokens: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> Optional[SSRCacheEntry]:
+        raw = await self._redis.get(self._prefix + key)
+        if raw is None:
+            return None
+        data = orjson.loads(raw)
+        return SSRCacheEntry(data["body"].encode("utf-8"), float(data["created"]))
+
+    async def set(self, key: str, entry: SSRCacheEntry, expire: Optional[float]) -> None:
+        payload = orjson.dumps(
+            {"body": entry.body.decode("utf-8"), "created": entry.created}
+        )
+        await self._redis.set(
+            self._prefix + key,
+            payload,
+            px=int(expire * 1000) if expire else None,
+        )
+
+    async def acquire(self, key: str, timeout: float) -> bool:
+        token = uuid.uuid4().hex.encode()
+        acquired = await self._redis.set(
+            f"{self._prefix}lock:{key}", token, nx=True, px=int(timeout * 1000)
+        )
+        if acquired:
+            self._tokens[key] = token
+        return bool(acquired)
+
+    async def release(self, key: str) -> None:
+        token = self._tokens.pop(key, None)
+        if token is None:
+            return
+        await self._redis.eval(
+            self.RELEASE_SCRIPT, 1, f"{self._prefix}lock:{key}", token
+        )
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class SSRCache:
+    """
+    Cache of server-rendered pages.
+    - Entries are kept in memory within a byte budget (and an optional entry
+      count), least recently used first out.
+    - Concurrent misses of a key share a single render, streamed renders
+      included (see claim()).
+    - Entries older than ttl but within stale_ttl more seconds are served while
+      a background render refreshes them.
+    - Keys are built from the URL and selected request headers and cookies.
+    - An optional SSRCacheStore shares pages and render locks between workers.
+    """
+
+    # seconds between reads of the shared store while another worker renders
+    POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 32 * 1024 * 1024,
+        max_entries: int = 0,
+        ttl: float = 0,
+        stale_ttl: float = 0,
+        vary_headers: Iterable[str] = (),
+        vary_cookies: Iterable[str] = (),
+        store: Optional[SSRCacheStore] = None,
+        lock_timeout: float = 10.0,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.vary_headers = tuple(h.lower() for h in vary_headers)
+        self.vary_cookies = tuple(vary_cookies)
+        self.store = store
+        self.lock_timeout = lock_timeout
+        self._entries: "collections.OrderedDict[str, SSRCacheEntry]" = (
+            collections.OrderedDict()
+        )
+        self._size = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._refreshing: set[asyncio.Task] = set()
+        self._releasing: set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls) -> Optional["SSRCache"]:
+        """
+        Build the cache from the NESTIPY_WEB_SSR_CACHE* environment variables.
+        :return: The cache, or None when caching is disabled.
+        """
+        max_entries = _env_number("NESTIPY_WEB_SSR_CACHE", 0)
+        max_bytes = _env_number("NESTIPY_WEB_SSR_CACHE_BYTES", 0)
+        if max_entries <= 0 and max_bytes <= 0:
+            return None
+        redis_url = os.getenv("NESTIPY_WEB_SSR_CACHE_REDIS", "").strip()
+        return cls(
+            max_bytes=int(max_bytes) or 32 * 1024 * 1024,
+            max_entries=int(max_entries),
+            ttl=_env_number("NESTIPY_WEB_SSR_CACHE_TTL", 0),
+            stale_ttl=_env_number("NESTIPY_WEB_SSR_CACHE_SWR", 0),
+            vary_headers=_env_list("NESTIPY_WEB_SSR_CACHE_VARY_HEADERS"),
+            vary_cookies=_env_list("NESTIPY_WEB_SSR_CACHE_VARY_COOKIES"),
+            store=RedisSSRCacheStore(redis_url) if redis_url else None,
+        )
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        cookies: Optional[Mapping[str, str]] = None,
+    ) -> str:
+        """
+        Build the cache key of a page.
+        :param url: Path and query string of the page.
+        :param headers: Request headers, with lower-case names.
+        :param cookies: Request cookies.
+        :return: The cache key.
+        """
+        if not self.vary_headers and not self.vary_cookies:
+            return url
+        parts = [url]
+        for name in self.vary_headers:
+            parts.append(f"h:{name}={(headers or {}).get(name, '')}")
+        for name in self.vary_cookies:
+            parts.append(f"c:{name}={(cookies or {}).get(name, '')}")
+        digest = hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+        return f"{url}#{digest}"
+
+    async def get_or_render(self, key: str, render: RenderFn) -> Optional[bytes]:
+        """
+        Get a page from the cache, rendering it on miss.
+        :param key: Key built by key().
+        :param render: Coroutine function rendering the page HTML.
+        :return: The page body, or None when the render produced nothing.
+        """
+        entry = await self._cached(key)
+        if entry is not None:
+            if self._fresh(entry):
+                return entry.body
+            if self._servable(entry):
+                self._refresh(key, render)
+                return entry.body
+        return await self._single_flight(key, render)
+
+    async def lookup(
+        self, key: str, render: Optional[RenderFn] = None
+    ) -> Optional[bytes]:
+        """
+        Get a page without rendering it on miss, for callers streaming the render
+        themselves. A stale page is served while render refreshes it, and a miss
+        waits for the render of the page already in flight, if any.
+        :param key: Key built by key().
+        :param render: Coroutine function refreshing a stale page.
+        :return: The page body, or None when the caller should render it.
+        """
+        entry = await self._cached(key)
+        if entry is not None:
+            if self._fresh(entry):
+                return entry.body
+            if render is not None and self._servable(entry):
+                self._refresh(key, render)
+                return entry.body
+        future = self._inflight.get(key)
+        if future is None:
+            return None
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            return None
+
+    async def claim(self, key: str) -> Optional[asyncio.Future]:
+        """
+        Mark the streamed render of a page as in flight, so that lookup() waits
+        for it instead of rendering the page again, and take the render lock of
+        the shared store. While another worker holds the lock, wait for its page:
+        the returned future is then already done with that page.
+        :param key: Key built by key().
+        :return: A future to resolve with the page body (or None once the render
+        failed), or None when the page is already being rendered.
+        """
+        if key in self._inflight:
+            return None
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # a stream never sent must not keep the others waiting
+        handle = loop.call_later(
+            self.lock_timeout, lambda: future.done() or future.set_result(None)
+        )
+        future.add_done_callback(lambda _: handle.cancel())
+        store = self.store
+        if store is None:
+            return future
+        locked = await store.acquire(key, self.lock_timeout)
+        if not locked:
+            entry, locked = await self._wait_for_store(store, key)
+            if entry is not None:
+                self._put(key, entry)
+                if not future.done():
+                    future.set_result(entry.body)
+                return future
+        if locked:
+            future.add_done_callback(lambda _: self._release_later(store, key))
+        return future
+
+    def _release_later(self, store: SSRCacheStore, key: str) -> None:
+        task = asyncio.ensure_future(self._release(store, key))
+        self._releasing.add(task)
+        task.add_done_callback(self._releasing.discard)
+
+    async def _release(self, store: SSRCacheStore, key: str) -> None:
+        try:
+            await store.release(key)
+        except Exception as exc:
+            logger.warning("[WEB] SSR cache lock release failed (%s)", exc)
+
+    async def put(self, key: str, html: str) -> bytes:
+        """
+        Store a rendered page.
+        :param key: Key built by key().
+        :param html: The page HTML.
+        :return: The encoded page body.
+        """
+        entry = SSRCacheEntry(html.encode("utf-8"), time.time())
+        self._put(key, entry)
+        if self.store is not None:
+            expire = self.ttl + self.stale_ttl if self.ttl > 0 else None
+            await self.store.set(key, entry, expire)
+        return entry.body
+
+    async def _cached(self, key: str) -> Optional[SSRCacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        if self.store is not None and (entry is None or not self._fresh(entry)):
+            # another worker may have rendered the page
+            shared = await self.store.get(key)
+            if shared is not None and (entry is None or shared.created > entry.created):
+                self._put(key, shared)
+                entry = shared
+        return entry
+
+    def _fresh(self, entry: SSRCacheEntry) -> bool:
+        return self.ttl <= 0 or time.time() - entry.created <= self.ttl
+
+    def _servable(self, entry: SSRCacheEntry) -> bool:
+        return time.time() - entry.created <= self.ttl + self.stale_ttl
+
+    def _refresh(self, key: str, render: RenderFn) -> None:
+        if key in self._inflight:
+            return
+        task = asyncio.ensure_future(self._single_flight(key, render))
+        self._refreshing.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._refreshing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("[WEB] SSR cache refresh failed (%s)", task.exception())
+
+    async def _single_flight(self, key: str, render: RenderFn) -> Optional[bytes]:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fill(key, render))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # a cancelled request must not cancel the render awaited by the others
+        return await asyncio.shield(future)
+
+    async def _fill(self, key: str, render: RenderFn) -> Optional[bytes]:
+        store = self.store
+        locked = False
+        if store is not None:
+            locked = await store.acquire(key, self.lock_timeout)
+            if not locked:
+                entry, locked = await self._wait_for_store(store, key)
+                if entry is not None:
+                    self._put(key, entry)
+                    return entry.body
+        try:
+            html = await render()
+            if html is None:
+                return None
+            return await self.put(key, html)
+        finally:
+            if locked and store is not None:
+                await store.release(key)
+
+    async def _wait_for_store(
+        self, store: SSRCacheStore, key: str
+    ) -> tuple[Optional[SSRCacheEntry], bool]:
+        """
+        Wait for the page rendered by the worker holding the render lock.
+        :return: The stored entry, and whether the lock was taken over because
+        its holder released it without storing the page.
+        """
+        deadline = time.monotonic() + self.lock_timeout
+        started = time.time() - self.POLL_INTERVAL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            entry = await store.get(key)
+            if entry is not None and entry.created >= started:
+                return entry, False
+            if await store.acquire(key, self.lock_timeout):
+                # the page may have been stored just before the lock was released
+                entry = await store.get(key)
+                if entry is not None and entry.created >= started:
+                    await store.release(key)
+                    return entry, False
+                return None, True
+        return None, False
+
+    def _put(self, key: str, entry: SSRCacheEntry) -> None:
+        size = len(entry.body)
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous.body)
+        self._entries[key] = entry
+        self._size += size
+        while self._size > self.max_bytes or (
+            self.max_entries and len(self._entries) > self.max_entries
+        ):
+            _key, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.body)
+
+    async def close(self) -> None:
+        for task in list(self._refreshing):
+            task.cancel()
+        if self._releasing:
+            await asyncio.gather(*self._releasing, return_exceptions=True)
+        if self.store is not None:
+            await self.store.close()
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _env_list(name: str) -> list[str]:
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+
+__all__ = [
+    "SSRCache",
+    "SSRCacheEntry",
+    "SSRCacheStore",
+    "RedisSSRCacheStore",
+]
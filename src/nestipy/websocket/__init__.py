@@ -1,4 +1,5 @@
 from .adapter import SocketIoAdapter, IoAdapter, WebsocketAdapter
+from .backplane import WebsocketBackplane, ClientProxyBackplane
 from .decorator import (
     Gateway,
     SuccessEvent,
@@ -7,17 +8,20 @@ from .decorator import (
     OnConnect,
     OnDisConnect,
 )
-from .socket_request import Websocket
+from .socket_request import Websocket, WebsocketMessage
 
 __all__ = [
     "SocketIoAdapter",
     "WebsocketAdapter",
     "IoAdapter",
+    "WebsocketBackplane",
+    "ClientProxyBackplane",
     "Gateway",
     "SuccessEvent",
     "SubscribeMessage",
     "ErrorEvent",
     "Websocket",
+    "WebsocketMessage",
     "OnConnect",
     "OnDisConnect",
 ]
@@ -1,10 +1,18 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Optional
 
+from ..backplane import WebsocketBackplane
+from nestipy.common.logger import logger
+
 
 class IoAdapter(ABC):
-    def __init__(self, path: str = "socket.io"):
+    def __init__(
+        self, path: str = "socket.io", backplane: Optional[WebsocketBackplane] = None
+    ):
         self._path = f"/{path.strip('/')}"
+        self._backplane = backplane
+        self._backplane_start: Optional[asyncio.Future] = None
 
     @abstractmethod
     def on(
@@ -42,6 +50,63 @@ class IoAdapter(ABC):
     def broadcast(self, event: Any, data: Any):
         pass
 
+    @abstractmethod
+    async def join(self, sid: Any, room: str, namespace: Optional[str] = None) -> None:
+        """Add a client to a room, emits to the room then reach it."""
+        pass
+
+    @abstractmethod
+    async def leave(self, sid: Any, room: str, namespace: Optional[str] = None) -> None:
+        """Remove a client from a room."""
+        pass
+
+    async def _ensure_backplane(self) -> bool:
+        """
+        Start the backplane on first use, from the event loop serving the app.
+        :return: False when there is no backplane, or it failed to start.
+        """
+        if self._backplane is None:
+            return False
+        if type(self)._receive_backplane is IoAdapter._receive_backplane:
+            # the adapter cannot deliver relayed messages, emits stay local
+            logger.warning(
+                "[WEBSOCKET] %s does not support backplanes, emits stay local",
+                type(self).__name__,
+            )
+            self._backplane = None
+            return False
+        if self._backplane_start is None:
+            self._backplane_start = asyncio.ensure_future(
+                self._backplane.start(self._receive_backplane)
+            )
+        try:
+            await self._backplane_start
+        except Exception as exc:
+            if self._backplane is not None:
+                logger.error(
+                    "[WEBSOCKET] Backplane failed to start, emits stay local (%s)",
+                    exc,
+                )
+                self._backplane = None
+            return False
+        return True
+
+    async def _receive_backplane(self, message: dict) -> None:
+        """
+        Deliver a message emitted by another worker to the local clients.
+        Adapters not overriding it run without their backplane.
+        """
+        return None
+
+    async def _close_backplane(self) -> None:
+        backplane, self._backplane = self._backplane, None
+        if backplane is not None and self._backplane_start is not None:
+            try:
+                await backplane.close()
+            except Exception as exc:
+                logger.debug("[WEBSOCKET] Backplane close failed (%s)", exc)
+        self._backplane_start = None
+
     @abstractmethod
     async def __call__(self, scope: dict, receive: Callable, send: Callable) -> bool:
         pass
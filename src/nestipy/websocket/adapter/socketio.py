@@ -3,14 +3,26 @@ from typing import Any, Callable, Optional
 from socketio import AsyncServer
 
 from .abstract import IoAdapter
+from ..backplane import WebsocketBackplane
 from ..socket_request import Websocket
 from nestipy.common.logger import logger
 from nestipy.core.exception.error_policy import build_error_info
 
 
 class SocketIoAdapter(IoAdapter):
-    def __init__(self, io: AsyncServer, path: str = "socket.io"):
-        super().__init__(path=path)
+    def __init__(
+        self,
+        io: AsyncServer,
+        path: str = "socket.io",
+        backplane: Optional[WebsocketBackplane] = None,
+    ):
+        """
+        :param io: The socket.io server.
+        :param path: Path prefix of the socket.io endpoint.
+        :param backplane: Relay emits to the clients of the other workers.
+        Callbacks are not relayed, they only apply to the local clients.
+        """
+        super().__init__(path=path, backplane=backplane)
         self._io: AsyncServer = io
         self._connected: list = []
 
@@ -55,13 +67,64 @@ class SocketIoAdapter(IoAdapter):
         callback: Any = None,
         ignore_queue: bool = False,
     ):
-        return await self._io.emit(
+        result = await self._io.emit(
             event, data, to, room, skip_sid, namespace, callback, ignore_queue
         )
+        target = to if to is not None else room
+        if self._backplane is not None and not self._is_local(target, namespace):
+            if await self._ensure_backplane():
+                await self._backplane.publish(
+                    {
+                        "e": event,
+                        "d": data,
+                        "t": self._as_json(target),
+                        "s": self._as_json(skip_sid),
+                        "n": namespace,
+                    }
+                )
+        return result
+
+    async def _receive_backplane(self, message: dict) -> None:
+        await self._io.emit(
+            message["e"],
+            message.get("d"),
+            to=message.get("t"),
+            skip_sid=message.get("s"),
+            namespace=message.get("n"),
+        )
+
+    def _is_local(self, target: Any, namespace: Any) -> bool:
+        # only sids connected to this worker
+        if target is None:
+            return False
+        return all(
+            self._io.manager.is_connected(sid, namespace or "/")
+            for sid in self._as_list(target)
+        )
+
+    @staticmethod
+    def _as_list(value: Any) -> Any:
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return value
+        return (value,)
+
+    @classmethod
+    def _as_json(cls, value: Any) -> Any:
+        if value is None:
+            return None
+        return list(cls._as_list(value))
 
     def broadcast(self, event: Any, data: Any):
+        if self._backplane is not None:
+            return self.emit(event, data)
         return self._io.emit(event, data, self._connected)
 
+    async def join(self, sid: Any, room: str, namespace: Optional[str] = None) -> None:
+        await self._io.enter_room(sid, room, namespace=namespace)
+
+    async def leave(self, sid: Any, room: str, namespace: Optional[str] = None) -> None:
+        await self._io.leave_room(sid, room, namespace=namespace)
+
     def on_connect(self):
         def decorator(handler: Callable):
             async def wrapper(sid: Any, environ: dict, *args, **kwargs):
@@ -110,6 +173,7 @@ class SocketIoAdapter(IoAdapter):
         if scope["type"] in ["http", "websocket"] and scope["path"].startswith(
             self._path
         ):
+            await self._ensure_backplane()
             await self._io.handle_request(scope, receive, send)
             return True
         return False
@@ -136,3 +200,4 @@ class SocketIoAdapter(IoAdapter):
             except Exception:
                 continue
         self._connected.clear()
+        await self._close_backplane()
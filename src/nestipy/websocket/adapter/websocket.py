@@ -1,12 +1,162 @@
-from typing import Any, Callable, Optional, Union
+import asyncio
+import collections
+import functools
+import uuid
+from typing import Any, Awaitable, Callable, Iterable, Literal, Optional, Union
 
 import orjson
 
 from .abstract import IoAdapter
-from ..socket_request import Websocket
+from ..backplane import WebsocketBackplane
+from ..socket_request import Websocket, WebsocketMessage
 from nestipy.common.logger import logger
 from nestipy.core.exception.error_policy import build_error_info
 
+SlowConsumerPolicy = Literal["drop", "disconnect", "coalesce"]
+
+# close code sent to clients disconnected for not reading fast enough
+SLOW_CONSUMER_CLOSE_CODE = 1008
+
+
+class _Outbox:
+    """
+    Bounded queue of the messages sent to a connection, drained by its own
+    task so that a slow socket never blocks the emitter.
+    """
+
+    __slots__ = (
+        "client",
+        "maxsize",
+        "policy",
+        "dropped",
+        "closed",
+        "_entries",
+        "_latest",
+        "_ready",
+        "_task",
+    )
+
+    def __init__(self, client: Websocket, maxsize: int, policy: SlowConsumerPolicy):
+        self.client = client
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        # [key, message] entries, the key identifying coalescable messages
+        self._entries: collections.deque[list] = collections.deque()
+        self._latest: dict[Any, list] = {}
+        self._ready = asyncio.Event()
+        self._task = asyncio.ensure_future(self._drain())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, key: Any, message: dict) -> bool:
+        """
+        Queue a message.
+        :param key: Coalescing key of the message (its event).
+        :param message: The ASGI send message.
+        :return: False when the connection cannot keep up and must be closed.
+        """
+        if self.closed:
+            return True
+        if self.policy == "coalesce":
+            pending = self._latest.get(key)
+            if pending is not None:
+                # the client has not received the previous state yet
+                pending[1] = message
+                return True
+        if len(self._entries) >= self.maxsize:
+            if self.policy == "disconnect":
+                return False
+            self.dropped += 1
+            if self.policy == "drop":
+                return True
+            oldest = self._entries.popleft()
+            if self._latest.get(oldest[0]) is oldest:
+                del self._latest[oldest[0]]
+        entry = [key, message]
+        self._entries.append(entry)
+        if self.policy == "coalesce":
+            self._latest[key] = entry
+        self._ready.set()
+        return True
+
+    async def _drain(self) -> None:
+        entries = self._entries
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while entries:
+                entry = entries.popleft()
+                if self._latest.get(entry[0]) is entry:
+                    del self._latest[entry[0]]
+                try:
+                    await self.client.send(entry[1])
+                except Exception:
+                    self.close()
+                    return
+
+    def close(self) -> None:
+        self.closed = True
+        self._entries.clear()
+        self._latest.clear()
+        if not self._task.done() and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+
+class _Dispatcher:
+    """
+    Run the handlers of the messages of a connection concurrently. Messages
+    of a same key are handled one after the other, in the order received.
+    """
+
+    __slots__ = ("_running", "_in_flight", "_lanes", "_tasks")
+
+    def __init__(self, max_concurrency: int, max_in_flight: int):
+        self._running = asyncio.Semaphore(max_concurrency)
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        # last task of each key, the next message of the key waits for it
+        self._lanes: dict[Any, asyncio.Future] = {}
+        self._tasks: set[asyncio.Future] = set()
+
+    async def submit(self, key: Any, job: Callable[[], Awaitable]) -> None:
+        """
+        Schedule a message, waiting while max_in_flight messages are pending.
+        :param key: Ordering key of the message.
+        :param job: Coroutine function handling the message.
+        """
+        await self._in_flight.acquire()
+        task = asyncio.ensure_future(self._run(key, self._lanes.get(key), job))
+        self._lanes[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self, key: Any, previous: Optional[asyncio.Future], job: Callable
+    ) -> None:
+        try:
+            if previous is not None:
+                await asyncio.wait((previous,))
+            async with self._running:
+                await job()
+        except Exception as exc:
+            logger.error("Websocket message handling failed (%s)", exc)
+        finally:
+            self._in_flight.release()
+            if self._lanes.get(key) is asyncio.current_task():
+                del self._lanes[key]
+
+    async def join(self) -> None:
+        """Wait for the pending messages, cancelling them if cancelled."""
+        try:
+            while self._tasks:
+                await asyncio.wait(set(self._tasks))
+        except asyncio.CancelledError:
+            for task in self._tasks:
+                task.cancel()
+            raise
+
 
 class WebsocketAdapter(IoAdapter):
     def __init__(
@@ -14,12 +164,47 @@ class WebsocketAdapter(IoAdapter):
         path: str = "/ws",
         preprocess_payload: Optional[Callable[[str, Any], tuple[str, Any]]] = None,
         post_process_payload: Optional[Callable[[str, Any], Any]] = None,
+        max_queue_size: int = 1024,
+        slow_consumer: SlowConsumerPolicy = "drop",
+        backplane: Optional[WebsocketBackplane] = None,
+        max_concurrency: int = 1,
+        max_in_flight: int = 64,
+        ordering_key: Optional[Callable[[WebsocketMessage], Any]] = None,
     ):
-        super().__init__(path=path)
-        self._connected: list[str] = []
+        """
+        :param path: Path prefix of the websocket endpoints.
+        :param preprocess_payload: Map a received payload to (event, payload).
+        :param post_process_payload: Map an emitted payload before it is encoded.
+        :param max_queue_size: Messages queued per connection before the slow
+        consumer policy applies. 0 sends without queue, awaiting each client.
+        :param slow_consumer: What to do with a message for a full queue: "drop"
+        it, "disconnect" the client, or "coalesce" it with the queued message of
+        the same event (the oldest message is dropped when none is queued).
+        :param backplane: Relay emits to the clients of the other workers.
+        :param max_concurrency: Messages of a connection handled at the same time.
+        1 handles each message before reading the next one. Above, handlers
+        get their own view of the client, with the data of their message.
+        :param max_in_flight: Messages of a connection received and not handled
+        yet, when max_concurrency > 1, before the connection stops being read.
+        :param ordering_key: Key of the messages handled in order, one at a time.
+        Defaults to the event.
+        """
+        super().__init__(path=path, backplane=backplane)
+        # sids must not collide between workers sharing a backplane
+        self._sid_prefix = f"{uuid.uuid4().hex[:12]}-" if backplane else ""
+        self._connected: set[str] = set()
         self._preprocess_payload = preprocess_payload
         self._post_process_payload = post_process_payload
+        self._max_queue_size = max_queue_size
+        self._slow_consumer = slow_consumer
         self._client_info: dict[str, Websocket] = {}
+        self._outboxes: dict[str, _Outbox] = {}
+        self._rooms: dict[str, set[str]] = {}
+        self._sid_rooms: dict[str, set[str]] = {}
+        self._namespaces: dict[str, set[str]] = {}
+        self._max_concurrency = max_concurrency
+        self._max_in_flight = max(max_in_flight, max_concurrency)
+        self._ordering_key = ordering_key
         self._event_handlers: dict[str, Callable] = {}
         self._on_connect_handler: list[Callable] = []
         self._on_disconnect_handler: list[Callable] = []
@@ -31,8 +216,8 @@ class WebsocketAdapter(IoAdapter):
         """Register a handler for a specific path (event name)"""
 
         def decorator(handler: Callable):
-            async def wrapper(sid: str, data: Any):
-                client = self._client_info[sid]
+            async def wrapper(sid: str, data: Any, client: Optional[Websocket] = None):
+                client = client or self._client_info[sid]
                 try:
                     return await handler(event, client, data)
                 except Exception as exc:
@@ -55,33 +240,196 @@ class WebsocketAdapter(IoAdapter):
         callback: Any = None,
         ignore_queue: bool = False,
     ):
-        """Send a message to one or all clients"""
+        """
+        Send a message to clients. The payload is encoded once whatever the
+        number of recipients.
+        :param to: A sid, a room, or a list of them. All clients when omitted.
+        :param room: Alias of to.
+        :param skip_sid: A sid, or a list of sids, not to send to.
+        :param namespace: Restrict a room or broadcast emit to the clients
+        connected under this namespace.
+        :param ignore_queue: Await the send to each client instead of queuing it.
+        """
         if self._post_process_payload:
             data = self._post_process_payload(event, data)
         payload = data if isinstance(data, str) else orjson.dumps(data)
+        target = to if to is not None else room
+        await self._deliver(
+            event, self._message(payload), target, skip_sid, namespace, ignore_queue
+        )
+        if self._backplane is None or self._is_local(target):
+            return
+        if await self._ensure_backplane():
+            await self._backplane.publish(
+                {
+                    "e": event,
+                    "d": payload if isinstance(payload, str) else payload.decode(),
+                    "b": not isinstance(payload, str),
+                    "t": self._as_json(target),
+                    "s": self._as_json(skip_sid),
+                    "n": namespace,
+                }
+            )
+
+    async def _receive_backplane(self, message: dict) -> None:
+        payload = message["d"]
+        if message.get("b"):
+            payload = payload.encode()
+        await self._deliver(
+            message["e"],
+            self._message(payload),
+            message.get("t"),
+            message.get("s"),
+            message.get("n"),
+        )
 
-        if to:
-            await self._send_to(to, payload)
+    def _is_local(self, target: Any) -> bool:
+        # only sids of this worker: no other worker has a client to send to
+        if target is None:
+            return False
+        return all(item in self._client_info for item in self._as_list(target))
+
+    @classmethod
+    def _as_json(cls, value: Any) -> Any:
+        if value is None:
+            return None
+        return list(cls._as_list(value))
+
+    async def _deliver(
+        self,
+        event: Any,
+        message: dict,
+        target: Any,
+        skip_sid: Any,
+        namespace: Any,
+        ignore_queue: bool = False,
+    ) -> None:
+        direct: list[str] = []
+        for sid in self._targets(target, skip_sid, namespace):
+            outbox = self._outboxes.get(sid)
+            if outbox is None or ignore_queue:
+                direct.append(sid)
+            elif not outbox.put(event, message):
+                self._disconnect_slow(sid)
+        if len(direct) == 1:
+            await self._send_message(direct[0], message)
+        elif direct:
+            await asyncio.gather(*(self._send_message(sid, message) for sid in direct))
+
+    def _targets(self, target: Any, skip_sid: Any, namespace: Any) -> set[str]:
+        if target is None:
+            sids = self._in_namespace(set(self._connected), namespace)
         else:
-            for sid in list(self._connected):
-                if skip_sid and sid == skip_sid:
-                    continue
-                await self._send_to(sid, payload)
+            sids = set()
+            for item in self._as_list(target):
+                if item in self._client_info:
+                    sids.add(item)
+                elif item in self._rooms:
+                    sids.update(self._in_namespace(self._rooms[item], namespace))
+        if skip_sid is not None:
+            sids.difference_update(self._as_list(skip_sid))
+        return sids
+
+    def _in_namespace(self, sids: set[str], namespace: Any) -> set[str]:
+        if namespace is None or namespace == "/":
+            return sids
+        return sids & self._namespaces.get(namespace, set())
+
+    @staticmethod
+    def _as_list(value: Any) -> Iterable:
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return value
+        return (value,)
+
+    @staticmethod
+    def _message(payload: Union[str, bytes]) -> dict:
+        if isinstance(payload, str):
+            return {"type": "websocket.send", "text": payload}
+        return {"type": "websocket.send", "bytes": payload}
+
+    async def _send_message(self, sid: str, message: dict) -> None:
+        client = self._client_info.get(sid)
+        if client is None:
+            return
+        try:
+            await client.send(message)
+        except Exception as exc:
+            logger.debug("Websocket send to %s failed (%s)", sid, exc)
 
     async def _send_to(self, sid: str, payload: Union[str, bytes]):
-        if sid in self._client_info:
-            client = self._client_info[sid]
-            if isinstance(payload, str):
-                await client.send({"type": "websocket.send", "text": payload})
-            else:
-                await client.send({"type": "websocket.send", "bytes": payload})
+        await self._send_message(sid, self._message(payload))
+
+    def _disconnect_slow(self, sid: str) -> None:
+        # the closed outbox stays registered and ignores messages until the
+        # client is gone
+        outbox = self._outboxes.get(sid)
+        if outbox is not None:
+            outbox.close()
+        client = self._client_info.get(sid)
+        if client is None:
+            return
+        logger.warning("Websocket client %s disconnected, too slow to consume", sid)
+        asyncio.ensure_future(
+            self._send_message(
+                sid, {"type": "websocket.close", "code": SLOW_CONSUMER_CLOSE_CODE}
+            )
+        )
+
+    async def join(self, sid: Any, room: str, namespace: Optional[str] = None) -> None:
+        self._rooms.setdefault(room, set()).add(sid)
+        self._sid_rooms.setdefault(sid, set()).add(room)
+
+    async def leave(self, sid: Any, room: str, namespace: Optional[str] = None) -> None:
+        members = self._rooms.get(room)
+        if members is not None:
+            members.discard(sid)
+            if not members:
+                del self._rooms[room]
+        rooms = self._sid_rooms.get(sid)
+        if rooms is not None:
+            rooms.discard(room)
+
+    def rooms(self, sid: Any) -> set[str]:
+        """Rooms a client has joined."""
+        return set(self._sid_rooms.get(sid, ()))
+
+    def queue_size(self, sid: Any) -> int:
+        """Number of messages waiting to be sent to a client."""
+        outbox = self._outboxes.get(sid)
+        return len(outbox) if outbox is not None else 0
+
+    def _register(self, sid: str, client: Websocket) -> None:
+        self._client_info[sid] = client
+        self._connected.add(sid)
+        self._namespaces.setdefault(client.namespace, set()).add(sid)
+        if self._max_queue_size > 0:
+            self._outboxes[sid] = _Outbox(
+                client, self._max_queue_size, self._slow_consumer
+            )
+
+    def _unregister(self, sid: str, client: Websocket) -> None:
+        self._connected.discard(sid)
+        self._client_info.pop(sid, None)
+        outbox = self._outboxes.pop(sid, None)
+        if outbox is not None:
+            outbox.close()
+        members = self._namespaces.get(client.namespace)
+        if members is not None:
+            members.discard(sid)
+            if not members:
+                del self._namespaces[client.namespace]
+        for room in self._sid_rooms.pop(sid, ()):
+            room_members = self._rooms.get(room)
+            if room_members is not None:
+                room_members.discard(sid)
+                if not room_members:
+                    del self._rooms[room]
 
     def on_connect(self) -> Callable[[Callable], Any]:
         """Register connection handler"""
 
         def decorator(handler: Callable):
             async def wrapper(sid: Any, *args, **kwargs):
-                self._connected.append(sid)
                 client = self._client_info.get(sid)
                 try:
                     return await handler(sid, *args, **kwargs)
@@ -118,8 +466,6 @@ class WebsocketAdapter(IoAdapter):
 
         def decorator(handler: Callable):
             async def wrapper(sid: Any, *args, **kwargs):
-                if sid in self._connected:
-                    self._connected.remove(sid)
                 client = self._client_info.get(sid)
                 try:
                     return await handler(sid, *args, **kwargs)
@@ -137,53 +483,96 @@ class WebsocketAdapter(IoAdapter):
         """Send to all connected clients"""
         return self.emit(event, data)
 
+    def _namespace_of(self, path: str) -> str:
+        namespace = path[len(self._path):].strip("/")
+        return f"/{namespace}"
+
     async def __call__(self, scope: dict, receive: Callable, send: Callable) -> bool:
         """ASGI entry point for WebSocket"""
         if scope["type"] != "websocket" or not scope["path"].startswith(self._path):
             return False
 
-        sid = str(id(scope))
+        sid = f"{self._sid_prefix}{id(scope)}"
         path_event = str(scope["path"]).strip("/")
         client = Websocket(
-            namespace=None, sid=sid, data=None, scope=scope, receive=receive, send=send
+            namespace=self._namespace_of(str(scope["path"])),
+            sid=sid,
+            data=None,
+            scope=scope,
+            receive=receive,
+            send=send,
         )
-        self._client_info[sid] = client
 
         # Accept connection
         await send({"type": "websocket.accept"})
+        self._register(sid, client)
+        await self._ensure_backplane()
 
         # Call on_connect
         if self._on_connect_handler:
             for handler in self._on_connect_handler:
                 await handler("connect", client, None)
 
+        dispatcher = None
+        if self._max_concurrency > 1:
+            dispatcher = _Dispatcher(self._max_concurrency, self._max_in_flight)
+        seq = 0
         try:
             while True:
                 message = await receive()
                 if message["type"] == "websocket.receive":
                     payload = message.get("text") or message.get("bytes")
                     ev = path_event
-                    p_client = self._client_info[sid]
                     if self._preprocess_payload:
                         ev, payload = self._preprocess_payload(payload, message)
-                    for msg_handler in self._on_message_handler:
-                        await msg_handler(ev, p_client, payload)
-                    handler = self._event_handlers.get(ev)
-                    if handler:
+                    if dispatcher is None:
+                        p_client = self._client_info[sid]
                         p_client.data = payload
-                        await handler(ev, p_client, payload)
+                        await self._dispatch(p_client, ev, payload)
+                    else:
+                        ws_message = WebsocketMessage(ev, payload, seq)
+                        await dispatcher.submit(
+                            self._ordering_key(ws_message)
+                            if self._ordering_key
+                            else ev,
+                            functools.partial(
+                                self._dispatch,
+                                client.for_message(ws_message),
+                                ev,
+                                payload,
+                            ),
+                        )
+                    seq += 1
 
                 elif message["type"] == "websocket.disconnect":
                     break
 
         finally:
-            if self._on_disconnect_handler:
-                for disconnect_handler in self._on_disconnect_handler:
-                    await disconnect_handler("disconnect", client, None)
-            self._client_info.pop(sid, None)
+            cancelled: Optional[asyncio.CancelledError] = None
+            try:
+                if dispatcher is not None:
+                    try:
+                        await dispatcher.join()
+                    except asyncio.CancelledError as exc:
+                        # the client still disconnects, then the cancel goes on
+                        cancelled = exc
+                if self._on_disconnect_handler:
+                    for disconnect_handler in self._on_disconnect_handler:
+                        await disconnect_handler("disconnect", client, None)
+            finally:
+                self._unregister(sid, client)
+            if cancelled is not None:
+                raise cancelled
 
         return True
 
+    async def _dispatch(self, client: Websocket, event: Any, payload: Any) -> None:
+        for msg_handler in self._on_message_handler:
+            await msg_handler(event, client, payload)
+        handler = self._event_handlers.get(event)
+        if handler:
+            await handler(client.sid, payload, client)
+
     async def _handle_error(self, client: Websocket, exc: Exception) -> None:
         try:
             error_info = build_error_info(
@@ -192,18 +581,25 @@ class WebsocketAdapter(IoAdapter):
                 debug=getattr(client, "debug", False),
             )
             payload = {"event": "error", "error": error_info}
-            await client.send(
-                {
-                    "type": "websocket.send",
-                    "text": orjson.dumps(payload).decode("utf-8"),
-                }
-            )
+            message = {
+                "type": "websocket.send",
+                "text": orjson.dumps(payload).decode("utf-8"),
+            }
+            outbox = self._outboxes.get(client.sid)
+            if outbox is not None:
+                # keep the error after the messages already queued for the client
+                outbox.put("error", message)
+            else:
+                await client.send(message)
         except Exception:
             logger.exception("Failed to emit websocket error")
 
     async def close(self) -> None:
         for sid in list(self._connected):
             client = self._client_info.get(sid)
+            outbox = self._outboxes.pop(sid, None)
+            if outbox is not None:
+                outbox.close()
             if client is None:
                 continue
             try:
@@ -212,3 +608,7 @@ class WebsocketAdapter(IoAdapter):
                 continue
         self._connected.clear()
         self._client_info.clear()
+        self._rooms.clear()
+        self._sid_rooms.clear()
+        self._namespaces.clear()
+        await self._close_backplane()
@@ -0,0 +1,163 @@
+import asyncio
+import collections
+import itertools
+import uuid
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+
+import orjson
+
+from nestipy.common.logger import logger
+
+if TYPE_CHECKING:
+    from nestipy.microservice.client.base import ClientProxy
+
+BackplaneHandler = Callable[[dict], Awaitable[None]]
+
+
+class WebsocketBackplane(ABC):
+    """
+    Bus relaying gateway emits between the workers of an application, so that a
+    broadcast from one worker reaches the clients connected to the others.
+    Messages are dicts built by the io adapter; a worker does not receive its
+    own messages back.
+    """
+
+    @abstractmethod
+    async def start(self, handler: BackplaneHandler) -> None:
+        """
+        Start receiving the messages of the other workers.
+        :param handler: Coroutine function delivering a message locally.
+        """
+        pass
+
+    @abstractmethod
+    async def publish(self, message: dict) -> None:
+        """
+        Send a message to the other workers.
+        :param message: JSON-serializable message.
+        """
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+
+class ClientProxyBackplane(WebsocketBackplane):
+    """
+    Backplane over a microservice ClientProxy (Redis, NATS, RabbitMQ, MQTT, TCP,
+    gRPC), subscribed with subscribe_all() so that every worker gets each batch.
+    - Messages published in a same event loop tick, or up to batch_size of
+      them, go out as one transport message.
+    - Each message carries an id, and ids already delivered are skipped, so a
+      transport delivering a batch twice does not duplicate emits.
+    The proxy should be dedicated to the backplane: it is subscribed to the
+    channel and read with listen().
+    """
+
+    def __init__(
+        self,
+        proxy: "ClientProxy",
+        channel: str = "nestipy:websocket:backplane",
+        *,
+        batch_size: int = 256,
+        flush_interval: float = 0.0,
+        dedupe_size: int = 4096,
+    ) -> None:
+        self.proxy = proxy
+        self.channel = channel
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.worker_id = uuid.uuid4().hex
+        self._ids = itertools.count()
+        self._batch: list[dict] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flushing: set[asyncio.Task] = set()
+        self._seen: collections.OrderedDict[str, None] = collections.OrderedDict()
+        self._dedupe_size = dedupe_size
+        self._handler: Optional[BackplaneHandler] = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, handler: BackplaneHandler) -> None:
+        self._handler = handler
+        await self.proxy.ensure_connected()
+        await self.proxy.subscribe_all(self.channel)
+        self._listener = asyncio.ensure_future(self._listen())
+
+    async def publish(self, message: dict) -> None:
+        message["i"] = f"{self.worker_id}:{next(self._ids)}"
+        self._batch.append(message)
+        if len(self._batch) >= self.batch_size:
+            self._schedule_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.flush_interval, self._schedule_flush
+            )
+
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        task = asyncio.ensure_future(self._send(batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _send(self, batch: list[dict]) -> None:
+        payload = orjson.dumps({"w": self.worker_id, "m": batch}).decode("utf-8")
+        try:
+            await self.proxy.publish_all(self.channel, payload)
+        except Exception as exc:
+            logger.error(
+                "[WEBSOCKET] Backplane publish of %s messages failed (%s)",
+                len(batch),
+                exc,
+            )
+
+    async def flush(self) -> None:
+        """Send the pending messages now."""
+        self._schedule_flush()
+        if self._flushing:
+            await asyncio.gather(*self._flushing)
+
+    async def _listen(self) -> None:
+        try:
+            async for raw in self.proxy.listen():
+                try:
+                    await self._receive(raw)
+                except Exception as exc:
+                    logger.warning("[WEBSOCKET] Invalid backplane message (%s)", exc)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error("[WEBSOCKET] Backplane listener stopped (%s)", exc)
+
+    async def _receive(self, raw: Any) -> None:
+        envelope = orjson.loads(raw)
+        if envelope.get("w") == self.worker_id or self._handler is None:
+            # already delivered locally by this worker
+            return
+        for message in envelope.get("m", ()):
+            message_id = message.get("i")
+            if message_id in self._seen:
+                continue
+            self._seen[message_id] = None
+            if len(self._seen) > self._dedupe_size:
+                self._seen.popitem(last=False)
+            await self._handler(message)
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        try:
+            await self.proxy.close()
+        except Exception as exc:
+            logger.debug("[WEBSOCKET] Backplane proxy close failed (%s)", exc)
+
+
+__all__ = ["WebsocketBackplane", "ClientProxyBackplane", "BackplaneHandler"]
@@ -1,8 +1,20 @@
-from typing import Callable
+import copy
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
 
 from nestipy.common import Request
 
 
+@dataclass(frozen=True, slots=True)
+class WebsocketMessage:
+    """A message received from a client, as dispatched to its handlers."""
+
+    event: Any
+    data: Any
+    # position of the message in the connection, starting at 0
+    seq: int
+
+
 class Websocket(Request):
     def __init__(
         self, namespace, sid, data, scope: dict, receive: Callable, send: Callable
@@ -11,3 +23,16 @@ class Websocket(Request):
         self.namespace = namespace
         self.sid = sid
         self.data = data
+        self.message: Optional[WebsocketMessage] = None
+
+    def for_message(self, message: WebsocketMessage) -> "Websocket":
+        """
+        View of the connection for the handlers of a message, so that messages
+        handled concurrently each see their own data.
+        :param message: The message.
+        :return: A copy sharing the scope and the attributes of the connection.
+        """
+        view = copy.copy(self)
+        view.data = message.data
+        view.message = message
+        return view
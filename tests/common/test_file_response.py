@@ -0,0 +1,112 @@
+import asyncio
+from typing import Annotated
+
+import pytest
+
+from nestipy.common import Controller, Get, Module
+from nestipy.common.http_ import Response
+from nestipy.common.http_.file_body import FileBody, send_file_body
+from nestipy.core import NestipyConfig, NestipyFactory
+from nestipy.core.adapter import AsgiAdapter
+from nestipy.ioc.dependency import Res
+from nestipy.testing import TestClient
+
+CONTENT = b"0123456789abcdefghij"
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(CONTENT)
+    return str(path)
+
+
+def _create_module(path: str):
+    @Controller("/files")
+    class FileController:
+        @Get("/data")
+        async def data(self, res: Annotated[Response, Res()]):
+            return await res.download(path)
+
+    @Module(controllers=[FileController])
+    class FileModule:
+        pass
+
+    return FileModule
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("native", [False, True])
+async def test_file_response_ranges(data_file, native):
+    config = NestipyConfig(adapter=AsgiAdapter()) if native else NestipyConfig()
+    app = NestipyFactory.create(_create_module(data_file), config)
+    await app.setup()
+    client = TestClient(app)
+
+    full = await client.get("/files/data")
+    assert full.status() == 200
+    assert full.body() == CONTENT
+    headers = full.get_headers()
+    assert headers.get("content-length") == str(len(CONTENT))
+    assert headers.get("accept-ranges") == "bytes"
+    etag = headers["etag"]
+
+    part = await client.get("/files/data", headers={"range": "bytes=2-5"})
+    assert part.status() == 206
+    assert part.body() == CONTENT[2:6]
+    assert part.get_headers().get("content-range") == f"bytes 2-5/{len(CONTENT)}"
+
+    suffix = await client.get(
+        "/files/data", headers={"range": "bytes=-3", "if-range": etag}
+    )
+    assert suffix.status() == 206
+    assert suffix.body() == CONTENT[-3:]
+
+    stale = await client.get(
+        "/files/data", headers={"range": "bytes=2-5", "if-range": '"other"'}
+    )
+    assert stale.status() == 200
+    assert stale.body() == CONTENT
+
+    unsatisfiable = await client.get("/files/data", headers={"range": "bytes=99-"})
+    assert unsatisfiable.status() == 416
+    assert unsatisfiable.get_headers().get("content-range") == f"bytes */{len(CONTENT)}"
+
+    cached = await client.get("/files/data", headers={"if-none-match": etag})
+    assert cached.status() == 304
+
+
+@pytest.mark.asyncio
+async def test_send_file_body_uses_server_extensions(data_file):
+    sent: list[dict] = []
+
+    async def send(message):
+        sent.append(message)
+
+    file = FileBody(data_file, chunk_size=8)
+    await send_file_body(file, {"extensions": {"http.response.pathsend": {}}}, send)
+    assert sent == [{"type": "http.response.pathsend", "path": file.path}]
+
+    sent.clear()
+    file.start, file.end = 4, 18
+    await send_file_body(file, {"extensions": {"http.response.pathsend": {}}}, send)
+    # pathsend can not send a range, chunks are used instead
+    assert [m["body"] for m in sent] == [CONTENT[4:12], CONTENT[12:18], b""]
+
+
+@pytest.mark.asyncio
+async def test_file_chunks_are_read_off_the_event_loop(data_file, monkeypatch):
+    offloaded: list = []
+    to_thread = asyncio.to_thread
+
+    async def counting(func, *args):
+        offloaded.append(func)
+        return await to_thread(func, *args)
+
+    monkeypatch.setattr(asyncio, "to_thread", counting)
+    file = FileBody(data_file, chunk_size=8)
+    file.start, file.end = 3, 20
+    chunks = [chunk async for chunk in file.chunks()]
+    assert b"".join(chunks) == CONTENT[3:20]
+    # the open and every read ran in a worker thread
+    assert len(offloaded) == 1 + len(chunks)
@@ -0,0 +1,83 @@
+import uuid
+from typing import Annotated
+
+import pytest
+
+from nestipy.common import Controller, Get, Module, Post
+from nestipy.common.http_ import Response
+from nestipy.core import NestipyConfig, NestipyFactory
+from nestipy.core.adapter import AsgiAdapter
+from nestipy.core.router.radix_router import RadixRouter
+from nestipy.ioc.dependency import Param, Res
+from nestipy.testing import TestClient
+
+
+def test_radix_router_priority_and_converters():
+    router: RadixRouter[str] = RadixRouter()
+    router.add("GET", "/users/me", "me")
+    router.add("GET", "/users/{id:int}", "by_id")
+    router.add("GET", "/users/{name}", "by_name")
+    router.add("GET", "/items/{key:uuid}/files/{rest:path}", "file")
+    router.add("GET", "/reports/{year:int}.json", "report")
+    router.add(RadixRouter.ANY, "/{full_path:path}", "fallback")
+
+    assert router.match("GET", "/users/me").handler == "me"
+    by_id = router.match("GET", "/users/42")
+    assert (by_id.handler, by_id.params) == ("by_id", {"id": 42})
+    assert router.match("GET", "/users/bob").params == {"name": "bob"}
+    assert router.match("HEAD", "/users/bob").handler == "by_name"
+
+    key = uuid.uuid4()
+    file = router.match("GET", f"/items/{key}/files/a/b.txt")
+    assert file.params == {"key": key, "rest": "a/b.txt"}
+    assert router.match("GET", "/reports/2024.json").params == {"year": 2024}
+
+    fallback = router.match("POST", "/users/42")
+    assert fallback.handler == "fallback" and fallback.catch_all
+    assert router.match("GET", "/items/not-a-uuid/files/x").handler == "fallback"
+
+
+@Controller("/native")
+class NativeController:
+    @Get("/{id:int}")
+    async def by_id(self, id: Annotated[int, Param("id")]):
+        return {"id": id}
+
+    @Post("/echo")
+    async def echo(self, res: Annotated[Response, Res()]):
+        return await res.header("x-native", "1").json({"ok": True}, status_code=201)
+
+    @Get("/stream")
+    async def stream(self, res: Annotated[Response, Res()]):
+        async def chunks():
+            yield "a"
+            yield b"b"
+
+        return await res.stream(chunks)
+
+
+@Module(controllers=[NativeController])
+class NativeModule:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_asgi_adapter_serves_routes_directly():
+    app = NestipyFactory.create(NativeModule, NestipyConfig(adapter=AsgiAdapter()))
+    await app.setup()
+    client = TestClient(app)
+    found = await client.get("/native/7")
+    assert found.status() == 200
+    assert found.json() == {"id": 7}
+    assert found.get_headers().get("content-length") == str(len(found.body()))
+
+    created = await client.post("/native/echo")
+    assert created.status() == 201
+    assert created.get_headers().get("x-native") == "1"
+
+    streamed = await client.get("/native/stream")
+    assert streamed.status() == 200
+    assert "content-length" not in streamed.get_headers()
+
+    missing = await client.get("/native/unknown/path")
+    assert missing.status() == 404
@@ -0,0 +1,136 @@
+import pytest
+
+from nestipy.common import Cache, Controller, ETagValidator, Get, Injectable, Module
+from nestipy.core import NestipyFactory
+from nestipy.testing import TestClient
+
+state = {"version": 1, "calls": 0, "checks": 0}
+
+
+@Injectable()
+class VersionValidator(ETagValidator):
+    async def version(self, context):
+        return state["version"]
+
+
+class PlainValidator(ETagValidator):
+    def version(self):
+        return "plain"
+
+
+class FailingValidator(ETagValidator):
+    def version(self, context):
+        state["checks"] += 1
+        raise ValueError("version store unavailable")
+
+
+@Controller("/conditional")
+class ConditionalController:
+    @Get("/auto")
+    @Cache(max_age=0, auto_etag=True)
+    async def auto(self):
+        return {"hello": "world"}
+
+    @Get("/modified")
+    @Cache(last_modified="Wed, 21 Oct 2015 07:28:00 GMT")
+    async def modified(self):
+        return {"ok": True}
+
+    @Get("/versioned")
+    @Cache(no_cache=True, etag_validator=VersionValidator)
+    async def versioned(self):
+        state["calls"] += 1
+        return {"version": state["version"]}
+
+
+    @Get("/plain")
+    @Cache(no_cache=True, etag_validator=PlainValidator)
+    async def plain(self):
+        return {"ok": True}
+
+    @Get("/failing")
+    @Cache(no_cache=True, etag_validator=FailingValidator)
+    async def failing(self):
+        return {"ok": True}
+
+
+@Module(controllers=[ConditionalController], providers=[VersionValidator])
+class ConditionalModule:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_auto_etag_answers_if_none_match_with_304():
+    app = NestipyFactory.create(ConditionalModule)
+    await app.setup()
+    client = TestClient(app)
+    first = await client.get("/conditional/auto")
+    etag = first.get_headers().get("etag")
+    assert first.status() == 200
+    assert etag is not None and etag.startswith('W/"')
+
+    second = await client.get("/conditional/auto", headers={"if-none-match": etag})
+    assert second.status() == 304
+    assert second.body() == b""
+
+    other = await client.get("/conditional/auto", headers={"if-none-match": 'W/"x"'})
+    assert other.status() == 200
+
+
+@pytest.mark.asyncio
+async def test_if_modified_since_uses_last_modified():
+    app = NestipyFactory.create(ConditionalModule)
+    await app.setup()
+    client = TestClient(app)
+    not_modified = await client.get(
+        "/conditional/modified",
+        headers={"if-modified-since": "Thu, 22 Oct 2015 07:28:00 GMT"},
+    )
+    modified = await client.get(
+        "/conditional/modified",
+        headers={"if-modified-since": "Tue, 20 Oct 2015 07:28:00 GMT"},
+    )
+    assert not_modified.status() == 304
+    assert modified.status() == 200
+
+
+@pytest.mark.asyncio
+async def test_validator_short_circuits_before_controller():
+    state.update(version=1, calls=0)
+    app = NestipyFactory.create(ConditionalModule)
+    await app.setup()
+    client = TestClient(app)
+    first = await client.get("/conditional/versioned")
+    assert first.status() == 200
+    assert first.get_headers().get("etag") == 'W/"1"'
+    assert state["calls"] == 1
+
+    cached = await client.get(
+        "/conditional/versioned", headers={"if-none-match": 'W/"1"'}
+    )
+    assert cached.status() == 304
+    assert state["calls"] == 1
+
+    state["version"] = 2
+    changed = await client.get(
+        "/conditional/versioned", headers={"if-none-match": 'W/"1"'}
+    )
+    assert changed.status() == 200
+    assert changed.json() == {"version": 2}
+    assert state["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_validator_arity_is_decided_once_and_errors_surface():
+    state["checks"] = 0
+    app = NestipyFactory.create(ConditionalModule)
+    await app.setup()
+    client = TestClient(app)
+    plain = await client.get("/conditional/plain")
+    assert plain.status() == 200
+    assert plain.get_headers().get("etag") == 'W/"plain"'
+
+    failing = await client.get("/conditional/failing")
+    assert failing.status() == 500
+    # the ValueError is not mistaken for a resolution failure and retried
+    assert state["checks"] == 1
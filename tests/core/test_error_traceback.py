@@ -0,0 +1,96 @@
+import pytest
+
+from nestipy.common import Controller, Get, Module
+from nestipy.common.exception import traceback_capture
+from nestipy.common.exception.traceback_capture import TracebackSampler
+from nestipy.core import NestipyConfig, NestipyFactory
+from nestipy.core.router import router_proxy
+from nestipy.testing import TestClient
+
+
+@Controller("/boom")
+class BoomController:
+    @Get("/")
+    async def boom(self):
+        raise ValueError("downstream unavailable")
+
+
+@Module(controllers=[BoomController])
+class BoomModule:
+    pass
+
+
+def _count_code_reads(monkeypatch) -> list:
+    reads = []
+    code_context = traceback_capture.code_context
+
+    def counting(filename, lineno, n):
+        reads.append(filename)
+        return code_context(filename, lineno, n)
+
+    monkeypatch.setattr(traceback_capture, "code_context", counting)
+    return reads
+
+
+@pytest.mark.asyncio
+async def test_production_errors_do_not_read_source_files(monkeypatch):
+    reads = _count_code_reads(monkeypatch)
+    app = NestipyFactory.create(
+        BoomModule, NestipyConfig(debug=False, log_bootstrap=False)
+    )
+    await app.setup()
+    client = TestClient(app)
+
+    response = await client.get("/boom")
+    assert response.status() == 500
+    assert reads == []
+
+    json_response = await client.get("/boom", headers={"accept": "application/json"})
+    assert json_response.json()["message"] == "Internal Server Error"
+    assert reads == []
+
+
+@pytest.mark.asyncio
+async def test_error_page_materializes_code_context_from_cache(monkeypatch):
+    reads = _count_code_reads(monkeypatch)
+    app = NestipyFactory.create(
+        BoomModule, NestipyConfig(debug=True, log_bootstrap=False)
+    )
+    await app.setup()
+    client = TestClient(app)
+    traceback_capture._read_lines.cache_clear()
+
+    response = await client.get("/boom")
+    assert response.status() == 500
+    assert __file__ in reads
+    assert b"downstream unavailable" in response.body()
+
+    misses = traceback_capture._read_lines.cache_info().misses
+    await client.get("/boom")
+    # source lines come from the LRU cache on the next error
+    assert traceback_capture._read_lines.cache_info().misses == misses
+
+
+@pytest.mark.asyncio
+async def test_full_tracebacks_are_logged_by_sample_rate(monkeypatch):
+    logged = []
+    monkeypatch.setattr(
+        router_proxy.logger, "error", lambda msg, *args: logged.append(msg % args)
+    )
+    app = NestipyFactory.create(
+        BoomModule, NestipyConfig(debug=False, log_bootstrap=False)
+    )
+    await app.setup()
+    client = TestClient(app)
+    try:
+        TracebackSampler.set_rate(0)
+        await client.get("/boom")
+        assert logged == []
+
+        TracebackSampler.set_rate(1)
+        await client.get("/boom")
+        assert len(logged) == 1
+        assert "GET /boom failed" in logged[0]
+        assert "ValueError: downstream unavailable" in logged[0]
+    finally:
+        TracebackSampler.set_rate(None)
@@ -14,6 +14,8 @@ def _reset_middleware_container():
     container._registry_dirty = True
     container._registry = []
     container._match_cache = OrderedDict()
+    container._route_cache = {}
+    container._bound_callables = {}
 
 
 def _make_request(path: str, method: str = "GET"):
@@ -167,3 +169,72 @@ async def test_class_based_middleware_executes():
 
     assert result == "ok"
     assert order == ["class", "handler"]
+
+
+def test_middleware_match_route_is_decided_per_template():
+    NestipyContainer.clear()
+    _reset_middleware_container()
+    container = MiddlewareContainer.get_instance()
+
+    async def users_mw(_req, _res, next_fn):
+        return await next_fn()
+
+    async def health_mw(_req, _res, next_fn):
+        return await next_fn()
+
+    container.add_singleton(MiddlewareProxy(users_mw).for_route("/users/:id"))
+    container.add_singleton(
+        MiddlewareProxy(health_mw)
+        .for_route("/users")
+        .excludes({"path": "/users/health", "method": "GET"})
+    )
+
+    matched = container.match_route("/users/{id}/profile", "POST")
+    assert [m.middleware for m in matched] == [users_mw, health_mw]
+    assert container.match_route("/users/{id}/profile", "POST") is matched
+    assert [m.middleware for m in container.match_route("/other", "GET")] == []
+    assert [m.middleware for m in container.match_route("/users/health", "GET")] == [
+        users_mw
+    ]
+    # an exclude with a literal segment depends on the value of {id}
+    assert container.match_route("/users/{id}", "GET") is None
+    # multi segment params fall back to the per-path match
+    assert container.match_route("/users/{rest:path}", "POST") is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_executor_uses_route_template_and_binds_use():
+    NestipyContainer.clear()
+    _reset_middleware_container()
+    container = MiddlewareContainer.get_instance()
+    di = NestipyContainer.get_instance()
+    order: list[str] = []
+
+    class ClassMiddleware(NestipyMiddleware):
+        async def use(self, _req, _res, next_fn):
+            order.append("class")
+            return await next_fn()
+
+    di.add_singleton(ClassMiddleware)
+    container.add_singleton(MiddlewareProxy(ClassMiddleware).for_route("/items"))
+
+    from nestipy.core.middleware.executor import MiddlewareExecutor
+
+    async def final_handler():
+        order.append("handler")
+        return "ok"
+
+    for item in ("1", "2"):
+        req, res = _make_request(f"/items/{item}")
+        middlewares = MiddlewareExecutor.match(req, "/items/{id}")
+        assert middlewares is container.match_route("/items/{id}", "GET")
+        assert await MiddlewareExecutor(req, res, final_handler, middlewares).execute() == "ok"
+
+    assert order == ["class", "handler", "class", "handler"]
+    assert container.get_bound_callable(ClassMiddleware) is not None
+    # mounted applications are matched on the concrete path
+    req, _ = _make_request("/items/3")
+    req.scope["root_path"] = "/api"
+    assert MiddlewareExecutor.match(req, "/items/{id}") is not container.match_route(
+        "/items/{id}", "GET"
+    )
@@ -0,0 +1,97 @@
+import asyncio
+import time
+from typing import Annotated
+
+import pytest
+
+from nestipy.common import Injectable, Module, ModuleProviderDict
+from nestipy.core import NestipyConfig, NestipyFactory
+from nestipy.core.instance_loader import OnInit, OnModuleInit
+from nestipy.ioc import Inject
+
+events: list[str] = []
+
+
+async def _connect(name: str) -> str:
+    events.append(f"{name}:start")
+    await asyncio.sleep(0.1)
+    events.append(f"{name}:end")
+    return name
+
+
+@Injectable()
+class DatabasePool(OnInit):
+    async def on_startup(self):
+        await _connect("db")
+
+
+@Injectable()
+class HttpClient(OnInit):
+    async def on_startup(self):
+        await _connect("http")
+
+
+@Injectable()
+class UserRepository(OnInit):
+    pool: Annotated[DatabasePool, Inject()]
+
+    async def on_startup(self):
+        # the pool it injects is ready
+        assert "db:end" in events
+        await _connect("users")
+
+
+@Module(providers=[DatabasePool, UserRepository])
+class DatabaseModule(OnModuleInit):
+    async def on_module_init(self):
+        events.append("database:init")
+
+
+async def _cache_factory() -> str:
+    return await _connect("cache")
+
+
+@pytest.mark.asyncio
+async def test_parallel_bootstrap_runs_independent_providers_concurrently():
+    events.clear()
+
+    @Module(
+        providers=[
+            HttpClient,
+            ModuleProviderDict(token="CACHE", factory=_cache_factory),
+        ]
+    )
+    class ClientsModule:
+        pass
+
+    @Module(imports=[DatabaseModule, ClientsModule])
+    class AppModule(OnModuleInit):
+        async def on_module_init(self):
+            events.append("app:init")
+
+    app = NestipyFactory.create(
+        AppModule,
+        NestipyConfig(
+            parallel_bootstrap=True, log_bootstrap=False, health_enabled=False
+        ),
+    )
+    app.instance_loader.enable_profile(True)
+    start = time.perf_counter()
+    await app.setup()
+    elapsed = time.perf_counter() - start
+
+    # db, http and cache connect together, users waits for db only
+    assert elapsed < 0.35
+    assert events.index("http:start") < events.index("db:end")
+    assert events.index("cache:start") < events.index("db:end")
+    assert events.index("users:start") > events.index("db:end")
+    # imported modules are initialized first
+    assert events.index("database:init") < events.index("app:init")
+
+    profile = app.instance_loader.get_profile_summary()
+    assert profile["levels"] == 2
+    assert [n["name"] for n in profile["critical_path"]] == [
+        "DatabasePool",
+        "UserRepository",
+    ]
+    assert profile["critical_path_ms"] >= 200
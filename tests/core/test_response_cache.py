@@ -0,0 +1,238 @@
+import asyncio
+from typing import Annotated
+
+import pytest
+
+from nestipy.common import Cache, Controller, Get, Module
+from nestipy.common.cache import CachePolicy
+from nestipy.common.exception.http import HttpException
+from nestipy.common.exception.status import HttpStatus
+from nestipy.common.http_ import Request, Response
+from nestipy.core import NestipyConfig, NestipyFactory
+from nestipy.core.cache import MemoryCacheStore, ResponseCache
+from nestipy.ioc import Res
+from nestipy.testing import TestClient
+
+calls: dict[str, int] = {
+    "items": 0,
+    "swr": 0,
+    "swr_res": 0,
+    "error": 0,
+    "forbidden": 0,
+}
+
+
+@Controller("/cached")
+class CachedController:
+    @Get("/items")
+    @Cache(max_age=60, vary=["accept-language"])
+    async def items(self):
+        calls["items"] += 1
+        return {"calls": calls["items"]}
+
+    @Get("/swr")
+    @Cache(max_age=0, stale_while_revalidate=60)
+    async def swr(self):
+        calls["swr"] += 1
+        return {"calls": calls["swr"]}
+
+    @Get("/error")
+    @Cache(max_age=0, stale_if_error=60)
+    async def error(self):
+        calls["error"] += 1
+        if calls["error"] > 1:
+            raise HttpException(HttpStatus.BAD_GATEWAY, "upstream down")
+        return {"calls": calls["error"]}
+
+    @Get("/swr-res")
+    @Cache(max_age=0, stale_while_revalidate=60)
+    async def swr_res(self, res: Annotated[Response, Res()]):
+        calls["swr_res"] += 1
+        res.header("X-Calls", str(calls["swr_res"]))
+        return {"calls": calls["swr_res"]}
+
+    @Get("/forbidden")
+    @Cache(max_age=0, stale_if_error=60)
+    async def forbidden(self):
+        calls["forbidden"] += 1
+        if calls["forbidden"] > 1:
+            raise HttpException(HttpStatus.FORBIDDEN, "forbidden")
+        return {"calls": calls["forbidden"]}
+
+    @Get("/private")
+    @Cache(max_age=60, private=True)
+    async def private(self):
+        return {"ok": True}
+
+
+@Module(controllers=[CachedController])
+class CachedModule:
+    pass
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    for key in calls:
+        calls[key] = 0
+    ResponseCache.clear()
+
+
+def _make_request(path: str, query: bytes = b"", headers=None):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(_msg):
+        return None
+
+    scope = {
+        "type": "http",
+        "query_string": query,
+        "headers": headers or [],
+        "raw_path": path.encode(),
+        "method": "GET",
+        "server": ("localhost", 80),
+        "scheme": "http",
+    }
+    return Request(scope, receive, send)
+
+
+@pytest.mark.asyncio
+async def test_memory_store_evicts_by_bytes_and_expires():
+    store = MemoryCacheStore(max_entries=10, max_bytes=10, max_entry_bytes=8)
+    await store.set("a", b"12345")
+    await store.set("b", b"12345")
+    assert store.size == 10
+    await store.get("a")
+    await store.set("c", b"123")
+    assert await store.get("b") is None
+    assert await store.get("a") == b"12345"
+    await store.set("big", b"123456789")
+    assert await store.get("big") is None
+    await store.set("ttl", b"1", ttl=0)
+    assert await store.get("ttl") is None
+
+
+def test_cache_key_uses_query_order_and_vary_headers():
+    policy = CachePolicy(max_age=10, vary=["Accept-Language"])
+    a = _make_request("/x", b"b=2&a=1", [(b"accept-language", b"fr")])
+    b = _make_request("/x", b"a=1&b=2", [(b"accept-language", b"fr")])
+    c = _make_request("/x", b"a=1&b=2", [(b"accept-language", b"en")])
+    assert ResponseCache.build_key(a, policy) == ResponseCache.build_key(b, policy)
+    assert ResponseCache.build_key(a, policy) != ResponseCache.build_key(c, policy)
+    assert not ResponseCache.is_cacheable(CachePolicy(max_age=10, private=True))
+    assert not ResponseCache.is_cacheable(CachePolicy(no_store=True))
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_skips_controller():
+    app = NestipyFactory.create(
+        CachedModule, NestipyConfig(response_cache=MemoryCacheStore())
+    )
+    await app.setup()
+    client = TestClient(app)
+    r1 = await client.get("/cached/items")
+    r2 = await client.get("/cached/items")
+    r3 = await client.get("/cached/items", headers={"accept-language": "fr"})
+    assert r1.json() == {"calls": 1}
+    assert r2.json() == {"calls": 1}
+    assert "age" in {k.lower() for k in r2.get_headers()}
+    assert r3.json() == {"calls": 2}
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_serves_stale_and_refreshes():
+    app = NestipyFactory.create(
+        CachedModule, NestipyConfig(response_cache=MemoryCacheStore())
+    )
+    await app.setup()
+    client = TestClient(app)
+    r1 = await client.get("/cached/swr")
+    r2 = await client.get("/cached/swr")
+    assert r1.json() == {"calls": 1}
+    assert r2.json() == {"calls": 1}
+    await asyncio.sleep(0.05)
+    assert calls["swr"] == 2
+    r3 = await client.get("/cached/swr")
+    assert r3.json() == {"calls": 2}
+
+
+@pytest.mark.asyncio
+async def test_revalidation_writes_to_its_own_response():
+    app = NestipyFactory.create(
+        CachedModule, NestipyConfig(response_cache=MemoryCacheStore())
+    )
+    await app.setup()
+    client = TestClient(app)
+    await client.get("/cached/swr-res")
+    r2 = await client.get("/cached/swr-res")
+    assert r2.json() == {"calls": 1}
+    await asyncio.sleep(0.05)
+    assert calls["swr_res"] == 2
+    # the handler wrote the refreshed entry through @Res()
+    r3 = await client.get("/cached/swr-res")
+    assert r3.json() == {"calls": 2}
+    assert r3.get_headers().get("x-calls") == "2"
+
+
+@pytest.mark.asyncio
+async def test_stale_if_error_serves_last_good_response():
+    app = NestipyFactory.create(
+        CachedModule, NestipyConfig(response_cache=MemoryCacheStore())
+    )
+    await app.setup()
+    client = TestClient(app)
+    r1 = await client.get("/cached/error")
+    r2 = await client.get("/cached/error")
+    assert r2.status() == 200
+    assert r2.json() == r1.json() == {"calls": 1}
+    assert calls["error"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_if_error_ignores_client_errors():
+    app = NestipyFactory.create(
+        CachedModule, NestipyConfig(response_cache=MemoryCacheStore())
+    )
+    await app.setup()
+    client = TestClient(app)
+    await client.get("/cached/forbidden")
+    r2 = await client.get("/cached/forbidden")
+    assert r2.status() == 403
+
+
+@pytest.mark.asyncio
+async def test_private_policy_is_not_cached():
+    app = NestipyFactory.create(
+        CachedModule, NestipyConfig(response_cache=MemoryCacheStore())
+    )
+    await app.setup()
+    client = TestClient(app)
+    await client.get("/cached/private")
+    store = ResponseCache.get_instance().store
+    assert isinstance(store, MemoryCacheStore)
+    assert len(store) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call():
+    ResponseCache.clear()
+    cache = ResponseCache.get_instance()
+    cache.set_store(MemoryCacheStore())
+    policy = CachePolicy(max_age=60)
+    produced = 0
+
+    async def produce(res: Response) -> Response:
+        nonlocal produced
+        produced += 1
+        await asyncio.sleep(0.01)
+        return await res.json({"ok": True})
+
+    responses = await asyncio.gather(
+        *[
+            cache.serve(_make_request("/shared"), Response(), policy, produce)
+            for _ in range(5)
+        ]
+    )
+    assert produced == 1
+    assert all(r.content() == responses[0].content() for r in responses)
+    ResponseCache.clear()
@@ -0,0 +1,106 @@
+import pytest
+
+from nestipy.common import Controller, Get, Injectable, Module, UseGuards
+from nestipy.common.guards import CanActivate
+from nestipy.common.interceptor import NestipyInterceptor, UseInterceptors
+from nestipy.core import NestipyFactory
+from nestipy.core.router.route_pipeline import RoutePipeline
+from nestipy.testing import TestClient
+
+calls: list[str] = []
+
+
+@Injectable()
+class DenyGuard(CanActivate):
+    def can_activate(self, context) -> bool:
+        calls.append("deny")
+        return False
+
+
+@Injectable()
+class AllowGuard(CanActivate):
+    async def can_activate(self, context) -> bool:
+        calls.append("allow")
+        return True
+
+
+@Injectable()
+class OuterInterceptor(NestipyInterceptor):
+    async def intercept(self, context, next_fn):
+        calls.append("outer")
+        return await next_fn()
+
+
+@Injectable()
+class InnerInterceptor(NestipyInterceptor):
+    async def intercept(self, context, next_fn):
+        calls.append("inner")
+        return await next_fn()
+
+
+@Controller("/pipeline")
+@UseInterceptors(OuterInterceptor)
+class PipelineController:
+    @Get("/plain")
+    async def plain(self):
+        return {"ok": True}
+
+    @Get("/denied")
+    @UseGuards(DenyGuard)
+    async def denied(self):
+        return {"ok": True}
+
+    @Get("/allowed")
+    @UseGuards(AllowGuard)
+    @UseInterceptors(InnerInterceptor)
+    async def allowed(self):
+        calls.append("handler")
+        return {"ok": True}
+
+
+@Controller("/bare")
+class BareController:
+    @Get("/")
+    async def index(self):
+        return {"ok": True}
+
+
+@Module(controllers=[PipelineController, BareController])
+class AppModule:
+    pass
+
+
+def test_compile_collects_enhancers_in_order():
+    pipeline = RoutePipeline.compile(
+        None,
+        AppModule,
+        PipelineController,
+        PipelineController.allowed,
+    )
+    assert pipeline.guards == (AllowGuard,)
+    assert pipeline.interceptors == (InnerInterceptor, OuterInterceptor)
+    assert not pipeline.is_empty
+
+    bare = RoutePipeline.compile(None, AppModule, BareController, BareController.index)
+    assert bare.is_empty
+
+
+@pytest.mark.asyncio
+async def test_route_pipeline_runs_guards_and_interceptors():
+    calls.clear()
+    app = NestipyFactory.create(AppModule)
+    await app.setup()
+    client = TestClient(app)
+
+    response = await client.get("/pipeline/allowed")
+    assert response.status() == 200
+    assert calls == ["allow", "outer", "inner", "handler"]
+
+    calls.clear()
+    response = await client.get("/pipeline/denied")
+    assert response.status() == 401
+    assert calls == ["deny"]
+
+    response = await client.get("/bare")
+    assert response.status() == 200
+    assert response.json() == {"ok": True}
@@ -0,0 +1,119 @@
+from typing import Annotated
+
+import pytest
+
+from nestipy.common import CanActivate, Injectable, Module, Scope, UseGuards
+from nestipy.core import NestipyFactory
+from nestipy.graphql import (
+    DataLoader,
+    GraphqlModule,
+    GraphqlOption,
+    Parent,
+    Query,
+    ResolveField,
+    Resolver,
+)
+from nestipy.graphql.graphql_proxy import GraphqlProxy
+from nestipy.graphql.strawberry import ObjectType
+from nestipy.ioc import Inject, NestipyContainer
+from nestipy.ioc.context_container import RequestContextContainer
+from nestipy.testing import TestClient
+
+
+@ObjectType()
+class Author:
+    id: int
+    name: str
+
+
+@ObjectType()
+class Post:
+    id: int
+    author_id: int
+    author: Author
+
+
+@pytest.mark.asyncio
+async def test_field_resolvers_batch_loads_and_skip_empty_pipelines(monkeypatch):
+    NestipyContainer.clear()
+    RequestContextContainer.get_instance().destroy()
+    batches = []
+    pipelines = []
+    call_pipeline = GraphqlProxy._call_pipeline
+
+    async def counting(self, pipeline, *args):
+        pipelines.append(pipeline.class_handler)
+        return await call_pipeline(self, pipeline, *args)
+
+    monkeypatch.setattr(GraphqlProxy, "_call_pipeline", counting)
+
+    @Injectable(scope=Scope.Request)
+    class AuthorLoader(DataLoader[int, Author]):
+        async def batch_load(self, keys: list[int]) -> list[Author]:
+            batches.append((self, keys))
+            return [Author(id=key, name=f"author-{key}") for key in keys]
+
+    class AllowGuard(CanActivate):
+        def can_activate(self, context) -> bool:
+            return True
+
+    @Resolver(of=Post)
+    class PostResolver:
+        @Query()
+        async def posts(self) -> list[Post]:
+            return [
+                Post(id=n, author_id=author_id, author=None)
+                for n, author_id in enumerate([1, 2, 1, 3, 2])
+            ]
+
+        @Query()
+        @UseGuards(AllowGuard)
+        async def guarded(self) -> str:
+            return "ok"
+
+        @ResolveField()
+        async def author(
+            self,
+            parent: Annotated[Post, Parent()],
+            loader: Annotated[AuthorLoader, Inject()],
+        ) -> Author:
+            return await loader.load(parent.author_id)
+
+    @Module(
+        imports=[GraphqlModule.for_root(options=GraphqlOption(url="/graphql"))],
+        providers=[AuthorLoader, PostResolver, AllowGuard],
+    )
+    class AppModule:
+        pass
+
+    try:
+        app = NestipyFactory.create(AppModule)
+        await app.setup()
+        client = TestClient(app)
+        query = {"query": "{ posts { id author { id name } } }"}
+
+        response = await client.post("/graphql", json=query)
+        assert response.status() == 200
+        posts = response.json()["data"]["posts"]
+        assert [post["author"]["name"] for post in posts] == [
+            "author-1",
+            "author-2",
+            "author-1",
+            "author-3",
+            "author-2",
+        ]
+        # the five author fields made one batch of distinct keys
+        assert [keys for _, keys in batches] == [[1, 2, 3]]
+        # no enhancers: the resolvers were called directly
+        assert pipelines == []
+
+        await client.post("/graphql", json=query)
+        # each operation has its own loader and cache
+        assert len(batches) == 2 and batches[0][0] is not batches[1][0]
+
+        guarded = await client.post("/graphql", json={"query": "{ guarded }"})
+        assert guarded.json()["data"]["guarded"] == "ok"
+        assert pipelines == [PostResolver]
+    finally:
+        NestipyContainer.clear()
+        RequestContextContainer.get_instance().destroy()
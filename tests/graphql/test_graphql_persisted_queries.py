@@ -0,0 +1,187 @@
+import json
+from typing import Annotated
+from urllib.parse import quote
+
+import pytest
+from graphql import parse
+
+from nestipy.common import Module
+from nestipy.core import NestipyFactory
+from nestipy.graphql import (
+    Args,
+    GraphqlModule,
+    GraphqlOption,
+    Query,
+    Resolver,
+    analyze_query,
+)
+from nestipy.graphql.persisted_queries import query_hash
+from nestipy.graphql.strawberry import ObjectType
+from nestipy.graphql.strawberry.strawberry_asgi import StrawberryASGI
+from nestipy.ioc import NestipyContainer
+from nestipy.ioc.context_container import RequestContextContainer
+from nestipy.testing import TestClient
+import strawberry
+from strawberry.schema import schema as strawberry_schema
+
+
+@ObjectType()
+class Node:
+    id: int
+    children: list["Node"]
+
+
+def _tree(depth: int, id_: int = 0) -> Node:
+    children = [_tree(depth - 1, id_ * 10 + n) for n in (1, 2)] if depth > 1 else []
+    return Node(id=id_, children=children)
+
+
+def test_analyze_query_counts_depth_and_list_sizes():
+    document = parse(
+        """
+        query Tree($n: Int) {
+            node { id ...Kids }
+            nodes(first: 10) { id children(limit: $n) { id } }
+            __typename
+        }
+        fragment Kids on Node { children { id children { id } } }
+        """
+    )
+    cost = analyze_query(document, "Tree", {"n": 5})
+    assert cost.depth == 4
+    # node: 1 + (1 + (1 + (1 + 1))), nodes: 1 + 10 * (1 + (1 + 5 * 1))
+    assert cost.complexity == 6 + 71
+    assert cost.variable
+    assert not analyze_query(parse("{ node { id } }")).variable
+
+
+def _create_module():
+    @Resolver()
+    class NodeResolver:
+        @Query()
+        async def node(self, depth: Annotated[int, Args("depth")]) -> Node:
+            return _tree(depth)
+
+        @Query()
+        async def nodes(self, first: Annotated[int, Args("first")]) -> list[Node]:
+            return [_tree(1, n) for n in range(first)]
+
+    @Module(
+        imports=[
+            GraphqlModule.for_root(
+                options=GraphqlOption(
+                    url="/graphql",
+                    persisted_queries=True,
+                    max_depth=3,
+                    max_complexity=20,
+                )
+            )
+        ],
+        providers=[NodeResolver],
+    )
+    class AppModule:
+        pass
+
+    return AppModule
+
+
+def _persisted(query: str) -> dict:
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash(query)}}
+
+
+@pytest.mark.asyncio
+async def test_persisted_queries_and_document_cache(monkeypatch):
+    parsed = []
+    parse_document = strawberry_schema.parse
+
+    def counting_parse(query, **kwargs):
+        parsed.append(query)
+        return parse_document(query, **kwargs)
+
+    monkeypatch.setattr(strawberry_schema, "parse", counting_parse)
+    app = NestipyFactory.create(_create_module())
+    await app.setup()
+    client = TestClient(app)
+    query = "query Tree { node(depth: 2) { id children { id } } }"
+    try:
+        missing = await client.post(
+            "/graphql", json={"extensions": _persisted(query)}
+        )
+        assert missing.json()["errors"][0]["extensions"]["code"] == (
+            "PERSISTED_QUERY_NOT_FOUND"
+        )
+
+        registered = await client.post(
+            "/graphql", json={"query": query, "extensions": _persisted(query)}
+        )
+        expected = {"node": {"id": 0, "children": [{"id": 1}, {"id": 2}]}}
+        assert registered.json()["data"] == expected
+
+        # CDN friendly GET with the hash only
+        extensions = json.dumps(_persisted(query), separators=(",", ":"))
+        cached = await client.get(f"/graphql?extensions={quote(extensions)}")
+        assert cached.status() == 200
+        assert cached.json()["data"] == expected
+        # the document was parsed and validated once
+        assert parsed == [query]
+
+        mismatch = await client.post(
+            "/graphql",
+            json={
+                "query": "{ node(depth: 1) { id } }",
+                "extensions": _persisted(query),
+            },
+        )
+        assert mismatch.json()["errors"][0]["extensions"]["code"] == (
+            "PERSISTED_QUERY_HASH_MISMATCH"
+        )
+    finally:
+        NestipyContainer.clear()
+        RequestContextContainer.get_instance().destroy()
+
+
+@pytest.mark.asyncio
+async def test_document_cache_ignores_unchecked_persisted_hashes():
+    @strawberry.type
+    class Secrets:
+        public: str = "public"
+        secret: str = "secret"
+
+    # persisted queries on, as installed by the module
+    schema = StrawberryASGI(
+        strawberry.Schema(query=Secrets), GraphqlOption(persisted_queries=True)
+    ).schema
+    extensions = _persisted("{ public }")
+    # a hash not matching the query, sent past the persisted query check
+    await schema.execute(
+        "{ secret }", root_value=Secrets(), operation_extensions=extensions
+    )
+    result = await schema.execute(
+        "{ public }", root_value=Secrets(), operation_extensions=extensions
+    )
+    assert result.data == {"public": "public"}
+
+
+@pytest.mark.asyncio
+async def test_expensive_operations_are_rejected_before_execution():
+    app = NestipyFactory.create(_create_module())
+    await app.setup()
+    client = TestClient(app)
+    try:
+        deep_query = "{ node(depth: 5) { children { children { children { id } } } } }"
+        deep = await client.post("/graphql", json={"query": deep_query})
+        body = deep.json()
+        assert body["data"] is None
+        assert body["errors"][0]["extensions"]["code"] == "QUERY_TOO_DEEP"
+
+        wide = await client.post(
+            "/graphql",
+            json={
+                "query": "query($n: Int!) { nodes(first: $n) { id } }",
+                "variables": {"n": 50},
+            },
+        )
+        assert wide.json()["errors"][0]["extensions"]["code"] == "QUERY_TOO_COMPLEX"
+    finally:
+        NestipyContainer.clear()
+        RequestContextContainer.get_instance().destroy()
@@ -132,7 +132,7 @@ async def test_microservice_integration_message_and_event_flow():
 
         slave = client.slave_instance
         assert slave is not None
-        topic, payload = slave.published[0]
+        topic, payload = slave.published[-1]
         assert topic == f"{MICROSERVICE_CHANNEL}:response:{request.response_topic}"
 
         response_data = await option.serializer.deserialize(payload)
@@ -152,7 +152,7 @@ async def test_microservice_integration_message_and_event_flow():
 
         slave_headers = client.slave_instance
         assert slave_headers is not None
-        _, payload_headers = slave_headers.published[0]
+        _, payload_headers = slave_headers.published[-1]
         response_headers = await option.serializer.deserialize(payload_headers)
         assert response_headers["status"] == "success"
         assert response_headers["data"] == {"sum": 5}
@@ -212,7 +212,7 @@ async def test_microservice_integration_request_scoped_provider():
 
         slave_one = client.slave_instance
         assert slave_one is not None
-        _, payload_one = slave_one.published[0]
+        _, payload_one = slave_one.published[-1]
         response_one = await option.serializer.deserialize(payload_one)
         id_one = response_one["data"]["id"]
 
@@ -223,7 +223,7 @@ async def test_microservice_integration_request_scoped_provider():
 
         slave_two = client.slave_instance
         assert slave_two is not None
-        _, payload_two = slave_two.published[0]
+        _, payload_two = slave_two.published[-1]
         response_two = await option.serializer.deserialize(payload_two)
         id_two = response_two["data"]["id"]
 
@@ -283,7 +283,7 @@ async def test_microservice_integration_error_and_context_injection():
 
         slave_rpc = client.slave_instance
         assert slave_rpc is not None
-        _, payload_rpc = slave_rpc.published[0]
+        _, payload_rpc = slave_rpc.published[-1]
         response_rpc = await option.serializer.deserialize(payload_rpc)
         assert response_rpc["status"] == "error"
         assert response_rpc["exception"]["status_code"] == RPCErrorCode.INVALID_ARGUMENT
@@ -299,7 +299,7 @@ async def test_microservice_integration_error_and_context_injection():
 
         slave_generic = client.slave_instance
         assert slave_generic is not None
-        _, payload_generic = slave_generic.published[0]
+        _, payload_generic = slave_generic.published[-1]
         response_generic = await option.serializer.deserialize(payload_generic)
         assert response_generic["status"] == "error"
         assert response_generic["exception"]["status_code"] == RPCErrorCode.INTERNAL
@@ -351,7 +351,7 @@ async def test_microservice_integration_exception_filter_returns_message():
 
         slave = client.slave_instance
         assert slave is not None
-        _, payload = slave.published[0]
+        _, payload = slave.published[-1]
         response = await option.serializer.deserialize(payload)
         assert response["status"] == "success"
         assert response["data"] == RPCErrorMessage.DATA_LOSS
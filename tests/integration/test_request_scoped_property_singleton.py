@@ -1,10 +1,11 @@
+import asyncio
 from typing import Annotated
 
 import pytest
 
-from nestipy.common import Controller, Get, Injectable, Module, Scope
-from nestipy.core import NestipyFactory
-from nestipy.ioc import Inject
+from nestipy.common import Controller, Get, Injectable, Module, Post, Scope
+from nestipy.core import NestipyConfig, NestipyFactory
+from nestipy.ioc import Inject, NestipyContainer, create_type_annotated
 from nestipy.testing import TestClient
 
 
@@ -17,9 +18,28 @@ class RequestId:
         self.value = type(self)._counter
 
 
+async def _json_callback(_name, _token, _type_ref, request_context):
+    context = request_context.execution_context
+    if context is None:
+        return None
+    body = await context.get_request().json()
+    # stands for a read suspending on the network
+    await asyncio.sleep(0)
+    return body
+
+
+Json = create_type_annotated(_json_callback, "json")
+
+
+@Injectable(scope=Scope.Request)
+class RequestPayload:
+    body: Annotated[dict, Json]
+
+
 @Injectable()
 class AppService:
     request_id: Annotated[RequestId, Inject()]
+    payload: Annotated[RequestPayload, Inject()]
 
 
 @Controller("/app")
@@ -30,8 +50,16 @@ class AppController:
     async def get_id(self):
         return {"id": self.service.request_id.value}
 
+    @Post("/echo")
+    async def echo(self):
+        return self.service.payload.body
+
+    @Get("/ping")
+    async def ping(self):
+        return {"ok": True}
 
-@Module(controllers=[AppController], providers=[AppService, RequestId])
+
+@Module(controllers=[AppController], providers=[AppService, RequestId, RequestPayload])
 class AppModule:
     pass
 
@@ -51,3 +79,38 @@ async def test_request_scoped_property_on_singleton_resolves_per_request():
     id2 = r2.json().get("id")
     assert id1 is not None and id2 is not None
     assert id1 != id2
+
+
+@pytest.mark.asyncio
+async def test_lazy_request_scope_resolves_on_first_access_only():
+    app = NestipyFactory.create(AppModule, NestipyConfig(lazy_request_scope=True))
+    await app.setup()
+    client = TestClient(app)
+    try:
+        before = RequestId._counter
+        r0 = await client.get("/app/ping")
+        assert r0.status() == 200
+        assert RequestId._counter == before
+
+        r1 = await client.get("/app/id")
+        r2 = await client.get("/app/id")
+        assert r1.status() == 200
+        assert r2.status() == 200
+        assert r1.json().get("id") != r2.json().get("id")
+        assert RequestId._counter == before + 2
+    finally:
+        NestipyContainer.set_lazy_request_scope(False)
+
+
+@pytest.mark.asyncio
+async def test_lazy_request_scope_preloads_dependencies_awaiting_io():
+    app = NestipyFactory.create(AppModule, NestipyConfig(lazy_request_scope=True))
+    await app.setup()
+    client = TestClient(app)
+    try:
+        # the body is read with awaited I/O, it cannot be built on property read
+        response = await client.post("/app/echo", json={"name": "nestipy"})
+        assert response.status() == 200
+        assert response.json() == {"name": "nestipy"}
+    finally:
+        NestipyContainer.set_lazy_request_scope(False)
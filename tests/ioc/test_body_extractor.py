@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+from pydantic import BaseModel
+
+from nestipy.common import Controller, Module, Post
+from nestipy.core import NestipyConfig, NestipyFactory
+from nestipy.ioc.dependency import Body, _body_decoder
+from nestipy.testing import TestClient
+
+
+class ItemDto(BaseModel):
+    name: str
+    price: float = 0
+
+
+@dataclass
+class NoteDto:
+    text: str
+
+
+@Controller("/body")
+class BodyController:
+    @Post("/model")
+    async def model(self, item: Annotated[ItemDto, Body()]):
+        return {"type": type(item).__name__, "name": item.name, "price": item.price}
+
+    @Post("/list")
+    async def many(self, items: Annotated[list[ItemDto], Body()]):
+        return {"names": [item.name for item in items]}
+
+    @Post("/dataclass")
+    async def note(self, note: Annotated[NoteDto, Body()]):
+        return {"type": type(note).__name__, "text": note.text}
+
+    @Post("/raw")
+    async def raw(self, data: Annotated[dict, Body()]):
+        return {"data": data}
+
+
+@Module(controllers=[BodyController])
+class BodyModule:
+    pass
+
+
+def test_body_decoder_is_cached_per_annotation():
+    assert _body_decoder(list[ItemDto]) is _body_decoder(list[ItemDto])
+    items = _body_decoder(list[ItemDto])(b'[{"name": "a", "price": "2"}]')
+    assert items == [ItemDto(name="a", price=2)]
+    assert _body_decoder(dict)(b"") == {}
+    assert _body_decoder(dict)(b"not json") == {}
+
+
+@pytest.mark.asyncio
+async def test_body_is_decoded_by_content_type():
+    app = NestipyFactory.create(BodyModule, NestipyConfig())
+    await app.setup()
+    client = TestClient(app)
+
+    model = await client.post("/body/model", json={"name": "pen", "price": 1.5})
+    assert model.json() == {"type": "ItemDto", "name": "pen", "price": 1.5}
+
+    many = await client.post("/body/list", json=[{"name": "a"}, {"name": "b"}])
+    assert many.json() == {"names": ["a", "b"]}
+
+    note = await client.post("/body/dataclass", json={"text": "hi"})
+    assert note.json() == {"type": "NoteDto", "text": "hi"}
+
+    form = await client.post(
+        "/body/model",
+        headers={"content-type": "application/x-www-form-urlencoded"},
+        body=b"name=book&price=3",
+    )
+    assert form.json() == {"type": "ItemDto", "name": "book", "price": 3.0}
+
+    raw = await client.post("/body/raw", json={"a": [1, 2]})
+    assert raw.json() == {"data": {"a": [1, 2]}}
@@ -0,0 +1,72 @@
+from typing import Annotated
+
+import pytest
+
+from nestipy.common import Controller, Get, Injectable, Module, Scope, UseGuards
+from nestipy.common.guards import CanActivate
+from nestipy.core import NestipyFactory
+from nestipy.ioc import EnhancerScopeRegistry, Inject, NestipyContainer
+from nestipy.metadata import ClassMetadata, Reflect
+from nestipy.testing import TestClient
+
+
+@Injectable()
+class TokenService:
+    def is_valid(self) -> bool:
+        return True
+
+
+@Injectable()
+class TokenGuard(CanActivate):
+    tokens: Annotated[TokenService, Inject()]
+
+    def can_activate(self, context) -> bool:
+        return self.tokens.is_valid()
+
+
+@Controller("/scoped")
+class ScopedController:
+    @Get("/")
+    @UseGuards(TokenGuard)
+    async def index(self):
+        return {"ok": True}
+
+
+@Module(controllers=[ScopedController], providers=[TokenService])
+class ScopedModule:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_guard_borrows_controller_scope_and_is_cached():
+    app = NestipyFactory.create(ScopedModule)
+    await app.setup()
+    client = TestClient(app)
+
+    response = await client.get("/scoped")
+    assert response.status() == 200
+    assert Reflect.get_metadata(TokenGuard, ClassMetadata.Metadata) is (
+        Reflect.get_metadata(ScopedController, ClassMetadata.Metadata)
+    )
+
+    registry = EnhancerScopeRegistry.get_instance()
+    first = await registry.get(TokenGuard, ScopedController)
+    second = await registry.get(TokenGuard, ScopedController)
+    assert first is second
+    assert (TokenGuard, ScopedController) in registry._instances
+
+
+@pytest.mark.asyncio
+async def test_transient_enhancer_is_not_cached():
+    NestipyContainer.clear()
+
+    @Injectable(scope=Scope.Transient)
+    class TransientGuard(CanActivate):
+        def can_activate(self, context) -> bool:
+            return True
+
+    registry = EnhancerScopeRegistry.get_instance()
+    first = await registry.get(TransientGuard, None)
+    second = await registry.get(TransientGuard, None)
+    assert first is not second
+    assert (TransientGuard, None) not in registry._instances
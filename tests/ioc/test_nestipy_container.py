@@ -6,6 +6,8 @@ from nestipy.common import Injectable
 from nestipy.ioc import NestipyContainer, Inject, RequestContextContainer
 from nestipy.core import ExecutionContext
 from nestipy.common.http_ import Request, Response
+from nestipy.common.pipes.builtin import ParseIntPipe
+from nestipy.ioc.dependency import Param, Query
 
 
 @pytest.fixture
@@ -249,3 +251,46 @@ async def test_request_scoped_service(container):
     RequestContextContainer.set_execution_context(ctx2)
     instance3 = await container.get(RequestScopedService)
     assert instance1 is not instance3, "Request-scoped should not leak across requests."
+
+
+@pytest.mark.asyncio
+async def test_compiled_method_resolves_arguments(container):
+    @Injectable()
+    class GreetController:
+        def show(
+            self,
+            name: Annotated[str, Query("name")],
+            page: Annotated[int, Query("page", ParseIntPipe)],
+            id: Annotated[str, Param("id")],
+        ):
+            return {"text": f"hello {name}", "page": page, "id": id}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(_msg):
+        return None
+
+    scope = {
+        "type": "http",
+        "query_string": b"name=ada&page=3",
+        "headers": [],
+        "raw_path": b"/",
+        "method": "GET",
+        "server": ("localhost", 80),
+        "scheme": "http",
+        "path_params": {"id": "7"},
+    }
+    req = Request(scope, receive, send)
+    ctx = ExecutionContext(None, None, None, None, req, Response())
+    RequestContextContainer.set_execution_context(ctx)
+    try:
+        compiled = container.compile_method(GreetController, "show")
+        assert container.compile_method(GreetController, "show") is compiled
+        result = await container.get(GreetController, "show")
+        assert result == {"text": "hello ada", "page": 3, "id": "7"}
+        # the controller instance is captured after the first call
+        controller = await container.get(GreetController)
+        assert compiled._instance is controller
+    finally:
+        RequestContextContainer.get_instance().destroy()
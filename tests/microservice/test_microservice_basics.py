@@ -12,7 +12,14 @@ from nestipy.microservice.decorator import (
 from nestipy.microservice.dependency import Client, Payload, Ctx, Context, Headers, Pattern
 from nestipy.ioc.context_container import RequestContextContainer
 from nestipy.core.context.execution_context import ExecutionContext
-from nestipy.microservice.serializer import JSONSerializer
+from nestipy.microservice.exception import RpcException
+from nestipy.microservice.serializer import (
+    JSONSerializer,
+    MsgpackSerializer,
+    OrjsonSerializer,
+    detect_serializer,
+    negotiate_serializer,
+)
 from nestipy.microservice.client.option import Transport, TCPClientOption
 
 
@@ -26,6 +33,53 @@ async def test_json_serializer_roundtrip():
     assert restored == data
 
 
+@pytest.mark.asyncio
+async def test_bytes_serializers_encode_envelopes():
+    request = RpcRequest(data={"x": [1, 2]}, pattern="sum", response_topic="r")
+    response = RpcResponse(
+        pattern="r",
+        data=None,
+        status="error",
+        exception=RpcException(status_code=3, message="bad"),
+        headers={"k": "v"},
+    )
+    for serializer in (OrjsonSerializer(), MsgpackSerializer()):
+        payload = await serializer.encode_request(request)
+        assert isinstance(payload, bytes)
+        assert await serializer.decode_request(payload) == request
+        decoded = await serializer.decode_response(
+            await serializer.encode_response(response)
+        )
+        assert decoded.exception.status_code == 3
+        assert decoded.exception.message == "bad"
+        assert decoded.headers == {"k": "v"}
+
+    # orjson stays wire compatible with the ujson serializer
+    legacy = await JSONSerializer().decode_request(
+        await OrjsonSerializer().encode_request(request)
+    )
+    assert legacy == request
+
+
+@pytest.mark.asyncio
+async def test_serializer_detection_and_negotiation():
+    json_serializer = JSONSerializer()
+    msgpack_serializer = MsgpackSerializer()
+    packed = await msgpack_serializer.encode_request(RpcRequest(data=1, pattern="p"))
+    assert isinstance(detect_serializer(packed, json_serializer), MsgpackSerializer)
+    assert detect_serializer('{"a": 1}', msgpack_serializer).content_type == (
+        "application/json"
+    )
+    assert detect_serializer(b'{"a": 1}', json_serializer) is json_serializer
+
+    assert negotiate_serializer(None, msgpack_serializer).content_type == (
+        "application/json"
+    )
+    accept = "application/msgpack, application/json"
+    assert negotiate_serializer(accept, msgpack_serializer) is msgpack_serializer
+    assert negotiate_serializer(accept, json_serializer) is json_serializer
+
+
 def test_rpc_request_is_event():
     req = RpcRequest(data={"x": 1}, pattern="ping")
     assert req.is_event() is True
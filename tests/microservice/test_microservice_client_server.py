@@ -1,4 +1,7 @@
 import asyncio
+import contextlib
+import time
+import typing
 from dataclasses import asdict
 
 import pytest
@@ -6,14 +9,25 @@ import pytest
 from nestipy.microservice.client.base import ClientProxy, MicroserviceOption
 from nestipy.microservice.client.factory import ClientModuleFactory
 from nestipy.microservice.client.module import ClientsConfig, ClientsModule
+from nestipy.microservice.client.rabbitmq import RabbitMQClientProxy
 from nestipy.microservice.client.option import (
     Transport,
     TCPClientOption,
     RedisClientOption,
 )
-from nestipy.microservice.context import RpcRequest, RpcResponse, MICROSERVICE_CHANNEL
+from nestipy.microservice.context import (
+    CORRELATION_ID_HEADER,
+    MICROSERVICE_CHANNEL,
+    RpcRequest,
+    RpcResponse,
+)
 from nestipy.microservice.exception import RpcException, RPCErrorCode
 from nestipy.microservice.server.base import MicroServiceServer
+from nestipy.microservice.serializer import (
+    JSONSerializer,
+    MsgpackSerializer,
+    detect_serializer,
+)
 
 
 class FakeClientProxy(ClientProxy):
@@ -173,13 +187,19 @@ async def test_microservice_server_handle_request_not_found():
 
     slave = client.slave_instance
     assert slave is not None
-    assert slave.closed is True
     topic, payload = slave.published[0]
     assert topic == f"{MICROSERVICE_CHANNEL}:response:{request.response_topic}"
     data = await option.serializer.deserialize(payload)
     assert data["status"] == "error"
     assert data["exception"]["status_code"] == RPCErrorCode.NOT_FOUND
 
+    # the responder connection is shared and closed with the server
+    await server.handle_request(request)
+    assert client.slave_instance is slave
+    assert slave.closed is False
+    await server.close()
+    assert slave.closed is True
+
 
 @pytest.mark.asyncio
 async def test_microservice_server_listen_event():
@@ -201,3 +221,524 @@ async def test_microservice_server_listen_event():
 
     assert called["value"] is True
     assert client.subscribed == [f"{MICROSERVICE_CHANNEL}:{option.channel_key}"]
+
+
+@pytest.mark.asyncio
+async def test_microservice_server_listen_bounds_concurrency():
+    option = MicroserviceOption(
+        transport=Transport.CUSTOM,
+        max_in_flight=3,
+        pattern_concurrency={"slow": 1},
+    )
+    client = FakeClientProxy(option)
+    server = MicroServiceServer(client)
+    running = {"event": 0, "slow": 0}
+    peak = {"event": 0, "slow": 0}
+    handled = []
+
+    def make_handler(name):
+        async def handler(_server, request):
+            running[name] += 1
+            peak[name] = max(peak[name], running[name])
+            await asyncio.sleep(0.01)
+            running[name] -= 1
+            handled.append(request.data["i"])
+
+        return handler
+
+    server.subscribe("event", make_handler("event"))
+    server.subscribe("slow", make_handler("slow"))
+    client.listen_payloads = [
+        await option.serializer.serialize(
+            asdict(RpcRequest(data={"i": i}, pattern="slow" if i % 2 else "event"))
+        )
+        for i in range(10)
+    ]
+
+    await server.listen()
+
+    assert sorted(handled) == list(range(10))
+    assert peak["event"] + peak["slow"] <= 3
+    assert peak["event"] > 1
+    assert peak["slow"] == 1
+
+
+@pytest.mark.asyncio
+async def test_saturated_pattern_does_not_starve_other_patterns():
+    option = MicroserviceOption(
+        transport=Transport.CUSTOM,
+        max_in_flight=4,
+        pattern_concurrency={"slow": 1},
+    )
+    client = FakeClientProxy(option)
+    server = MicroServiceServer(client)
+    release = asyncio.Event()
+    handled = []
+
+    async def slow(_server, request):
+        await release.wait()
+        handled.append(request.data["i"])
+
+    async def fast(_server, request):
+        handled.append(request.data["i"])
+        release.set()
+
+    server.subscribe("slow", slow)
+    server.subscribe("fast", fast)
+    client.listen_payloads = [
+        await option.serializer.serialize(
+            asdict(RpcRequest(data={"i": i}, pattern="fast" if i == 5 else "slow"))
+        )
+        for i in range(6)
+    ]
+
+    # the burst on "slow" must leave a slot to read and run the "fast" message
+    await asyncio.wait_for(server.listen(), timeout=2)
+
+    assert handled[0] == 5
+    assert sorted(handled) == list(range(6))
+
+
+@pytest.mark.asyncio
+async def test_throttled_pattern_still_stops_reading_the_transport():
+    option = MicroserviceOption(
+        transport=Transport.CUSTOM,
+        max_in_flight=4,
+        pattern_concurrency={"hot": 1},
+    )
+    client = FakeClientProxy(option)
+    server = MicroServiceServer(client)
+    release = asyncio.Event()
+
+    async def hot(_server, _request):
+        await release.wait()
+
+    server.subscribe("hot", hot)
+    client.listen_payloads = [
+        await option.serializer.serialize(asdict(RpcRequest(data={}, pattern="hot")))
+        for _ in range(100)
+    ]
+    pulled = 0
+    payloads = client.listen_payloads
+
+    async def counting_listen():
+        nonlocal pulled
+        for payload in payloads:
+            pulled += 1
+            yield payload
+
+    client.listen = counting_listen
+    listening = asyncio.ensure_future(server.listen())
+    await asyncio.sleep(0.05)
+    # 4 slots and 4 waiting places, then the loop waits for a slot
+    assert pulled <= 9
+    assert server._dispatcher is not None and server._dispatcher.in_flight <= 8
+    release.set()
+    await asyncio.wait_for(listening, timeout=2)
+    assert pulled == 100
+
+
+@pytest.mark.asyncio
+async def test_microservice_server_close_drains_in_flight():
+    option = MicroserviceOption(transport=Transport.CUSTOM)
+    client = FakeClientProxy(option)
+    server = MicroServiceServer(client)
+    release = asyncio.Event()
+    done = []
+
+    async def handler(_server, _request):
+        await release.wait()
+        done.append(True)
+
+    server.subscribe("event", handler)
+    client.listen_payloads = [
+        await option.serializer.serialize(asdict(RpcRequest(data={}, pattern="event")))
+    ]
+
+    async def _never_ending():
+        for payload in client.listen_payloads:
+            yield payload
+        await asyncio.Event().wait()
+
+    client.listen = _never_ending
+    listener = asyncio.create_task(server.listen())
+    await asyncio.sleep(0.01)
+
+    closing = asyncio.create_task(server.close())
+    await asyncio.sleep(0.01)
+    assert not closing.done()
+    release.set()
+    await closing
+    assert done == [True]
+    assert client.closed is True
+    listener.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listener
+
+
+class LoopbackClientProxy(FakeClientProxy):
+    """Serves requests published by the client with a server sharing its queue."""
+
+    def __init__(self, option: MicroserviceOption):
+        super().__init__(option)
+        self.replies: asyncio.Queue = asyncio.Queue()
+        self.server = MicroServiceServer(self)
+
+    async def slave(self) -> "LoopbackClientProxy":
+        self.slave_instance = self
+        return self
+
+    async def _publish(self, topic, data):
+        self.published.append((topic, data))
+        if topic.startswith(f"{MICROSERVICE_CHANNEL}:response:"):
+            await self.replies.put(data)
+            return
+        serializer = detect_serializer(data, self.option.serializer)
+        request = await serializer.decode_request(data)
+        asyncio.create_task(self.server.handle_request(request))
+
+    async def send_response(self, topic, data):
+        await self._publish(topic, data)
+
+    async def listen_response(self, from_topic: str, timeout: int = 30) -> str:
+        return await self.replies.get()
+
+
+@pytest.mark.asyncio
+async def test_client_proxy_multiplexes_replies_on_one_channel():
+    option = MicroserviceOption(transport=Transport.CUSTOM, timeout=2)
+    client = LoopbackClientProxy(option)
+
+    async def echo(_server, request):
+        await asyncio.sleep(0.01 * (5 - request.data["i"]))
+        return {"i": request.data["i"]}
+
+    client.server.request_subscribe("echo", echo)
+
+    responses = await asyncio.gather(
+        *[client.send("echo", {"i": i}) for i in range(5)]
+    )
+
+    assert [r.data for r in responses] == [{"i": i} for i in range(5)]
+    assert all(CORRELATION_ID_HEADER in r.headers for r in responses)
+    assert client.subscribed == [f"{MICROSERVICE_CHANNEL}:response:{client._reply_topic}"]
+    assert client.unsubscribed == []
+    await client.close()
+
+
+class EchoingClientProxy(LoopbackClientProxy):
+    """Loops each request back on the reply channel, like a misbound queue."""
+
+    async def _publish(self, topic, data):
+        if not topic.startswith(f"{MICROSERVICE_CHANNEL}:response:"):
+            await self.replies.put(data)
+        await super()._publish(topic, data)
+
+
+@pytest.mark.asyncio
+async def test_client_proxy_ignores_requests_echoed_on_reply_channel():
+    option = MicroserviceOption(transport=Transport.CUSTOM, timeout=2)
+    client = EchoingClientProxy(option)
+
+    async def echo(_server, request):
+        return {"reply": request.data}
+
+    client.server.request_subscribe("echo", echo)
+    response = await client.send("echo", {"a": 1})
+    assert response.status == "success"
+    assert response.data == {"reply": {"a": 1}}
+    await client.close()
+
+
+class _FakeRabbitMessage:
+    def __init__(self, routing_key: str, body: bytes):
+        self.routing_key = routing_key
+        self.body = body
+
+    def process(self):
+        return contextlib.nullcontext()
+
+
+class _FakeRabbitExchange:
+    def __init__(self, name: str):
+        self.name = name
+        self.published: list[tuple[str, bytes]] = []
+
+    async def publish(self, message, routing_key):
+        self.published.append((routing_key, message.body))
+
+    async def delete(self):
+        pass
+
+
+class _FakeRabbitQueue:
+    def __init__(self, name, exclusive):
+        self.name = name
+        self.exclusive = exclusive
+        self.bound: list[str] = []
+        self.messages: list[_FakeRabbitMessage] = []
+
+    async def bind(self, exchange):
+        self.bound.append(exchange.name)
+
+    async def unbind(self, exchange):
+        self.bound.remove(exchange.name)
+
+    async def delete(self):
+        pass
+
+    @contextlib.asynccontextmanager
+    async def iterator(self):
+        async def _messages():
+            for message in self.messages:
+                yield message
+
+        yield _messages()
+
+
+class _FakeRabbitChannel:
+    def __init__(self):
+        self.queues: list[_FakeRabbitQueue] = []
+        self.exchanges: list[str] = []
+
+    async def declare_exchange(self, name, *_args, **_kwargs):
+        self.exchanges.append(name)
+        return _FakeRabbitExchange(name)
+
+    async def declare_queue(self, name=None, exclusive=False, **_kwargs):
+        queue = _FakeRabbitQueue(name, exclusive)
+        self.queues.append(queue)
+        return queue
+
+
+@pytest.mark.asyncio
+async def test_rabbitmq_reply_queue_is_bound_to_replies_only():
+    client = RabbitMQClientProxy(MicroserviceOption(transport=Transport.RABBITMQ))
+    client.channel = typing.cast(typing.Any, _FakeRabbitChannel())
+    channel = f"{MICROSERVICE_CHANNEL}:response:{client._reply_topic}"
+
+    await client.subscribe_replies(channel)
+    (queue,) = client.channel.queues
+    assert queue.exclusive is True
+    assert queue.bound == [f"{RabbitMQClientProxy.CHANGE}:{channel}"]
+
+    queue.messages = [
+        _FakeRabbitMessage(f"{MICROSERVICE_CHANNEL}:nestipy", b"request"),
+        _FakeRabbitMessage(channel, b"reply"),
+    ]
+    replies = [payload async for payload in client.listen_replies(channel)]
+    assert replies == [b"reply"]
+    assert queue.bound == []
+
+
+@pytest.mark.asyncio
+async def test_rabbitmq_responder_declares_each_response_exchange_once():
+    responder = RabbitMQClientProxy(MicroserviceOption(transport=Transport.RABBITMQ))
+    channel = _FakeRabbitChannel()
+    responder.channel = typing.cast(typing.Any, channel)
+    for data in ("a", "b"):
+        await responder.send_response("reply-topic", data)
+
+    assert channel.exchanges == [f"{RabbitMQClientProxy.CHANGE}:reply-topic"]
+    exchange = responder._response_exchanges["reply-topic"]
+    assert exchange.published == [("reply-topic", b"a"), ("reply-topic", b"b")]
+
+
+@pytest.mark.asyncio
+async def test_rabbitmq_broadcast_gives_each_subscriber_its_own_queue():
+    channel = _FakeRabbitChannel()
+    workers = []
+    for _ in range(2):
+        worker = RabbitMQClientProxy(MicroserviceOption(transport=Transport.RABBITMQ))
+        worker.channel = typing.cast(typing.Any, channel)
+        await worker.subscribe_all("backplane")
+        workers.append(worker)
+
+    broadcast = f"{RabbitMQClientProxy.CHANGE}:broadcast:backplane"
+    # one exclusive queue per worker, so that each gets every message
+    assert [queue.exclusive for queue in channel.queues] == [True, True]
+    assert [queue.bound for queue in channel.queues] == [[broadcast], [broadcast]]
+    assert [w.consumer_queue for w in workers] == channel.queues
+
+    await workers[0].publish_all("backplane", "batch")
+    exchange = workers[0]._broadcast_exchanges["backplane"]
+    assert exchange.name == broadcast
+    assert exchange.published == [("backplane", b"batch")]
+
+    await workers[1].unsubscribe()
+    assert channel.queues[1].bound == []
+
+
+@pytest.mark.asyncio
+async def test_msgpack_client_negotiates_with_server():
+    option = MicroserviceOption(
+        transport=Transport.CUSTOM, serializer=MsgpackSerializer(), timeout=2
+    )
+    client = LoopbackClientProxy(option)
+
+    async def echo(_server, request):
+        return {"echo": request.data}
+
+    client.server.request_subscribe("echo", echo)
+    response = await client.send("echo", {"a": 1})
+    assert response.data == {"echo": {"a": 1}}
+    _, request_payload = client.published[0]
+    assert isinstance(request_payload, bytes)
+    assert isinstance(client.published[-1][1], bytes)
+    await client.close()
+
+    # a server configured for msgpack answers legacy JSON callers in JSON
+    server = MicroServiceServer(FakeClientProxy(option))
+    server.request_subscribe("echo", echo)
+    await server.handle_request(
+        RpcRequest(data=1, pattern="echo", response_topic="legacy")
+    )
+    _, payload = server._pub_sub.slave_instance.published[-1]
+    assert (await JSONSerializer().decode_response(payload)).data == {"echo": 1}
+
+    with pytest.raises(ValueError):
+        MicroserviceOption(transport=Transport.TCP, serializer=MsgpackSerializer())
+
+
+class InMemoryStreamBroker:
+    """The subset of the redis client used by the stream mode."""
+
+    def __init__(self):
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+        self.acked: list[str] = []
+        self.groups: list[tuple[str, str]] = []
+        self.delivered = 0
+        self.deliveries: dict[str, int] = {}
+        self.delivered_at: dict[str, float] = {}
+
+    @property
+    def entries(self) -> list[tuple[str, dict]]:
+        return next(iter(self.streams.values()), [])
+
+    def _deliver(self, msg_id: str) -> None:
+        self.deliveries[msg_id] = self.deliveries.get(msg_id, 0) + 1
+        self.delivered_at[msg_id] = time.monotonic()
+
+    async def xgroup_create(self, name, group, id="$", mkstream=False):
+        self.groups.append((name, group))
+
+    async def xadd(self, name, fields, maxlen=None):
+        entries = self.streams.setdefault(name, [])
+        entries.append((f"{len(entries)}-0", fields))
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        (stream,) = streams
+        batch = self.streams.get(stream, [])[self.delivered : self.delivered + count]
+        self.delivered += len(batch)
+        if not batch:
+            await asyncio.sleep(block / 1000)
+            return []
+        for msg_id, _ in batch:
+            self._deliver(msg_id)
+        return [[stream, batch]]
+
+    async def xautoclaim(self, name, group, consumer, min_idle_time, count=None):
+        now = time.monotonic()
+        claimed = [
+            (msg_id, fields)
+            for msg_id, fields in self.streams.get(name, [])[: self.delivered]
+            if msg_id not in self.acked
+            and now - self.delivered_at[msg_id] >= min_idle_time / 1000
+        ][:count]
+        for msg_id, _ in claimed:
+            self._deliver(msg_id)
+        return ["0-0", claimed, []]
+
+    async def xpending_range(self, name, groupname, min, max, count):
+        return [{"message_id": min, "times_delivered": self.deliveries[min]}]
+
+    async def xack(self, name, group, *ids):
+        self.acked.extend(ids)
+
+    async def publish(self, channel, data):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_redis_stream_mode_acknowledges_handled_messages():
+    from nestipy.microservice.client.option import RedisStreamOption
+    from nestipy.microservice.client.redis import RedisClientProxy
+
+    option = MicroserviceOption(
+        transport=Transport.REDIS,
+        option=RedisClientOption(stream=RedisStreamOption(block_ms=10)),
+    )
+    proxy = RedisClientProxy(option)
+    proxy.broker = InMemoryStreamBroker()
+    proxy._mark_connected()
+    channel = f"{MICROSERVICE_CHANNEL}:{option.channel_key}"
+    await proxy.subscribe(channel)
+    assert proxy.broker.groups == [(channel, "nestipy")]
+
+    handled: list[int] = []
+    server = MicroServiceServer(proxy)
+
+    async def on_event(_server, request):
+        handled.append(request.data)
+
+    server.subscribe("tick", on_event)
+    for i in range(3):
+        await proxy.emit("tick", i)
+
+    task = asyncio.create_task(server.listen())
+    for _ in range(100):
+        if len(proxy.broker.acked) == 3:
+            break
+        await asyncio.sleep(0.01)
+    server._closing = True
+    task.cancel()
+    assert sorted(handled) == [0, 1, 2]
+    assert sorted(proxy.broker.acked) == ["0-0", "1-0", "2-0"]
+
+
+@pytest.mark.asyncio
+async def test_redis_stream_mode_redelivers_failures_then_dead_letters():
+    from nestipy.microservice.client.option import RedisStreamOption
+    from nestipy.microservice.client.redis import STREAM_FIELD, RedisClientProxy
+
+    option = MicroserviceOption(
+        transport=Transport.REDIS,
+        option=RedisClientOption(
+            stream=RedisStreamOption(block_ms=10, claim_idle_ms=20, max_deliveries=2)
+        ),
+    )
+    proxy = RedisClientProxy(option)
+    proxy.broker = InMemoryStreamBroker()
+    proxy._mark_connected()
+    channel = f"{MICROSERVICE_CHANNEL}:{option.channel_key}"
+    await proxy.subscribe(channel)
+
+    attempts: list[int] = []
+    server = MicroServiceServer(proxy)
+
+    async def on_event(_server, request):
+        attempts.append(request.data)
+        if request.data == 0:
+            raise RuntimeError("handler failed")
+
+    server.subscribe("tick", on_event)
+    await proxy.emit("tick", 0)
+    # a payload no serializer can decode
+    await proxy.broker.xadd(channel, {STREAM_FIELD: "not a request"})
+    await proxy.emit("tick", 2)
+
+    task = asyncio.create_task(server.listen())
+    dead_letter_stream = f"{channel}:dead"
+    for _ in range(200):
+        if proxy.broker.streams.get(dead_letter_stream):
+            break
+        await asyncio.sleep(0.01)
+    server._closing = True
+    task.cancel()
+
+    # the failing message was delivered again, then dead-lettered
+    assert attempts.count(0) == 2 and 2 in attempts
+    ((_, dead),) = proxy.broker.streams[dead_letter_stream]
+    assert dead["stream"] == channel and dead["id"] == "0-0"
+    # the invalid payload was dropped without stopping the loop
+    assert sorted(proxy.broker.acked) == ["0-0", "1-0", "2-0"]
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+
+import pytest
+
+from nestipy.web import RedisSSRCacheStore, SSRCache, SSRCacheEntry, SSRCacheStore
+
+
+class MemoryStore(SSRCacheStore):
+    def __init__(self) -> None:
+        self.entries: dict[str, SSRCacheEntry] = {}
+        self.locks: set[str] = set()
+
+    async def get(self, key: str) -> Optional[SSRCacheEntry]:
+        return self.entries.get(key)
+
+    async def set(self, key, entry, expire) -> None:
+        self.entries[key] = entry
+
+    async def acquire(self, key: str, timeout: float) -> bool:
+        if key in self.locks:
+            return False
+        self.locks.add(key)
+        return True
+
+    async def release(self, key: str) -> None:
+        self.locks.discard(key)
+
+
+class Renderer:
+    def __init__(self, delay: float = 0.01) -> None:
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"<p>{self.calls}</p>"
+
+
+@pytest.mark.asyncio
+async def test_ssr_cache_coalesces_misses_and_bounds_bytes():
+    cache = SSRCache(max_bytes=20)
+    render = Renderer()
+    bodies = await asyncio.gather(*(cache.get_or_render("/", render) for _ in range(5)))
+    assert render.calls == 1
+    assert set(bodies) == {b"<p>1</p>"}
+
+    await cache.get_or_render("/a", Renderer())
+    await cache.get_or_render("/b", Renderer())
+    # 3 pages of 8 bytes do not fit in 20 bytes, the least recently used goes
+    assert len(cache) == 2 and cache.size == 16
+    assert await cache.get_or_render("/", render) == b"<p>2</p>"
+
+
+@pytest.mark.asyncio
+async def test_ssr_cache_serves_stale_while_revalidating():
+    cache = SSRCache(ttl=0.05, stale_ttl=10)
+    render = Renderer()
+    assert await cache.get_or_render("/", render) == b"<p>1</p>"
+    await asyncio.sleep(0.06)
+    # stale entry served at once, refreshed in background
+    assert await cache.get_or_render("/", render) == b"<p>1</p>"
+    await asyncio.sleep(0.05)
+    assert render.calls == 2
+    assert await cache.get_or_render("/", render) == b"<p>2</p>"
+
+
+@pytest.mark.asyncio
+async def test_ssr_cache_keys_and_shared_store():
+    cache = SSRCache(vary_headers=["Accept-Language"], vary_cookies=["theme"])
+    fr = cache.key("/", {"accept-language": "fr"}, {"theme": "dark"})
+    assert fr != cache.key("/", {"accept-language": "en"}, {"theme": "dark"})
+    assert fr == cache.key("/", {"accept-language": "fr", "x": "1"}, {"theme": "dark"})
+
+    store = MemoryStore()
+    first, second = SSRCache(store=store), SSRCache(store=store)
+    render = Renderer(delay=0.1)
+    # the second worker waits for the page rendered by the first
+    bodies = await asyncio.gather(
+        first.get_or_render("/", render), second.get_or_render("/", render)
+    )
+    assert bodies == [b"<p>1</p>", b"<p>1</p>"]
+    assert render.calls == 1
+    assert not store.locks
+
+
+@pytest.mark.asyncio
+async def test_ssr_cache_stops_waiting_when_lock_holder_fails():
+    store = MemoryStore()
+    first, second = SSRCache(store=store), SSRCache(store=store, lock_timeout=10)
+
+    async def failing() -> str:
+        await asyncio.sleep(0.1)
+        raise RuntimeError("render failed")
+
+    render = Renderer()
+    started = time.monotonic()
+    results = await asyncio.gather(
+        first.get_or_render("/", failing),
+        second.get_or_render("/", render),
+        return_exceptions=True,
+    )
+    assert isinstance(results[0], RuntimeError)
+    # the second worker renders once the lock is released, not after lock_timeout
+    assert results[1] == b"<p>1</p>"
+    assert time.monotonic() - started < 1
+    assert render.calls == 1 and not store.locks
+
+
+@pytest.mark.asyncio
+async def test_ssr_cache_lookup_refreshes_touches_and_waits_for_streams():
+    cache = SSRCache(max_entries=2, ttl=0.05, stale_ttl=10)
+    await cache.put("/a", "<p>a</p>")
+    await cache.put("/b", "<p>b</p>")
+    # a page served by lookup is recently used, /b goes first
+    assert await cache.lookup("/a") == b"<p>a</p>"
+    await cache.put("/c", "<p>c</p>")
+    assert await cache.lookup("/b") is None and await cache.lookup("/a") is not None
+
+    await asyncio.sleep(0.06)
+    render = Renderer()
+    assert await cache.lookup("/a", render) == b"<p>a</p>"
+    await asyncio.sleep(0.05)
+    assert render.calls == 1
+    assert await cache.lookup("/a") == b"<p>1</p>"
+
+    claim = await cache.claim("/d")
+    assert claim is not None and await cache.claim("/d") is None
+    waiting = asyncio.ensure_future(cache.lookup("/d"))
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+    claim.set_result(b"<p>d</p>")
+    assert await waiting == b"<p>d</p>"
+    assert await cache.claim("/d") is not None
+
+
+@pytest.mark.asyncio
+async def test_ssr_cache_streamed_renders_take_the_shared_lock():
+    store = MemoryStore()
+    first, second = SSRCache(store=store), SSRCache(store=store)
+    claim = await first.claim("/")
+    assert claim is not None and not claim.done() and store.locks == {"/"}
+
+    waiting = asyncio.ensure_future(second.claim("/"))
+    await asyncio.sleep(0.1)
+    # the second worker waits for the page streamed by the first
+    assert not waiting.done()
+    claim.set_result(await first.put("/", "<p>streamed</p>"))
+    other = await waiting
+    assert other is not None and other.result() == b"<p>streamed</p>"
+    await first.close()
+    assert not store.locks
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def eval(self, _script, _numkeys, key, token):
+        if self.values.get(key) != token:
+            return 0
+        del self.values[key]
+        return 1
+
+
+@pytest.mark.asyncio
+async def test_redis_store_releases_only_its_own_lock():
+    redis = FakeRedis()
+    first = RedisSSRCacheStore("redis://localhost")
+    second = RedisSSRCacheStore("redis://localhost")
+    first._redis = second._redis = redis
+
+    assert await first.acquire("/", 10)
+    assert not await second.acquire("/", 10)
+    # the lock of the first worker expired, the second worker took it
+    redis.values.clear()
+    assert await second.acquire("/", 10)
+    await first.release("/")
+    assert redis.values == {"nestipy:ssr:lock:/": second._tokens["/"]}
+    await second.release("/")
+    assert redis.values == {}
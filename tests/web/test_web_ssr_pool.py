@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+
+from nestipy.web.ssr import NodeRenderer, SSRRenderError, _NodeWorker
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node required")
+
+ENTRY = """
+console.log('noise on stdout');
+export async function render(url) {
+  if (url === '/crash') process.exit(3);
+  if (url === '/slow') return new Promise(() => {});
+  if (url === '/fail') throw new Error('boom');
+  if (url === '/big') return { html: 'x'.repeat(16384) };
+  return { html: `<p>${url} ${process.pid}</p>` };
+}
+"""
+
+
+def _renderer(tmp_path: Path, **kwargs) -> NodeRenderer:
+    entry = tmp_path / "entry-server.mjs"
+    entry.write_text(ENTRY, encoding="utf-8")
+    return NodeRenderer(str(entry), **kwargs)
+
+
+def _pid(html: str | None) -> str:
+    assert html is not None
+    return html.rsplit(" ", 1)[1].removesuffix("</p>")
+
+
+@pytest.mark.asyncio
+async def test_node_pool_reuses_and_recycles_workers(tmp_path: Path):
+    renderer = _renderer(tmp_path, pool_size=1, max_renders=3)
+    try:
+        pages = await asyncio.gather(*(renderer.render(f"/p{i}") for i in range(3)))
+        assert [page.split(" ")[0] for page in pages] == ["<p>/p0", "<p>/p1", "<p>/p2"]
+        # one worker rendered the three pages, then was recycled
+        assert len({_pid(page) for page in pages}) == 1
+        assert _pid(await renderer.render("/next")) != _pid(pages[0])
+        with pytest.raises(SSRRenderError, match="boom"):
+            await renderer.render("/fail")
+    finally:
+        await renderer.close()
+
+
+@pytest.mark.asyncio
+async def test_node_pool_restarts_crashed_and_stuck_workers(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("NESTIPY_WEB_SSR_TIMEOUT", "1")
+    renderer = _renderer(tmp_path, pool_size=1)
+    try:
+        first = _pid(await renderer.render("/"))
+        with pytest.raises(SSRRenderError, match="exited"):
+            await renderer.render("/crash")
+        second = _pid(await renderer.render("/"))
+        assert second != first
+        with pytest.raises(SSRRenderError, match="timed out"):
+            await renderer.render("/slow")
+        assert _pid(await renderer.render("/")) != second
+    finally:
+        await renderer.close()
+
+
+@pytest.mark.asyncio
+async def test_node_pool_kills_worker_when_reply_is_unreadable(
+    tmp_path: Path, monkeypatch
+):
+    monkeypatch.setenv("NESTIPY_WEB_SSR_TIMEOUT", "30")
+    monkeypatch.setattr(_NodeWorker, "STREAM_LIMIT", 4096)
+    renderer = _renderer(tmp_path, pool_size=1)
+    try:
+        first = _pid(await renderer.render("/"))
+        with pytest.raises(SSRRenderError, match="exited"):
+            await asyncio.wait_for(renderer.render("/big"), 5)
+        assert _pid(await renderer.render("/")) != first
+    finally:
+        await renderer.close()
+
+
+@pytest.mark.asyncio
+async def test_node_pool_close_kills_retired_busy_workers(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("NESTIPY_WEB_SSR_TIMEOUT", "30")
+    renderer = _renderer(tmp_path, pool_size=1, max_renders=2)
+    slow = asyncio.create_task(renderer.render("/slow"))
+    await asyncio.sleep(0.5)
+    # the second render retires the worker, still busy with the slow one
+    await renderer.render("/")
+    await renderer.close()
+    with pytest.raises(SSRRenderError, match="exited"):
+        await asyncio.wait_for(slow, 5)
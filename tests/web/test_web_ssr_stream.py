@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+
+from nestipy.common import Module
+from nestipy.core import NestipyConfig, NestipyFactory
+from nestipy.testing import TestClient
+from nestipy.web.ssr import NodeRenderer
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node required")
+
+ENTRY = """
+const wait = () => new Promise((resolve) => setTimeout(resolve, 5));
+let streams = 0;
+export function render(url) {
+  return `<h1>${url}</h1>`;
+}
+export async function* renderStream(url) {
+  streams += 1;
+  if (url === '/count') {
+    await new Promise((resolve) => setTimeout(resolve, 100));
+    yield `<p>${streams}</p>`;
+    return;
+  }
+  yield '<h1>';
+  await wait();
+  yield url;
+  await wait();
+  yield '</h1>';
+}
+"""
+
+
+def _entry(tmp_path: Path) -> Path:
+    entry = tmp_path / "ssr" / "entry-server.mjs"
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    entry.write_text(ENTRY, encoding="utf-8")
+    return entry
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pool_size", [0, 1])
+async def test_node_renderer_streams_chunks(tmp_path: Path, pool_size: int):
+    renderer = NodeRenderer(str(_entry(tmp_path)), pool_size=pool_size)
+    try:
+        chunks = [chunk async for chunk in renderer.render_stream("/docs")]
+        assert "".join(chunks) == "<h1>/docs</h1>"
+        if pool_size:
+            # every chunk of the entry is forwarded on its own
+            assert chunks == ["<h1>", "/docs", "</h1>"]
+    finally:
+        await renderer.close()
+
+
+@Module()
+class StreamModule:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_web_static_streams_ssr_pages(tmp_path: Path, monkeypatch):
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    (dist / "index.html").write_text(
+        '<html><head></head><body><div id="root"></div></body></html>'
+    )
+    monkeypatch.setenv("NESTIPY_WEB_DIST", str(dist))
+    monkeypatch.setenv("NESTIPY_WEB_SSR", "1")
+    monkeypatch.setenv("NESTIPY_WEB_SSR_RUNTIME", "node")
+    monkeypatch.setenv("NESTIPY_WEB_SSR_ENTRY", str(_entry(tmp_path)))
+    monkeypatch.setenv("NESTIPY_WEB_SSR_STREAM", "1")
+    monkeypatch.setenv("NESTIPY_WEB_SSR_POOL", "1")
+    app = NestipyFactory.create(StreamModule, NestipyConfig())
+    await app.setup()
+    try:
+        response = await TestClient(app).get("/page")
+        assert response.status() == 200
+        # the head is flushed before the render output
+        assert response.body() == b'<html><head></head><body><div id="root">'
+        body = b"".join(m.get("body", b"") for m in response.raw_response[1:])
+        assert body == (
+            b'<html><head></head><body><div id="root"><h1>/page</h1></div></body></html>'
+        )
+    finally:
+        await app._close_web_ssr_renderer()
+
+
+@pytest.mark.asyncio
+async def test_web_static_coalesces_streamed_misses(tmp_path: Path, monkeypatch):
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    (dist / "index.html").write_text(
+        '<html><head></head><body><div id="root"></div></body></html>'
+    )
+    monkeypatch.setenv("NESTIPY_WEB_DIST", str(dist))
+    monkeypatch.setenv("NESTIPY_WEB_SSR", "1")
+    monkeypatch.setenv("NESTIPY_WEB_SSR_RUNTIME", "node")
+    monkeypatch.setenv("NESTIPY_WEB_SSR_ENTRY", str(_entry(tmp_path)))
+    monkeypatch.setenv("NESTIPY_WEB_SSR_STREAM", "1")
+    monkeypatch.setenv("NESTIPY_WEB_SSR_POOL", "1")
+    monkeypatch.setenv("NESTIPY_WEB_SSR_CACHE", "10")
+    app = NestipyFactory.create(StreamModule, NestipyConfig())
+    await app.setup()
+    try:
+        client = TestClient(app)
+        responses = await asyncio.gather(*(client.get("/count") for _ in range(3)))
+        # one render streamed, the other requests got its page
+        for response in responses:
+            body = b"".join(m.get("body", b"") for m in response.raw_response[1:])
+            assert body == (
+                b'<html><head></head><body><div id="root"><p>1</p></div></body></html>'
+            )
+    finally:
+        await app._close_web_ssr_renderer()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+
+from nestipy.common.http_ import Request, Response
+from nestipy.core.web.static_assets import StaticAssetIndex, send_asset
+
+
+def _request(headers: dict[str, str]) -> Request:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+    }
+    return Request(scope, receive, receive)
+
+
+def _headers(res: Response) -> dict[str, str]:
+    return {k.lower(): v for k, v in res.headers()}
+
+
+def _dist(tmp_path: Path) -> Path:
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_text("<html></html>")
+    (tmp_path / "assets" / "app.js").write_text("console.log('nestipy');\n" * 200)
+    (tmp_path / "assets" / "app.css").write_text("body{}")
+    (tmp_path / "assets" / "app.css.br").write_bytes(b"brotli-bytes")
+    return tmp_path
+
+
+def test_asset_index_precompresses_and_uses_siblings(tmp_path: Path):
+    index = StaticAssetIndex(str(_dist(tmp_path)), lambda rel: "no-cache").build()
+
+    assert len(index) == 3
+    assert index.lookup("assets/app.css.br") is None
+    script = index.lookup("assets/app.js")
+    assert script is not None and script.mime_type in (
+        "text/javascript",
+        "application/javascript",
+    )
+    assert gzip.decompress(script.variants["gzip"]) == script.content
+    assert script.negotiate("br;q=0, gzip;q=0.5") == ("gzip", script.variants["gzip"])
+    assert script.negotiate("identity") == (None, script.content)
+
+    style = index.lookup("assets/app.css")
+    # too small to compress, the build sibling is still served
+    assert style is not None and style.variants == {"br": b"brotli-bytes"}
+    assert style.negotiate("gzip, br")[0] == "br"
+
+
+@pytest.mark.asyncio
+async def test_send_asset_negotiates_and_revalidates(tmp_path: Path):
+    index = StaticAssetIndex(str(_dist(tmp_path)), lambda rel: "public").build()
+    script = index.lookup("assets/app.js")
+    assert script is not None
+
+    res = await send_asset(script, _request({"accept-encoding": "gzip"}), Response())
+    headers = _headers(res)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["cache-control"] == "public"
+    assert res.content() == script.variants["gzip"]
+
+    cached = await send_asset(
+        script, _request({"if-none-match": headers["etag"]}), Response()
+    )
+    assert cached.status_code() == 304
+    assert cached.content() == b""
+
+
+def test_asset_index_watch_mode_reloads_changed_files(tmp_path: Path):
+    dist = _dist(tmp_path)
+    index = StaticAssetIndex(str(dist), lambda rel: None, watch=True).build()
+    page = index.lookup("index.html")
+    assert page is not None and page.content == b"<html></html>"
+
+    (dist / "index.html").write_text("<html>v2</html>")
+    stat = os.stat(dist / "index.html")
+    os.utime(dist / "index.html", ns=(stat.st_atime_ns, page.mtime_ns + 1_000_000))
+    (dist / "new.txt").write_text("new")
+
+    reloaded = index.lookup("index.html")
+    assert reloaded is not None and reloaded.content == b"<html>v2</html>"
+    assert reloaded.etag != page.etag
+    assert index.lookup("new.txt") is not None
+    assert index.lookup("../outside.txt") is None
+
+
+@pytest.mark.asyncio
+async def test_send_asset_serves_ranges_from_memory(tmp_path: Path):
+    index = StaticAssetIndex(str(_dist(tmp_path)), lambda rel: None).build()
+    page = index.lookup("index.html")
+    assert page is not None and page.content is not None
+
+    part = await send_asset(page, _request({"range": "bytes=1-4"}), Response())
+    assert part.status_code() == 206
+    assert part.content() == page.content[1:5]
+    assert _headers(part)["content-range"] == f"bytes 1-4/{page.size}"
+
+    stale = await send_asset(
+        page, _request({"range": "bytes=1-4", "if-range": '"other"'}), Response()
+    )
+    assert stale.status_code() == 200
+    assert stale.content() == page.content
+
+    beyond = await send_asset(page, _request({"range": "bytes=999-"}), Response())
+    assert beyond.status_code() == 416
+
+
+def test_asset_index_skips_symlinks_leading_outside(tmp_path: Path):
+    (tmp_path / "dist").mkdir()
+    dist = _dist(tmp_path / "dist")
+    secret = tmp_path / "secret.txt"
+    secret.write_text("secret")
+    (dist / "leak.txt").symlink_to(secret)
+
+    index = StaticAssetIndex(str(dist), lambda rel: None).build()
+    assert index.lookup("leak.txt") is None
+    assert index.lookup("index.html") is not None
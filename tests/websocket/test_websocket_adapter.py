@@ -95,7 +95,7 @@ async def test_websocket_adapter_emit():
     sid = "client-1"
     client = Websocket(None, sid, None, scope, receive, send)
     adapter._client_info[sid] = client
-    adapter._connected.append(sid)
+    adapter._connected.add(sid)
 
     await adapter.emit("event", {"a": 1})
 
@@ -0,0 +1,260 @@
+import asyncio
+
+import orjson
+import pytest
+
+from nestipy.microservice.client.base import ClientProxy, MicroserviceOption
+from nestipy.websocket import (
+    ClientProxyBackplane,
+    IoAdapter,
+    SocketIoAdapter,
+    WebsocketAdapter,
+)
+
+
+class InMemoryBus:
+    def __init__(self):
+        self.subscribers: list["BusClientProxy"] = []
+        self.published: list[str] = []
+
+
+class BusClientProxy(ClientProxy):
+    def __init__(self, bus: InMemoryBus):
+        super().__init__(MicroserviceOption())
+        self.bus = bus
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def slave(self) -> "BusClientProxy":
+        return BusClientProxy(self.bus)
+
+    async def _connect(self):
+        self._mark_connected()
+
+    async def subscribe(self, *args, **kwargs):
+        self.bus.subscribers.append(self)
+
+    async def unsubscribe(self, *args):
+        self.bus.subscribers.remove(self)
+
+    async def _publish(self, topic, data):
+        self.bus.published.append(data)
+        for subscriber in self.bus.subscribers:
+            subscriber.queue.put_nowait(data)
+
+    async def send_response(self, topic, data):
+        pass
+
+    async def listen_response(self, from_topic: str, timeout: int = 30) -> str:
+        return ""
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def _close(self):
+        self._mark_disconnected()
+
+
+class FakeSocket:
+    def __init__(self, path: str):
+        self.scope = {"type": "websocket", "path": path}
+        self.sid = ""
+        self.sent: list[dict] = []
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.task: asyncio.Future | None = None
+
+    async def send(self, message: dict) -> None:
+        self.sent.append(message)
+
+    async def receive(self) -> dict:
+        return await self.inbox.get()
+
+    def payloads(self) -> list:
+        return [
+            orjson.loads(m.get("bytes") or m.get("text"))
+            for m in self.sent
+            if m["type"] == "websocket.send"
+        ]
+
+    async def disconnect(self) -> None:
+        await self.inbox.put({"type": "websocket.disconnect"})
+        await self.task
+
+
+async def _flush() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def _connect(adapter: WebsocketAdapter, path: str = "/ws") -> FakeSocket:
+    socket = FakeSocket(path)
+    socket.task = asyncio.ensure_future(
+        adapter(socket.scope, socket.receive, socket.send)
+    )
+    await _flush()
+    # sids are prefixed by worker when a backplane is used
+    socket.sid = next(
+        sid
+        for sid, client in adapter._client_info.items()
+        if client.scope is socket.scope
+    )
+    return socket
+
+
+def _workers(bus: InMemoryBus, **kwargs) -> list[WebsocketAdapter]:
+    return [
+        WebsocketAdapter(
+            path="/ws", backplane=ClientProxyBackplane(BusClientProxy(bus), **kwargs)
+        )
+        for _ in range(2)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_emits_reach_the_clients_of_other_workers_once():
+    bus = InMemoryBus()
+    first, second = _workers(bus)
+    alice = await _connect(first)
+    bob = await _connect(second)
+    carol = await _connect(second, path="/ws/chat")
+    await second.join(bob.sid, "news")
+
+    await first.broadcast("all", {"n": 1})
+    await first.emit("update", {"n": 2}, room="news")
+    await first.emit("chat", {"n": 3}, namespace="/chat")
+    await first.emit("dm", '{"n": 4}', to=carol.sid)
+    await _flush()
+
+    assert alice.payloads() == [{"n": 1}]
+    assert bob.payloads() == [{"n": 1}, {"n": 2}]
+    assert carol.payloads() == [{"n": 1}, {"n": 3}, {"n": 4}]
+    # text payloads stay text frames across workers
+    assert carol.sent[-1] == {"type": "websocket.send", "text": '{"n": 4}'}
+    # the emits of one tick went out as one batch
+    assert len(bus.published) == 1
+    assert len(orjson.loads(bus.published[0])["m"]) == 4
+
+    # a transport delivering the batch again does not duplicate emits
+    second._backplane.proxy.queue.put_nowait(bus.published[0])
+    await _flush()
+    assert len(bob.payloads()) == 2
+
+    for socket in (alice, bob, carol):
+        await socket.disconnect()
+    for adapter in (first, second):
+        await adapter.close()
+
+
+@pytest.mark.asyncio
+async def test_emits_to_local_sids_skip_the_backplane():
+    bus = InMemoryBus()
+    first, second = _workers(bus, batch_size=1)
+    alice = await _connect(first)
+    bob = await _connect(second)
+
+    await first.emit("dm", {"n": 1}, to=alice.sid)
+    await _flush()
+    assert bus.published == []
+    assert alice.payloads() == [{"n": 1}]
+
+    await first.emit("dm", {"n": 2}, to=[alice.sid, bob.sid])
+    await _flush()
+    assert len(bus.published) == 1
+    assert bob.payloads() == [{"n": 2}]
+    assert alice.payloads() == [{"n": 1}, {"n": 2}]
+    assert alice.sid != bob.sid and alice.sid.startswith(first._sid_prefix)
+
+    for socket in (alice, bob):
+        await socket.disconnect()
+    for adapter in (first, second):
+        await adapter.close()
+
+
+class FakeManager:
+    def __init__(self, sids):
+        self.sids = set(sids)
+
+    def is_connected(self, sid, namespace):
+        return sid in self.sids
+
+
+class FakeAsyncServer:
+    def __init__(self, sids=()):
+        self.manager = FakeManager(sids)
+        self.emitted = []
+
+    async def emit(
+        self,
+        event,
+        data=None,
+        to=None,
+        room=None,
+        skip_sid=None,
+        namespace=None,
+        callback=None,
+        ignore_queue=False,
+    ):
+        self.emitted.append((event, data, to, skip_sid, namespace))
+
+
+@pytest.mark.asyncio
+async def test_socketio_adapter_relays_emits_to_other_workers():
+    bus = InMemoryBus()
+    first_io, second_io = FakeAsyncServer(["a"]), FakeAsyncServer(["b"])
+    first, second = (
+        SocketIoAdapter(io, backplane=ClientProxyBackplane(BusClientProxy(bus)))
+        for io in (first_io, second_io)
+    )
+    await second._ensure_backplane()
+
+    await first.emit("dm", {"n": 1}, to="a")
+    await first.emit("news", {"n": 2}, room="room", skip_sid="a", namespace="/chat")
+    await _flush()
+
+    assert first_io.emitted == [
+        ("dm", {"n": 1}, "a", None, None),
+        ("news", {"n": 2}, None, "a", "/chat"),
+    ]
+    assert second_io.emitted == [("news", {"n": 2}, ["room"], ["a"], "/chat")]
+    for adapter in (first, second):
+        await adapter.close()
+
+
+class RelaylessAdapter(IoAdapter):
+    def on(self, event, namespace=None):
+        return lambda handler: handler
+
+    def emit(self, event, data=None, to=None, room=None, skip_sid=None, **_kwargs):
+        pass
+
+    def on_connect(self):
+        return lambda handler: handler
+
+    def on_message(self):
+        return lambda handler: handler
+
+    def on_disconnect(self):
+        return lambda handler: handler
+
+    def broadcast(self, event, data):
+        pass
+
+    async def join(self, sid, room, namespace=None):
+        pass
+
+    async def leave(self, sid, room, namespace=None):
+        pass
+
+    async def __call__(self, scope, receive, send) -> bool:
+        return False
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_adapter_without_relay_support_ignores_its_backplane():
+    bus = InMemoryBus()
+    adapter = RelaylessAdapter(backplane=ClientProxyBackplane(BusClientProxy(bus)))
+    assert await adapter._ensure_backplane() is False
+    assert adapter._backplane is None and bus.subscribers == []
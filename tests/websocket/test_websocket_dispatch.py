@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from nestipy.websocket import WebsocketAdapter
+
+
+class FakeSocket:
+    def __init__(self):
+        self.scope = {"type": "websocket", "path": "/ws"}
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.reads = 0
+
+    async def send(self, message: dict) -> None:
+        pass
+
+    async def receive(self) -> dict:
+        message = await self.inbox.get()
+        self.reads += 1
+        return message
+
+    def push(self, event: str, data: str) -> None:
+        self.inbox.put_nowait({"type": "websocket.receive", "text": f"{event}:{data}"})
+
+
+def _preprocess(payload, message):
+    return tuple(payload.split(":", 1))
+
+
+async def _flush() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dispatch_keeps_order_per_event():
+    adapter = WebsocketAdapter(
+        path="/ws", preprocess_payload=_preprocess, max_concurrency=4
+    )
+    release = asyncio.Event()
+    handled = []
+
+    @adapter.on("slow")
+    async def slow(event, client, data):
+        await release.wait()
+        handled.append((event, data, client.data, client.message.seq))
+
+    @adapter.on("fast")
+    async def fast(event, client, data):
+        handled.append((event, data, client.data, client.message.seq))
+
+    socket = FakeSocket()
+    task = asyncio.ensure_future(adapter(socket.scope, socket.receive, socket.send))
+    for event, data in [("slow", "a"), ("fast", "b"), ("slow", "c"), ("fast", "d")]:
+        socket.push(event, data)
+    await _flush()
+
+    # fast messages are not stuck behind the slow handler
+    assert handled == [("fast", "b", "b", 1), ("fast", "d", "d", 3)]
+    release.set()
+    await _flush()
+    assert handled[2:] == [("slow", "a", "a", 0), ("slow", "c", "c", 2)]
+    # the connection itself is not mutated by the messages
+    connection = next(iter(adapter._client_info.values()))
+    assert connection.data is None and connection.message is None
+
+    socket.inbox.put_nowait({"type": "websocket.disconnect"})
+    assert await task is True
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight_stops_reading_the_connection():
+    adapter = WebsocketAdapter(
+        path="/ws", preprocess_payload=_preprocess, max_concurrency=2, max_in_flight=3
+    )
+    release = asyncio.Event()
+    running = []
+
+    @adapter.on("job")
+    async def job(event, client, data):
+        running.append(data)
+        await release.wait()
+
+    socket = FakeSocket()
+    task = asyncio.ensure_future(adapter(socket.scope, socket.receive, socket.send))
+    for n in range(5):
+        socket.push("job", str(n))
+    await _flush()
+
+    # one message of the key runs, two wait for it, the rest are not read
+    assert running == ["0"]
+    assert socket.reads == 4
+    assert socket.inbox.qsize() == 1
+
+    release.set()
+    socket.inbox.put_nowait({"type": "websocket.disconnect"})
+    # pending messages are handled before the connection is released
+    assert await task is True
+    assert running == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_connection_still_disconnects_the_client():
+    adapter = WebsocketAdapter(
+        path="/ws", preprocess_payload=_preprocess, max_concurrency=4
+    )
+    disconnected = []
+
+    @adapter.on("slow")
+    async def slow(event, client, data):
+        await asyncio.Event().wait()
+
+    @adapter.on_disconnect()
+    async def on_disconnect(event, client, data):
+        disconnected.append(client.sid)
+
+    socket = FakeSocket()
+    task = asyncio.ensure_future(adapter(socket.scope, socket.receive, socket.send))
+    await _flush()
+    socket.push("slow", "a")
+    socket.inbox.put_nowait({"type": "websocket.disconnect"})
+    await _flush()
+    # cancelled while waiting for the pending handler
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert len(disconnected) == 1
+    assert not adapter._connected and not adapter._client_info
+    assert not adapter._outboxes
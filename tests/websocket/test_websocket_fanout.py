@@ -0,0 +1,140 @@
+import asyncio
+
+import orjson
+import pytest
+
+from nestipy.websocket.adapter.websocket import (
+    SLOW_CONSUMER_CLOSE_CODE,
+    WebsocketAdapter,
+)
+
+
+class FakeSocket:
+    def __init__(self, path: str = "/ws", slow: bool = False):
+        self.scope = {"type": "websocket", "path": path}
+        self.sid = str(id(self.scope))
+        self.sent: list[dict] = []
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.gate = asyncio.Event()
+        if not slow:
+            self.gate.set()
+        self.task: asyncio.Future | None = None
+
+    async def send(self, message: dict) -> None:
+        if message["type"] == "websocket.send":
+            await self.gate.wait()
+        self.sent.append(message)
+
+    async def receive(self) -> dict:
+        return await self.inbox.get()
+
+    def payloads(self) -> list:
+        return [
+            orjson.loads(m.get("bytes") or m.get("text"))
+            for m in self.sent
+            if m["type"] == "websocket.send"
+        ]
+
+    async def disconnect(self) -> None:
+        await self.inbox.put({"type": "websocket.disconnect"})
+        await self.task
+
+
+async def _connect(adapter: WebsocketAdapter, **kwargs) -> FakeSocket:
+    socket = FakeSocket(**kwargs)
+    socket.task = asyncio.ensure_future(
+        adapter(socket.scope, socket.receive, socket.send)
+    )
+    for _ in range(3):
+        await asyncio.sleep(0)
+    return socket
+
+
+async def _flush() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_emit_targets_rooms_and_namespaces():
+    adapter = WebsocketAdapter(path="/ws")
+    alice = await _connect(adapter)
+    bob = await _connect(adapter, path="/ws/chat")
+    carol = await _connect(adapter, path="/ws/chat")
+    await adapter.join(alice.sid, "news")
+    await adapter.join(bob.sid, "news")
+
+    await adapter.emit("update", {"n": 1}, room="news")
+    await adapter.emit("chat", {"n": 2}, namespace="/chat", skip_sid=carol.sid)
+    await adapter.broadcast("all", {"n": 3})
+    await _flush()
+
+    assert alice.payloads() == [{"n": 1}, {"n": 3}]
+    assert bob.payloads() == [{"n": 1}, {"n": 2}, {"n": 3}]
+    assert carol.payloads() == [{"n": 3}]
+    # the payload is encoded once for every recipient
+    assert alice.sent[-1]["bytes"] is bob.sent[-1]["bytes"]
+
+    await bob.disconnect()
+    assert adapter.rooms(alice.sid) == {"news"}
+    assert adapter._rooms == {"news": {alice.sid}}
+    assert adapter._namespaces["/chat"] == {carol.sid}
+    for socket in (alice, carol):
+        await socket.disconnect()
+    assert not adapter._connected and not adapter._rooms and not adapter._outboxes
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_does_not_stall_broadcast_and_drops():
+    adapter = WebsocketAdapter(path="/ws", max_queue_size=2, slow_consumer="drop")
+    slow = await _connect(adapter, slow=True)
+    fast = await _connect(adapter)
+
+    for n in range(5):
+        await adapter.emit("tick", {"n": n})
+        await _flush()
+
+    assert fast.payloads() == [{"n": n} for n in range(5)]
+    # one message is being sent, two are queued, the others were dropped
+    assert adapter.queue_size(slow.sid) == 2
+    assert adapter._outboxes[slow.sid].dropped == 2
+    slow.gate.set()
+    await _flush()
+    assert slow.payloads() == [{"n": 0}, {"n": 1}, {"n": 2}]
+    for socket in (slow, fast):
+        await socket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_coalesce_keeps_latest_state_per_event():
+    adapter = WebsocketAdapter(path="/ws", max_queue_size=2, slow_consumer="coalesce")
+    slow = await _connect(adapter, slow=True)
+
+    await adapter.emit("price", {"v": 0})
+    await _flush()
+    for v in range(1, 5):
+        await adapter.emit("price", {"v": v})
+        await adapter.emit("volume", {"v": v * 10})
+    await adapter.emit("status", {"ok": True})
+    await _flush()
+
+    slow.gate.set()
+    await _flush()
+    # price and volume were coalesced, status pushed the oldest queued one out
+    assert slow.payloads() == [{"v": 0}, {"v": 40}, {"ok": True}]
+    await slow.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_disconnect_closes_the_socket():
+    adapter = WebsocketAdapter(path="/ws", max_queue_size=1, slow_consumer="disconnect")
+    slow = await _connect(adapter, slow=True)
+
+    for n in range(3):
+        await adapter.emit("tick", {"n": n})
+    await _flush()
+
+    assert {"type": "websocket.close", "code": SLOW_CONSUMER_CLOSE_CODE} in slow.sent
+    assert adapter._outboxes[slow.sid].closed
+    await slow.disconnect()
+    assert slow.sid not in adapter._connected